@@ -0,0 +1,564 @@
+"""
+Technical answer scoring for the TalentScout Hiring Assistant.
+
+Usage:
+    python answer_scoring.py
+    python answer_scoring.py --status complete --batch-size 40 --workers 4
+    python answer_scoring.py --rescore --backend replay
+
+Each question/answer pair is graded against ANSWER_SCORING_RUBRIC. Pairs are
+sent to the LLM in batches (across candidates when run from the command
+line), and scores are cached by a hash of the question and answer, so an
+identical answer is graded only once. Scores are written next to the
+answers in each record's technical_responses. Records saved by the app are
+scored in the background (score_saved_record), behind live interview turns.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config import (
+    ANSWER_SCORE_CACHE_PATH,
+    ANSWER_SCORE_CACHE_MAX_ENTRIES,
+    ANSWER_SCORE_MIN,
+    ANSWER_SCORE_MAX,
+    ANSWER_SCORING_BATCH_SIZE,
+    ANSWER_SCORING_PROMPT,
+    ANSWER_SCORING_REPAIR_PROMPT,
+    ANSWER_SCORING_RUBRIC
+)
+from concurrency import PRIORITY_BATCH
+from metrics import get_metrics_registry
+from utils import estimate_tokens
+
+# Longest answer sent for grading; longer ones are cut off
+ANSWER_MAX_CHARS = 4000
+
+# Longest rejected response quoted back to the LLM in a repair prompt
+REPAIR_MAX_CHARS = 4000
+
+# Rationale recorded for blank answers, which are scored without the LLM
+EMPTY_ANSWER_RATIONALE = "No answer given."
+
+_metrics = get_metrics_registry()
+_answers_scored = _metrics.counter(
+    "talentscout_answers_scored_total", "Technical answers scored, by where the score came from", ["source"]
+)
+_scoring_requests = _metrics.counter(
+    "talentscout_answer_scoring_requests_total", "LLM requests sent to grade answers, by outcome", ["outcome"]
+)
+_background_failures = _metrics.counter(
+    "talentscout_answer_scoring_background_failures_total",
+    "Records saved by the app whose scores could not be computed or written back"
+)
+_scoring_seconds = _metrics.histogram("talentscout_answer_scoring_seconds", "Time to score a candidate's answers")
+
+
+def score_key(question: str, answer: str) -> str:
+    """
+    Build the cache key of a question/answer pair.
+
+    Args:
+        question: Question text
+        answer: Candidate's answer
+
+    Returns:
+        str: Key such as "score:<sha256>", insensitive to whitespace differences
+    """
+    text = " ".join((question or "").split()) + "\0" + " ".join((answer or "").split())
+    return "score:" + hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def parse_score_json(text: str, ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Parse and validate an LLM response holding a JSON array of scores.
+
+    Args:
+        text: LLM response
+        ids: Answer ids that were sent for grading
+
+    Returns:
+        Dict: {id: {"score": int, "rationale": str}} for every id
+
+    Raises:
+        ValueError: Describing the first problem found, suitable for a repair prompt
+    """
+    start, end = text.find("["), text.rfind("]")
+    if start < 0 or end < start:
+        raise ValueError("the response does not contain a JSON array")
+    try:
+        items = json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise ValueError(f"invalid JSON: {e.msg} at character {e.pos}")
+
+    expected = set(ids)
+    scores = {}
+    for position, item in enumerate(items, start=1):
+        if not isinstance(item, dict):
+            raise ValueError(f"item {position} is not an object")
+        answer_id = item.get("id")
+        if answer_id not in expected:
+            raise ValueError(f"item {position} has unknown id {answer_id!r}")
+        score = item.get("score")
+        if isinstance(score, float) and score.is_integer():
+            score = int(score)
+        if not isinstance(score, int) or isinstance(score, bool) or not ANSWER_SCORE_MIN <= score <= ANSWER_SCORE_MAX:
+            raise ValueError(
+                f"item {position} needs an integer \"score\" from {ANSWER_SCORE_MIN} to {ANSWER_SCORE_MAX}"
+            )
+        rationale = item.get("rationale")
+        scores[answer_id] = {"score": score, "rationale": rationale.strip() if isinstance(rationale, str) else ""}
+
+    missing = expected - set(scores)
+    if missing:
+        raise ValueError(f"no score for ids {', '.join(str(answer_id) for answer_id in sorted(missing))}")
+    return scores
+
+
+class ScoreCache:
+    """
+    Answer scores keyed by score_key, in a SQLite database in WAL mode.
+
+    Each graded batch only writes its own rows, so the cache can hold
+    ANSWER_SCORE_CACHE_MAX_ENTRIES scores without rewriting them all on every
+    save. The least recently used scores are evicted beyond that.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS scores (
+        key TEXT PRIMARY KEY,
+        score INTEGER NOT NULL,
+        rationale TEXT NOT NULL,
+        latency REAL NOT NULL,
+        used_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_scores_used_at ON scores(used_at);
+    """
+
+    def __init__(self, db_path: str = ANSWER_SCORE_CACHE_PATH, max_entries: int = ANSWER_SCORE_CACHE_MAX_ENTRIES):
+        """
+        Open (and if needed create) the database.
+
+        Args:
+            db_path: Path of the SQLite database file (":memory:" keeps it in memory)
+            max_entries: Maximum number of scores before least recently used ones are evicted
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+        # Scores are looked up and stored from grading threads; a lock serializes access
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a score.
+
+        Args:
+            key: Key built by score_key
+
+        Returns:
+            Optional[Dict]: {"score", "rationale"}, or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT score, rationale, latency FROM scores WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE scores SET used_at = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            self.saved_seconds += row[2]
+        return {"score": row[0], "rationale": row[1]}
+
+    def put_many(self, scores: Dict[str, Dict[str, Any]], latency: float = 0.0) -> None:
+        """
+        Store scores graded together.
+
+        Args:
+            scores: {"score", "rationale"} by key
+            latency: LLM seconds spent per score, reported as saved on later hits
+        """
+        if not scores:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO scores (key, score, rationale, latency, used_at) VALUES (?, ?, ?, ?, ?)",
+                    [(key, score["score"], score.get("rationale", ""), latency, now) for key, score in scores.items()]
+                )
+                (entries,) = self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()
+                if entries > self.max_entries:
+                    self._conn.execute(
+                        "DELETE FROM scores WHERE key IN (SELECT key FROM scores ORDER BY used_at LIMIT ?)",
+                        (entries - self.max_entries,)
+                    )
+                    self.evictions += entries - self.max_entries
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict: Hit/miss counters, current size and estimated LLM seconds saved
+        """
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "saved_seconds": round(self.saved_seconds, 3)
+            }
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+
+class AnswerScorer:
+    """
+    Grades question/answer pairs with the LLM, several pairs per request.
+    """
+
+    def __init__(self, backend: Any = None, cache: Optional[ScoreCache] = None,
+                 batch_size: int = ANSWER_SCORING_BATCH_SIZE, priority: int = PRIORITY_BATCH):
+        """
+        Initialize the scorer.
+
+        Args:
+            backend: LLMBackend used for grading (defaults to the process-wide one, resolved on first use)
+            cache: Score cache (defaults to the one at ANSWER_SCORE_CACHE_PATH)
+            batch_size: Question/answer pairs graded per LLM request
+            priority: Rate-limit queue priority of the grading requests (behind live turns by default)
+        """
+        self._backend = backend
+        self.cache = cache if cache is not None else get_score_cache()
+        self.batch_size = max(1, batch_size)
+        self.priority = priority
+
+    @property
+    def backend(self) -> Any:
+        """The LLM backend, resolved on first use."""
+        if self._backend is None:
+            from llm_backends import get_llm_backend
+            self._backend = get_llm_backend()
+        return self._backend
+
+    def score_pairs(self, pairs: Sequence[Tuple[str, str]], workers: int = 1) -> List[Optional[Dict[str, Any]]]:
+        """
+        Score question/answer pairs.
+
+        Blank answers get the minimum score without a request, cached pairs are
+        answered from the cache, and identical pairs are graded once.
+
+        Args:
+            pairs: (question, answer) pairs
+            workers: Concurrent grading requests
+
+        Returns:
+            List: {"score", "rationale"} per pair, in order (None where grading failed)
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(pairs)
+        # Cache key -> positions of the pairs sharing it
+        pending: Dict[str, List[int]] = {}
+        for position, (question, answer) in enumerate(pairs):
+            if not (answer or "").strip():
+                results[position] = {"score": ANSWER_SCORE_MIN, "rationale": EMPTY_ANSWER_RATIONALE}
+                _answers_scored.inc(source="empty")
+                continue
+            key = score_key(question, answer)
+            if key in pending:
+                pending[key].append(position)
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[position] = dict(cached)
+                _answers_scored.inc(source="cache")
+            else:
+                pending[key] = [position]
+
+        keys = list(pending)
+        batches = [keys[start:start + self.batch_size] for start in range(0, len(keys), self.batch_size)]
+
+        def grade(batch: List[str]) -> Tuple[Dict[str, Optional[Dict[str, Any]]], float]:
+            started = time.time()
+            items = [
+                {"id": number, "question": pairs[pending[key][0]][0],
+                 "answer": pairs[pending[key][0]][1][:ANSWER_MAX_CHARS]}
+                for number, key in enumerate(batch, start=1)
+            ]
+            try:
+                scores = self._grade(items)
+            except Exception as e:
+                print(f"Answer scoring failed for {len(batch)} answers: {e}")
+                _scoring_requests.inc(outcome="error")
+                return {key: None for key in batch}, 0.0
+            _scoring_requests.inc(outcome="ok")
+            # Latency is spread over the batch so cache stats report time saved per answer
+            return {key: scores[number] for number, key in enumerate(batch, start=1)}, (time.time() - started) / len(batch)
+
+        if workers > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                graded = list(pool.map(grade, batches))
+        else:
+            graded = [grade(batch) for batch in batches]
+
+        for scores, latency in graded:
+            self.cache.put_many({key: score for key, score in scores.items() if score is not None}, latency)
+            for key, score in scores.items():
+                _answers_scored.inc(source="llm" if score is not None else "failed")
+                for position in pending[key]:
+                    results[position] = dict(score) if score is not None else None
+        return results
+
+    def _grade(self, items: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """Grade one batch, asking the LLM once to fix an unusable response."""
+        prompt = ANSWER_SCORING_PROMPT.format(
+            min_score=ANSWER_SCORE_MIN,
+            max_score=ANSWER_SCORE_MAX,
+            rubric=ANSWER_SCORING_RUBRIC.strip(),
+            items=json.dumps(items, ensure_ascii=False, indent=1)
+        )
+        ids = [item["id"] for item in items]
+        response = self._generate(prompt)
+        try:
+            return parse_score_json(response, ids)
+        except ValueError as e:
+            repaired = self._generate(ANSWER_SCORING_REPAIR_PROMPT.format(error=e, response=response[:REPAIR_MAX_CHARS]))
+            return parse_score_json(repaired, ids)
+
+    def _generate(self, prompt: str) -> str:
+        """Send a prompt through the shared rate-limit queue at this scorer's priority."""
+        if self.backend.rate_limited:
+            from llm_backends import get_rate_scheduler
+            get_rate_scheduler().acquire(estimate_tokens(prompt), self.priority)
+        return self.backend.generate(prompt)
+
+
+def _responses_to_score(record: Dict[str, Any], rescore: bool = False) -> List[Tuple[str, str, str]]:
+    """(response key, question, answer) of the record's answers that still need a score."""
+    responses = record.get("technical_responses") or {}
+    return [
+        (key, response.get("question") or "", response.get("answer") or "")
+        for key, response in responses.items()
+        if isinstance(response, dict) and (rescore or response.get("score") is None)
+    ]
+
+
+def score_record(record: Dict[str, Any], scorer: Optional["AnswerScorer"] = None,
+                 rescore: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Score a candidate's technical answers in one batch and add the scores to the record.
+
+    Args:
+        record: Candidate record with {"question_N": {"question", "answer"}} technical_responses
+        scorer: AnswerScorer to use (defaults to the process-wide one)
+        rescore: Also grade answers that already have a score
+
+    Returns:
+        Dict: {"question_N": {"score", "rationale"}} for the answers scored now
+    """
+    todo = _responses_to_score(record, rescore)
+    if not todo:
+        return {}
+    scorer = scorer or get_answer_scorer()
+    results = scorer.score_pairs([(question, answer) for _, question, answer in todo])
+    scores = {}
+    for (key, _, _), score in zip(todo, results):
+        if score is not None:
+            record["technical_responses"][key].update(score)
+            scores[key] = score
+    return scores
+
+
+def score_candidates(store: Any, scorer: AnswerScorer, status: Optional[str] = None,
+                     rescore: bool = False, workers: int = 1) -> Dict[str, Any]:
+    """
+    Score the answers of saved candidates, batching answers across candidates.
+
+    Candidates are read lazily; answers are graded and written back whenever
+    enough have been collected to fill a batch for every worker.
+
+    Args:
+        store: CandidateStore to read from and write scores to
+        scorer: AnswerScorer used for grading
+        status: Only candidates with this interview status
+        rescore: Also grade answers that already have a score
+        workers: Concurrent grading requests
+
+    Returns:
+        Dict: Candidates updated, answers scored, failures and the mean score
+    """
+    stats = {"candidates": 0, "scored": 0, "failed": 0, "mean_score": None}
+    total = 0
+    # (record id, response key) of each collected pair
+    owners: List[Tuple[str, str]] = []
+    pairs: List[Tuple[str, str]] = []
+
+    def flush() -> None:
+        nonlocal total
+        results = scorer.score_pairs(pairs, workers)
+        by_record: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (record_id, key), score in zip(owners, results):
+            if score is None:
+                stats["failed"] += 1
+                continue
+            by_record.setdefault(record_id, {})[key] = score
+            stats["scored"] += 1
+            total += score["score"]
+        for record_id, scores in by_record.items():
+            store.save_scores(record_id, scores)
+        stats["candidates"] += len(by_record)
+        owners.clear()
+        pairs.clear()
+
+    flush_at = scorer.batch_size * max(1, workers)
+    for record_id, record in store.iter_candidates():
+        if status and record.get("interview_status") != status:
+            continue
+        for key, question, answer in _responses_to_score(record, rescore):
+            owners.append((record_id, key))
+            pairs.append((question, answer))
+        if len(pairs) >= flush_at:
+            flush()
+    if pairs:
+        flush()
+
+    if stats["scored"]:
+        stats["mean_score"] = round(total / stats["scored"], 2)
+    return stats
+
+
+_shared_cache: Optional[ScoreCache] = None
+_shared_scorer: Optional[AnswerScorer] = None
+_shared_lock = threading.Lock()
+
+# Scores records saved by the app off the request path
+_background_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_score_cache() -> ScoreCache:
+    """
+    Get the process-wide answer score cache stored at ANSWER_SCORE_CACHE_PATH.
+
+    Returns:
+        ScoreCache: Shared cache instance
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ScoreCache()
+        return _shared_cache
+
+
+def get_answer_scorer() -> AnswerScorer:
+    """
+    Get the process-wide scorer used for records saved by the app.
+
+    Returns:
+        AnswerScorer: Shared scorer
+    """
+    global _shared_scorer
+    cache = get_score_cache()
+    with _shared_lock:
+        if _shared_scorer is None:
+            _shared_scorer = AnswerScorer(cache=cache)
+        return _shared_scorer
+
+
+def _score_and_save(store: Any, record_id: str, record: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Score a saved record and write the scores to its store; failures leave it unscored."""
+    try:
+        with _scoring_seconds.time():
+            scores = score_record(record)
+        if scores:
+            store.save_scores(record_id, scores)
+        return scores
+    except Exception:
+        # Left for the next answer_scoring.py run
+        _background_failures.inc()
+        return {}
+
+
+def score_saved_record(store: Any, record_id: str, record: Dict[str, Any]) -> "Future":
+    """
+    Score a record that was just saved, in the background.
+
+    The grading request waits behind live interview turns in the rate-limit
+    queue; the scores are added to the stored record when it returns.
+    Answers that fail to score are picked up by the next answer_scoring.py run.
+
+    Args:
+        store: CandidateStore the record was saved to
+        record_id: Identifier returned by save_candidate
+        record: The saved record (not modified)
+
+    Returns:
+        Future: Resolves to the {"question_N": {"score", "rationale"}} scores written
+    """
+    global _background_executor
+    record = dict(record)
+    record["technical_responses"] = {
+        key: dict(response) if isinstance(response, dict) else response
+        for key, response in (record.get("technical_responses") or {}).items()
+    }
+    with _shared_lock:
+        if _background_executor is None:
+            _background_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="answer-scoring")
+    return _background_executor.submit(_score_and_save, store, record_id, record)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score saved candidates' technical answers with the LLM.")
+    parser.add_argument("--status", help="Only candidates with this interview status, e.g. complete")
+    parser.add_argument("--rescore", action="store_true", help="Also grade answers that already have a score")
+    parser.add_argument("--batch-size", type=int, default=ANSWER_SCORING_BATCH_SIZE, help="Answers per LLM request")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--backend", choices=["gemini", "replay", "record"], help="LLM backend (defaults to LLM_BACKEND)")
+    parser.add_argument("--storage", choices=["json", "sqlite"], help="Candidate store (defaults to STORAGE_BACKEND)")
+    args = parser.parse_args()
+
+    from llm_backends import create_llm_backend, get_llm_backend
+    from storage import create_candidate_store, get_candidate_store
+
+    backend = create_llm_backend(args.backend) if args.backend else get_llm_backend()
+    store = create_candidate_store(args.storage) if args.storage else get_candidate_store()
+    scorer = AnswerScorer(backend, batch_size=args.batch_size, priority=PRIORITY_BATCH)
+    try:
+        stats = score_candidates(store, scorer, status=args.status, rescore=args.rescore, workers=args.workers)
+    finally:
+        store.close()
+    stats["cache"] = scorer.cache.stats()
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,50 @@
 import streamlit as st
 import re
 import time
-import json
 import os
 from datetime import datetime
+from answer_scoring import score_saved_record
 from chatbot import ConversationManager
-from config import EXIT_KEYWORDS
+from config import (
+    EXIT_KEYWORDS, TECH_KEYWORDS, VALID_TECHNOLOGIES, STREAM_RESPONSES, STORAGE_BACKEND, EXPORT_GZIP_MIN_MESSAGES,
+    ANSWER_SCORING_ENABLED
+)
+from metrics import get_metrics_registry, maybe_dump_metrics, start_metrics_server
+from tech_matcher import TechMatcher
+from utils import parse_technical_questions, QuestionStreamParser, build_conversation_export, export_is_current
+from storage import get_candidate_store, SQLiteStore
+from session_store import get_session_store, new_session_token
+from transcript import FOR_LLM, FOR_CHAT
+from chat_render import CHAT_CSS, ChatRenderer, format_message_html
+
+METRICS = get_metrics_registry()
+QUESTION_PARSE_SECONDS = METRICS.histogram(
+    "talentscout_question_parse_seconds", "Time spent parsing technical questions out of responses", ["mode"]
+)
+SAVE_SECONDS = METRICS.histogram("talentscout_save_seconds", "Time to save candidate data", ["backend"])
+EXPORT_SECONDS = METRICS.histogram("talentscout_export_seconds", "Time to build a conversation download", ["format"])
+SESSION_SNAPSHOT_SECONDS = METRICS.histogram(
+    "talentscout_session_snapshot_seconds", "Time to save or restore an interview snapshot", ["operation"]
+)
+SESSION_SNAPSHOT_ERRORS = METRICS.counter(
+    "talentscout_session_snapshot_errors_total", "Interview snapshots the session store failed to save or load",
+    ["operation"]
+)
+SESSION_RESUMES = METRICS.counter(
+    "talentscout_session_resumes_total", "Interviews resumed from a snapshot, by conversation state", ["state"]
+)
+
+# Query parameter carrying the session token that an interview is resumed from
+SESSION_QUERY_PARAM = "session"
+# Session state keys saved with the ConversationManager in interview snapshots
+SNAPSHOT_KEYS = [
+    "session_started", "conversation_ended", "technical_responses_input",
+    "technical_questions", "current_question_index", "reviewing_answers", "user_data"
+]
+
+# Keyword matchers are compiled once and shared by every session
+TECH_KEYWORD_MATCHER = TechMatcher(TECH_KEYWORDS)
+VALID_TECH_MATCHER = TechMatcher(VALID_TECHNOLOGIES)
 
 # Set page config
 st.set_page_config(
@@ -14,135 +53,21 @@ st.set_page_config(
     layout="centered"
 )
 
-# Custom CSS for better UI with text wrapping fixes and better color contrast
-st.markdown("""
-<style>
-.chat-message {
-    padding: 1.5rem;
-    border-radius: 0.5rem;
-    margin-bottom: 1rem;
-    display: flex;
-    flex-direction: column;
-}
-.chat-message.user {
-    background-color: #F0F2F6;
-    border-left: 5px solid #7E57C2;
-    color: #111; /* Dark text for light backgrounds */
-}
-.chat-message.assistant {
-    background-color: #FAFAFA;
-    border-left: 5px solid #26A69A;
-    color: #111; /* Dark text for light backgrounds */
-}
-.chat-message .message-content {
-    display: flex;
-    margin-top: 0;
-    /* Fix for text wrapping */
-    white-space: normal;
-    word-wrap: break-word;
-    overflow-wrap: break-word;
-}
-.message-timestamp {
-    font-size: 0.8rem;
-    color: #666;
-    margin-top: 0.2rem;
-}
-.visually-hidden {
-    display: none;
-}
-div.stButton > button {
-    width: 100%;
-}
-/* Improved Technical Question Styling with text wrapping fixes */
-.technical-question-container {
-    background-color: #f8f9fa;
-    padding: 1.5rem;
-    border-radius: 0.5rem;
-    border-left: 5px solid #3498db;
-    margin-bottom: 1.5rem;
-    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-    /* Fix for text wrapping */
-    white-space: normal;
-    word-wrap: break-word;
-    overflow-wrap: break-word;
-}
-.technical-question-text {
-    font-size: 1.1rem;
-    line-height: 1.6;
-    color: #2c3e50;
-    margin: 0;
-    padding: 0;
-    text-align: left;
-    /* Fix for text wrapping */
-    white-space: normal;
-    word-wrap: break-word;
-    overflow-wrap: break-word;
-    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-}
-/* Styling for text areas */
-.stTextArea textarea {
-    border: 1px solid #ddd;
-    border-radius: 5px;
-    padding: 10px;
-    font-size: 1rem;
-    line-height: 1.5;
-    resize: vertical;
-    /* Fix for text wrapping */
-    white-space: normal;
-    word-wrap: break-word;
-    overflow-wrap: break-word;
-}
-/* Button styling */
-.stButton button {
-    background-color: #3498db;
-    color: white;
-    border: none;
-    padding: 0.5rem 1rem;
-    border-radius: 5px;
-    cursor: pointer;
-    font-weight: 500;
-    transition: background-color 0.3s;
-}
-.stButton button:hover {
-    background-color: #2980b9;
-}
-/* Success message styling */
-.stSuccess {
-    background-color: #d4edda;
-    color: #155724;
-    padding: 1rem;
-    border-radius: 5px;
-    border-left: 5px solid #28a745;
-    margin-bottom: 1rem;
-}
-/* Global text wrapping styles */
-p, div, span, h1, h2, h3, h4, h5, h6 {
-    white-space: normal !important;
-    word-wrap: break-word !important;
-    overflow-wrap: break-word !important;
-}
-/* Fix for markdown content */
-.markdown-text-container {
-    white-space: normal !important;
-    word-wrap: break-word !important;
-    overflow-wrap: break-word !important;
-}
-/* Force Streamlit elements to wrap properly */
-.element-container, .stMarkdown, .stText {
-    white-space: normal !important;
-    word-wrap: break-word !important;
-    overflow-wrap: break-word !important;
-}
-</style>
-""", unsafe_allow_html=True)
+# The stylesheet is a precomputed constant, so each rerun only re-sends the same string
+st.markdown(CHAT_CSS, unsafe_allow_html=True)
 
 
 def initialize_session():
-    """Initialize session state variables."""
+    """Initialize session state variables, resuming the interview named in the URL if there is one."""
+    if 'session_token' not in st.session_state:
+        st.session_state.session_token = None
+        token = st.query_params.get(SESSION_QUERY_PARAM)
+        if token and resume_session(token):
+            st.session_state.session_token = token
     if 'conversation_manager' not in st.session_state:
         st.session_state.conversation_manager = ConversationManager()
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+    if 'chat_renderer' not in st.session_state:
+        st.session_state.chat_renderer = ChatRenderer()
     if 'user_input' not in st.session_state:
         st.session_state.user_input = ""
     if 'session_started' not in st.session_state:
@@ -170,36 +95,124 @@ def initialize_session():
         }
 
 
-def display_message(role, content, timestamp=None):
+def chat_history():
+    """
+    Messages shown in the chat window.
+    They are read from the conversation's transcript, which the chat shares with the LLM context.
+    Returns:
+        TranscriptView: Live, read-only view of the chat messages; the transcript keeps one
+        per session, so each rerun only indexes the messages added since the last
+    """
+    return st.session_state.conversation_manager.transcript.view(FOR_CHAT)
+
+
+def add_chat_message(content, role="assistant"):
     """
-    Display a chat message with styling based on the role.
+    Show a message in the chat window without adding it to the LLM context.
     Args:
-        role: 'user' or 'assistant'
         content: Message content
-        timestamp: Optional timestamp for the message
+        role: 'user' or 'assistant'
     """
-    if timestamp is None:
-        timestamp = datetime.now().strftime("%H:%M:%S")
-    # Ensure content is properly formatted for HTML
-    content = content.replace("\n", "<br>")
-    if role == "user":
-        st.markdown(f"""
-        <div class="chat-message user">
-            <div class="message-content">
-                <b>You:</b> {content}
-            </div>
-            <div class="message-timestamp">{timestamp}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
-        <div class="chat-message assistant">
-            <div class="message-content">
-                <b>Hiring Assistant:</b> {content}
-            </div>
-            <div class="message-timestamp">{timestamp}</div>
-        </div>
-        """, unsafe_allow_html=True)
+    st.session_state.conversation_manager.transcript.append(role, content, FOR_CHAT)
+
+
+def persist_session():
+    """
+    Save the current interview under its session token so any node can resume it.
+    The whole snapshot is rewritten after every turn. An interview is bounded by
+    its script (the info fields and a handful of questions), so a finished one
+    is about 20 messages and 1-2 KB compressed, encoded in well under a
+    millisecond. Appending only new transcript rows would need a second record
+    per store and would still have to rewrite rows whose visibility changed.
+    """
+    store = get_session_store()
+    token = st.session_state.get('session_token')
+    if store is None or not token:
+        return
+    snapshot = {
+        "manager": st.session_state.conversation_manager.to_snapshot(),
+        "app": {key: st.session_state[key] for key in SNAPSHOT_KEYS}
+    }
+    try:
+        with SESSION_SNAPSHOT_SECONDS.time(operation="save"):
+            store.save(token, snapshot)
+    except Exception:
+        # Losing resumability must not interrupt the interview itself
+        SESSION_SNAPSHOT_ERRORS.inc(operation="save")
+
+
+def resume_session(token):
+    """
+    Restore an interview from its snapshot into session state.
+    Args:
+        token: Session token from the URL
+    Returns:
+        bool: True if a snapshot was found and restored
+    """
+    store = get_session_store()
+    if store is None:
+        return False
+    try:
+        with SESSION_SNAPSHOT_SECONDS.time(operation="load"):
+            snapshot = store.load(token)
+    except Exception:
+        SESSION_SNAPSHOT_ERRORS.inc(operation="load")
+        return False
+    if not snapshot:
+        return False
+    try:
+        manager = ConversationManager.from_snapshot(snapshot["manager"])
+    except (KeyError, ValueError):
+        # A snapshot with malformed transcript rows can't be resumed; start over
+        SESSION_SNAPSHOT_ERRORS.inc(operation="load")
+        return False
+    st.session_state.conversation_manager = manager
+    for key, value in snapshot["app"].items():
+        st.session_state[key] = value
+    if not manager.is_active:
+        st.session_state.conversation_summary = manager.get_conversation_summary()
+    SESSION_RESUMES.inc(state=manager.state)
+    return True
+
+
+def stream_assistant_response(user_input, placeholder):
+    """
+    Stream the conversation manager's response into a chat bubble.
+    Technical questions are added to session state as soon as each one is complete.
+    Args:
+        user_input: Text input from the user
+        placeholder: st.empty() element the bubble is rendered into
+    Returns:
+        str: The full response
+    """
+    marker = "Here are your technical questions:"
+    parser = QuestionStreamParser()
+    response = ""
+    parsed_upto = None
+    parse_seconds = 0.0
+    for chunk in st.session_state.conversation_manager.process_input_stream(user_input):
+        response += chunk
+        placeholder.markdown(format_message_html("assistant", response), unsafe_allow_html=True)
+
+        # Feed everything after the marker to the incremental question parser
+        if parsed_upto is None and marker in response:
+            st.session_state.technical_questions = []
+            parsed_upto = response.index(marker) + len(marker)
+        if parsed_upto is not None:
+            parse_started = time.perf_counter()
+            new_questions = parser.feed(response[parsed_upto:])
+            parse_seconds += time.perf_counter() - parse_started
+            parsed_upto = len(response)
+            st.session_state.technical_questions.extend(new_questions)
+
+    if parsed_upto is not None:
+        parse_started = time.perf_counter()
+        # The closing line is not part of the last question
+        st.session_state.technical_questions.extend(
+            q.replace("Please provide your answers.", "").strip() for q in parser.finish()
+        )
+        QUESTION_PARSE_SECONDS.observe(parse_seconds + time.perf_counter() - parse_started, mode="stream")
+    return response
 def extract_user_data(text):
     """
     Extract user data from text using keyword detection and simple heuristics.
@@ -320,14 +333,7 @@ def extract_user_data(text):
                 break
 
     # ======== Extract Tech Stack ========
-    tech_keywords = [
-        "python", "javascript", "java", "c#", "c++", "ruby", "php", "swift", "kotlin", "go", "rust", "typescript",
-        "html", "css", "react", "angular", "vue", "node", "django", "flask", "spring",
-        "aws", "azure", "gcp", "docker", "kubernetes", "sql", "nosql",
-        "mongodb", "postgresql", "mysql", "redis", "tensorflow", "pytorch", "machine learning"
-    ]
-
-    found_techs = [tech for tech in tech_keywords if re.search(r'\b' + re.escape(tech) + r'\b', text_lower)]
+    found_techs = TECH_KEYWORD_MATCHER.find_all(text_lower)
     if found_techs:
         extracted_data["tech_stack"] = found_techs
 
@@ -355,36 +361,6 @@ def validate_tech_stack(tech_stack_input):
     Validates if the provided tech stack contains valid technologies.
     Returns (is_valid, recognized_techs).
     """
-    # Define a comprehensive list of valid technologies
-    valid_technologies = [
-        # Programming languages
-        "python", "javascript", "typescript", "java", "c#", "c++", "c", "ruby", "php", "swift", 
-        "kotlin", "go", "rust", "scala", "perl", "r", "dart", "lua", "haskell", "objective-c",
-        
-        # Web frameworks/libraries
-        "react", "angular", "vue", "svelte", "jquery", "express", "django", "flask", "spring", 
-        "asp.net", "laravel", "ruby on rails", "rails", "fastapi", "next.js", "nuxt", "gatsby",
-        
-        # Mobile frameworks
-        "react native", "flutter", "ionic", "xamarin", "android", "ios", "swift ui", "jetpack compose",
-        
-        # Databases
-        "sql", "mysql", "postgresql", "mongodb", "sqlite", "oracle", "sql server", "cassandra", 
-        "redis", "dynamodb", "firebase", "supabase", "neo4j", "couchdb", "mariadb",
-        
-        # Cloud/DevOps
-        "aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "terraform", "jenkins", 
-        "circleci", "travis", "github actions", "gitlab ci", "ansible", "prometheus", "grafana",
-        
-        # AI/ML
-        "tensorflow", "pytorch", "scikit-learn", "keras", "pandas", "numpy", "matplotlib",
-        "machine learning", "deep learning", "nlp", "computer vision", "data science",
-        
-        # Other common tools/tech
-        "git", "linux", "node", "npm", "yarn", "webpack", "graphql", "rest", "soap",
-        "html", "css", "sass", "less", "bootstrap", "tailwind", "material ui"
-    ]
-    
     # Normalize input
     if isinstance(tech_stack_input, str):
         # Split by common separators
@@ -400,7 +376,7 @@ def validate_tech_stack(tech_stack_input):
     # Find recognized technologies
     recognized_techs = []
     for tech in tech_items:
-        if tech in valid_technologies or any(valid_tech in tech for valid_tech in valid_technologies):
+        if VALID_TECH_MATCHER.contains_any(tech):
             recognized_techs.append(tech)
     
     # Calculate match percentage
@@ -415,26 +391,18 @@ def validate_tech_stack(tech_stack_input):
     return is_valid, recognized_techs
 def save_user_data():
     """
-    Save the user data to a JSON file.
-    Creates a directory if it doesn't exist and names the file using email, name, or timestamp.
+    Save the user data through the configured candidate store (see STORAGE_BACKEND).
+    The JSON backend names files using email, name, or timestamp.
     Format: EMAIL_YYYYMMDD_HHMMSS.json (e.g., pavan@gmail.com_20250412_072201.json)
-    Uses underscores as separators for Windows compatibility.
+    Returns:
+        str: File path or record identifier of the saved data
     """
-    # Create directory if it doesn't exist
-    data_dir = "user_data"
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
-
     # Prepare data for saving
     user_data = st.session_state.user_data.copy()
     
-    # Get current timestamp for submission time and filename
+    # Get current timestamp for submission time
     current_time = datetime.now()
     user_data["submission_time"] = current_time.strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Format timestamp for filename in the requested format: YYYYMMDD_HHMMSS
-    date_str = current_time.strftime('%Y%m%d')
-    time_str = current_time.strftime('%H%M%S')
 
     # Add technical responses
     if st.session_state.technical_responses_input:
@@ -448,28 +416,15 @@ def save_user_data():
                 }
         user_data["technical_responses"] = technical_responses
 
-    # Determine file name based on the requested format
-    if "email" in user_data and user_data["email"]:
-        # Convert email to lowercase as requested
-        email = user_data["email"].lower()
-        # Replace @ with "_at_" for better Windows compatibility
-        email = email.replace("@", "@")
-        # but it's not a good idea to use "@" in filenames, so we will replace it with "_at_"
-        filename = f"{email}_{date_str}_{time_str}.json"
-    elif "name" in user_data and user_data["name"]:
-        # Fallback to name-based filename if email is not available
-        name_part = user_data["name"].lower().replace(" ", "_")
-        filename = f"{name_part}_{date_str}_{time_str}.json"
-    else:
-        # Last resort fallback
-        filename = f"candidate_{date_str}_{time_str}.json"
-
-    # Save to file
-    file_path = os.path.join(data_dir, filename)
-    with open(file_path, 'w') as f:
-        json.dump(user_data, f, indent=4)
-
-    return file_path
+    store = get_candidate_store()
+    with SAVE_SECONDS.time(backend=STORAGE_BACKEND):
+        record_id = store.save_candidate(user_data, transcript=chat_history().as_dicts())
+    if ANSWER_SCORING_ENABLED and user_data.get("technical_responses"):
+        # Graded in the background so saving never waits on the LLM; the scores are added to the record
+        score_saved_record(store, record_id, user_data)
+    if isinstance(store, SQLiteStore):
+        return f"{store.db_path}#{record_id}"
+    return record_id
 def handle_user_input():
     """Process user input from the text input field."""
     user_input = st.session_state.user_input
@@ -478,33 +433,24 @@ def handle_user_input():
         if any(keyword in user_input.lower() for keyword in EXIT_KEYWORDS):
             st.session_state.conversation_ended = True
             # Gracefully conclude the conversation
-            timestamp = datetime.now().strftime("%H:%M:%S")
             goodbye_message = (
                 "Thank you for taking the time to complete this interview. "
                 "We appreciate your interest in joining our team. We will review your responses "
                 "and get back to you shortly regarding the next steps."
             )
-            st.session_state.chat_history.append({
-                "role": "assistant",
-                "content": goodbye_message,
-                "timestamp": timestamp
-            })
+            add_chat_message(goodbye_message)
             st.session_state.user_data["interview_status"] = "complete"
             save_user_data()
             st.session_state.user_input = ""
+            persist_session()
             return
 
         # Extract user data from input
         extracted_data = extract_user_data(user_input)
         update_user_data(extracted_data)
 
-        # Add user message to chat history
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        st.session_state.chat_history.append({
-            "role": "user",
-            "content": user_input,
-            "timestamp": timestamp
-        })
+        # The conversation manager adds the user message to the shared transcript
+        manager = st.session_state.conversation_manager
 
         # Process input and get response if conversation is active
         if not st.session_state.conversation_ended:
@@ -514,16 +460,11 @@ def handle_user_input():
             
             # Check if this is the last question about tech stack and user has confirmed their info
             is_tech_stack_confirmation = False
-            if len(st.session_state.chat_history) >= 2:
-                last_assistant_msg = None
-                for msg in reversed(st.session_state.chat_history):
-                    if msg["role"] == "assistant":
-                        last_assistant_msg = msg["content"]
-                        break
-                
-                # Check if the last message was asking for confirmation and user said yes
-                if last_assistant_msg and "Is this information correct?" in last_assistant_msg and user_input.lower() in ["yes", "correct", "that's right", "right"]:
-                    is_tech_stack_confirmation = True
+            last_assistant_msg = next((msg.content for msg in reversed(chat_history()) if msg.role == "assistant"), None)
+            
+            # Check if the last message was asking for confirmation and user said yes
+            if last_assistant_msg and "Is this information correct?" in last_assistant_msg and user_input.lower() in ["yes", "correct", "that's right", "right"]:
+                is_tech_stack_confirmation = True
             
             # If user confirmed their info, validate tech stack before proceeding to technical questions
             if is_tech_stack_confirmation and "tech_stack" in st.session_state.user_data:
@@ -550,16 +491,13 @@ def handle_user_input():
                     # Remove thinking indicator
                     thinking_placeholder.empty()
                     
-                    # Add response to chat history
-                    timestamp = datetime.now().strftime("%H:%M:%S")
-                    st.session_state.chat_history.append({
-                        "role": "assistant",
-                        "content": invalid_tech_response,
-                        "timestamp": timestamp
-                    })
+                    # Add the exchange to chat history; the manager never sees it
+                    add_chat_message(user_input, role="user")
+                    add_chat_message(invalid_tech_response)
                     
                     # Clear input field and exit function early
                     st.session_state.user_input = ""
+                    persist_session()
                     return
                 
                 # Update tech stack with only recognized technologies
@@ -567,7 +505,13 @@ def handle_user_input():
                     st.session_state.user_data["tech_stack"] = recognized_techs
             
             # Get response from conversation manager
-            response = st.session_state.conversation_manager.process_input(user_input)
+            streamed_questions = False
+            if STREAM_RESPONSES:
+                response = stream_assistant_response(user_input, thinking_placeholder)
+                streamed_questions = bool(st.session_state.technical_questions)
+            else:
+                response = manager.process_input(user_input)
+            response_index = len(manager.transcript) - 1
             # Remove thinking indicator
             thinking_placeholder.empty()
 
@@ -577,77 +521,29 @@ def handle_user_input():
                 # Split response at the technical questions marker
                 clean_response = response.split("Here are your technical questions:")[0]
                 clean_response += "I've prepared some technical questions for you. I'll present them one by one."
-                # Add the modified response to chat history
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                st.session_state.chat_history.append({
-                    "role": "assistant",
-                    "content": clean_response,
-                    "timestamp": timestamp
-                })
-                
-                # Parse the questions and store them
-                questions_part = response.split("Here are your technical questions:")[1]
-                
-                # Extract questions - improved pattern to capture full questions
-                questions = []
-                # Split by numbered items
-                question_blocks = re.split(r'(\d+\.)', questions_part.strip())
-                if len(question_blocks) > 1:  # Skip the first empty item if present
-                    i = 1
-                    while i < len(question_blocks):
-                        if re.match(r'\d+\.', question_blocks[i]) and i+1 < len(question_blocks):
-                            # Combine number with text
-                            full_question = question_blocks[i] + question_blocks[i+1].strip()
-                            questions.append(full_question)
-                            i += 2
-                        else:
-                            i += 1
+                # Show the modified response in the chat; the LLM keeps the full one as context
+                manager.transcript.set_visibility(response_index, FOR_LLM)
+                add_chat_message(clean_response)
                 
-                # If the regex method failed, try a simpler approach
-                if not questions:
-                    question_lines = [line.strip() for line in questions_part.split('\n') if line.strip()]
-                    questions = []
-                    current_question = ""
-                    for line in question_lines:
-                        if re.match(r'^\d+\.', line):
-                            if current_question:
-                                questions.append(current_question)
-                            current_question = line
-                        elif current_question:
-                            current_question += " " + line
-                    if current_question:
-                        questions.append(current_question)
-                
-                # Clean up and store questions
-                clean_questions = []
-                for q in questions:
-                    # Remove assessment markers if needed but keep the main question
-                    # Extract just the question part from "1. **Question text** (Assessment note)"
-                    match = re.match(r'\d+\.\s+\*\*(.*?)\*\*\s*(?:\(.*?\))?', q)
-                    if match:
-                        clean_questions.append(match.group(1))
+                # Parse the questions and store them, unless streaming already did
+                if not streamed_questions:
+                    if manager.question_details:
+                        # Structured questions were already parsed and validated by the manager
+                        clean_questions = list(manager.technical_questions)
                     else:
-                        # If no match, just use the whole question with minimal cleaning
-                        clean_q = re.sub(r'^\d+\.\s+', '', q)
-                        clean_questions.append(clean_q)
-                
-                # Store only if we have valid questions
-                if clean_questions:
-                    st.session_state.technical_questions = clean_questions
-            else:
-                # Regular response without technical questions
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                st.session_state.chat_history.append({
-                    "role": "assistant",
-                    "content": response,
-                    "timestamp": timestamp
-                })
+                        questions_part = response.split("Here are your technical questions:")[1]
+                        with QUESTION_PARSE_SECONDS.time(mode="batch"):
+                            clean_questions = parse_technical_questions(questions_part)
+                    
+                    # Store only if we have valid questions
+                    if clean_questions:
+                        st.session_state.technical_questions = clean_questions
 
             # Check if conversation has ended
-            if not st.session_state.conversation_manager.is_active:
+            if not manager.is_active:
                 st.session_state.conversation_ended = True
                 # Save conversation summary
-                summary = st.session_state.conversation_manager.get_conversation_summary()
+                summary = manager.get_conversation_summary()
                 st.session_state.conversation_summary = summary
                 # Update user data from summary if available
                 if "candidate_info" in summary:
@@ -661,18 +557,20 @@ def handle_user_input():
 
         # Clear input field
         st.session_state.user_input = ""
+        persist_session()
+        maybe_dump_metrics()
 
 def start_session():
     """Start a new chat session."""
     st.session_state.session_started = True
-    # Add initial greeting
-    greeting = st.session_state.conversation_manager.process_input("Hello")
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    st.session_state.chat_history.append({
-        "role": "assistant",
-        "content": greeting,
-        "timestamp": timestamp
-    })
+    # The token in the URL lets a reload, restart or another node resume this interview
+    st.session_state.session_token = new_session_token()
+    st.query_params[SESSION_QUERY_PARAM] = st.session_state.session_token
+    # Add initial greeting; the "Hello" that triggers it is not shown in the chat
+    transcript = st.session_state.conversation_manager.transcript
+    st.session_state.conversation_manager.process_input("Hello")
+    transcript.set_visibility(len(transcript) - 2, FOR_LLM)
+    persist_session()
 
 
 def reset_session():
@@ -681,37 +579,47 @@ def reset_session():
     if st.session_state.get('session_started', False) and not st.session_state.get('conversation_ended', False):
         st.session_state.user_data["interview_status"] = "abandoned"
         save_user_data()
+    store = get_session_store()
+    if store is not None and st.session_state.get('session_token'):
+        store.delete(st.session_state.session_token)
+    if SESSION_QUERY_PARAM in st.query_params:
+        del st.query_params[SESSION_QUERY_PARAM]
     for key in list(st.session_state.keys()):
         del st.session_state[key]
     initialize_session()
 
 
+def prepare_export():
+    """
+    Build the conversation download.
+    Long transcripts (EXPORT_GZIP_MIN_MESSAGES and up) are gzip-compressed.
+    Returns:
+        dict: Transcript version it was built from, data, file name and MIME type
+    """
+    messages = chat_history()
+    compress = len(messages) >= EXPORT_GZIP_MIN_MESSAGES
+    with EXPORT_SECONDS.time(format="gzip" if compress else "json"):
+        return build_conversation_export(st.session_state.conversation_summary, messages, compress)
+
+
 def export_conversation():
-    """Export the conversation to a JSON file."""
-    # Create conversation data
-    if 'conversation_summary' in st.session_state:
-        export_data = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "candidate_info": st.session_state.conversation_summary["candidate_info"],
-            "technical_questions": st.session_state.conversation_summary["technical_questions"],
-            "technical_responses": st.session_state.conversation_summary["technical_responses"],
-            "full_conversation": [
-                {
-                    "role": msg["role"],
-                    "content": msg["content"],
-                    "timestamp": msg["timestamp"]
-                } for msg in st.session_state.chat_history
-            ]
-        }
-        # Convert to JSON
-        export_json = json.dumps(export_data, indent=2)
-        # Create download button
-        st.download_button(
-            label="Download Conversation Data",
-            data=export_json,
-            file_name=f"talentscout_interview_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-            mime="application/json"
-        )
+    """
+    Offer the conversation as a download.
+    The file is only built when asked for, and reused until the transcript changes.
+    """
+    if 'conversation_summary' not in st.session_state:
+        return
+    export = st.session_state.get('conversation_export')
+    if not export_is_current(export, chat_history()):
+        if not st.button("Prepare export"):
+            return
+        export = st.session_state.conversation_export = prepare_export()
+    st.download_button(
+        label="Download Conversation Data",
+        data=export["data"],
+        file_name=export["file_name"],
+        mime=export["mime"]
+    )
 
 
 def display_technical_questions():
@@ -743,6 +651,7 @@ def display_technical_questions():
             # Store the answer in session state
             st.session_state.technical_responses_input[response_key] = st.session_state[response_key]
             st.session_state.current_question_index += 1
+            persist_session()
             st.rerun()
     elif st.session_state.technical_questions and st.session_state.current_question_index >= len(st.session_state.technical_questions):
         # Show a message when all questions are answered
@@ -772,10 +681,41 @@ def save_user_data_manually():
         st.success(f"User data saved to {file_path}")
 
 
+def display_metrics_panel():
+    """Show process-wide latency metrics so the slowest stage of a turn is easy to spot."""
+    with st.expander("Performance Metrics", expanded=False):
+        rows = []
+        for name, label in [("talentscout_turn_seconds", "Turn"),
+                            ("talentscout_llm_call_seconds", "LLM call"),
+                            ("talentscout_question_parse_seconds", "Question parsing"),
+                            ("talentscout_answer_scoring_seconds", "Answer scoring"),
+                            ("talentscout_save_seconds", "Save")]:
+            histogram = METRICS.get(name)
+            for labels, stats in sorted(histogram.summary().items()):
+                rows.append({
+                    "Stage": f"{label} ({', '.join(labels)})",
+                    "Count": stats["count"],
+                    "Mean (ms)": round(stats["mean"] * 1000, 1),
+                    "p50 (ms)": round(stats["p50"] * 1000, 1),
+                    "p95 (ms)": round(stats["p95"] * 1000, 1)
+                })
+        if rows:
+            st.table(rows)
+        else:
+            st.write("No measurements yet.")
+        st.download_button(
+            "Download (Prometheus format)",
+            METRICS.render(),
+            file_name="talentscout_metrics.prom",
+            mime="text/plain"
+        )
+
+
 def main():
     """Main application function."""
     # Initialize session
     initialize_session()
+    start_metrics_server()
     # Header
     st.title("🤖 TalentScout Hiring Assistant")
     st.markdown("""
@@ -817,18 +757,19 @@ def main():
             st.header("Export")
             export_conversation()
 
+        st.header("Diagnostics")
+        display_metrics_panel()
+
     # Chat container
     chat_container = st.container()
 
     # Display chat messages
     with chat_container:
         if st.session_state.session_started:
-            for message in st.session_state.chat_history:
-                display_message(
-                    role=message["role"],
-                    content=message["content"],
-                    timestamp=message["timestamp"]
-                )
+            # All messages go out as one block; only new ones are formatted
+            chat_html = st.session_state.chat_renderer.render(chat_history())
+            if chat_html:
+                st.markdown(chat_html, unsafe_allow_html=True)
             display_technical_questions()
             # Show summary if conversation ended
             if st.session_state.conversation_ended and 'conversation_summary' in st.session_state:
@@ -0,0 +1,365 @@
+"""
+Headless batch runner that replays scripted interviews through ConversationManager.
+
+Usage:
+    python batch_runner.py transcripts/ --workers 4 --report report.json
+    python batch_runner.py --from-user-data user_data --workers 8 --backend replay
+
+A transcript is a JSON object {"id": "...", "inputs": ["Hello", "Jane Doe", ...]}.
+Transcripts are read from .json files (one object or a list) and .jsonl files
+(one object per line). --from-user-data rebuilds transcripts from saved candidate
+records. Each transcript runs against a fresh ConversationManager in a process
+pool, and a machine-readable JSON report is written.
+"""
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+import llm_backends
+import question_cache
+from concurrency import PRIORITY_BATCH, RateScheduler
+from config import (
+    BATCH_QUESTION_CACHE_PATH,
+    LLM_BACKEND,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    LLM_RATE_BURST_SECONDS,
+    REQUIRED_INFO
+)
+from llm_backends import LLMBackend, create_llm_backend
+from storage import JSONFileStore
+from utils import percentile, validate_email, validate_phone
+
+# Values used when a saved record lacks a field the interview requires
+RECONSTRUCTION_DEFAULTS = {
+    "position": "Software Engineer",
+    "location": "Remote",
+    "experience": "3 years"
+}
+
+# LLM backends created in this process, by name
+_backends: Dict[str, LLMBackend] = {}
+
+
+def _get_backend(name: str) -> LLMBackend:
+    """
+    Get this process's instance of a named LLM backend, creating it on first use.
+
+    Args:
+        name: Backend name accepted by create_llm_backend
+
+    Returns:
+        LLMBackend: Backend shared by transcripts run in this process
+    """
+    if name not in _backends:
+        _backends[name] = create_llm_backend(name)
+    return _backends[name]
+
+
+def _use_scratch_cache(path: Optional[str] = BATCH_QUESTION_CACHE_PATH) -> question_cache.QuestionCache:
+    """
+    Point this process's question cache away from the one serving live candidates.
+
+    Args:
+        path: Scratch cache file (None keeps it in memory)
+
+    Returns:
+        QuestionCache: The scratch cache now in use
+    """
+    cache = question_cache.create_question_cache(path)
+    question_cache.set_question_cache(cache)
+    return cache
+
+
+def _init_worker(workers: int, cache_path: Optional[str], worker_cache_dir: Optional[str]) -> None:
+    """
+    Prepare a worker process: an equal share of the LLM quota and a scratch question cache.
+
+    Each process has its own rate scheduler, so the configured budgets are split
+    across the pool to keep the batch as a whole within them. Each worker also
+    writes its own cache file, seeded from the batch cache, because a cache
+    rewrites its whole file on save and would drop other workers' entries.
+
+    Args:
+        workers: Number of worker processes
+        cache_path: Scratch question cache file shared by the batch
+        worker_cache_dir: Directory for per-worker cache files (None keeps them in memory)
+    """
+    worker_path = os.path.join(worker_cache_dir, f"{os.getpid()}.json") if worker_cache_dir else None
+    cache = _use_scratch_cache(worker_path)
+    if cache_path:
+        cache.merge_file(cache_path)
+    llm_backends.set_rate_scheduler(RateScheduler(
+        LLM_REQUESTS_PER_MINUTE / workers if LLM_REQUESTS_PER_MINUTE else None,
+        LLM_TOKENS_PER_MINUTE / workers if LLM_TOKENS_PER_MINUTE else None,
+        LLM_RATE_BURST_SECONDS
+    ))
+
+
+def _merge_worker_caches(cache_path: str, worker_cache_dir: str) -> None:
+    """
+    Fold the workers' cache files into the batch cache and remove them.
+
+    Args:
+        cache_path: Scratch question cache file shared by the batch
+        worker_cache_dir: Directory holding one cache file per worker
+    """
+    try:
+        cache = question_cache.create_question_cache(cache_path)
+        for name in sorted(os.listdir(worker_cache_dir)):
+            cache.merge_file(os.path.join(worker_cache_dir, name))
+    finally:
+        shutil.rmtree(worker_cache_dir, ignore_errors=True)
+
+
+def load_transcripts(paths: List[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Load scripted transcripts from files or directories.
+
+    Args:
+        paths: .json/.jsonl files or directories containing them
+
+    Yields:
+        Dict: Transcripts with "id" and "inputs"
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.endswith((".json", ".jsonl"))
+            )
+        else:
+            files = [path]
+
+        for file_path in files:
+            with open(file_path, 'r') as f:
+                if file_path.endswith(".jsonl"):
+                    items = [json.loads(line) for line in f if line.strip()]
+                else:
+                    data = json.load(f)
+                    items = data if isinstance(data, list) else [data]
+            for position, item in enumerate(items):
+                item.setdefault("id", f"{os.path.basename(file_path)}#{position}")
+                yield item
+
+
+def transcript_from_record(record_id: str, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild a scripted transcript from a saved candidate record.
+
+    Args:
+        record_id: Identifier of the record in its store
+        record: Candidate record as saved by the app
+
+    Returns:
+        Optional[Dict]: Transcript, or None if the record can't pass validation
+    """
+    values = dict(record)
+    if not values.get("position") and values.get("desired_position"):
+        values["position"] = values["desired_position"]
+    tech_stack = values.get("tech_stack") or []
+    values["tech_stack"] = ", ".join(tech_stack) if isinstance(tech_stack, list) else str(tech_stack)
+
+    if not values.get("name") or not values["tech_stack"]:
+        return None
+    if not validate_email(values.get("email", "")) or not validate_phone(values.get("phone", "")):
+        return None
+
+    filled = []
+    inputs = ["Hello"]
+    for field in REQUIRED_INFO:
+        value = values.get(field)
+        if not value:
+            value = RECONSTRUCTION_DEFAULTS.get(field, "Not provided")
+            filled.append(field)
+        inputs.append(str(value))
+    inputs.append("yes")
+
+    answers = [
+        response.get("answer", "") for response in (record.get("technical_responses") or {}).values()
+        if isinstance(response, dict)
+    ]
+    inputs.append("\n\n".join(answer for answer in answers if answer) or "I'd like to skip these questions.")
+
+    return {"id": record_id, "inputs": inputs, "reconstructed": True, "filled_fields": filled}
+
+
+def run_transcript(transcript: Dict[str, Any], quiet: bool = True, backend: str = LLM_BACKEND) -> Dict[str, Any]:
+    """
+    Drive a fresh ConversationManager through one transcript.
+
+    Args:
+        transcript: Transcript with "id" and "inputs"
+        quiet: Silence the manager's debug output
+        backend: Name of the LLM backend to use
+
+    Returns:
+        Dict: Per-turn timings, LLM call count, final state and conversation summary
+    """
+    from chatbot import ConversationManager
+
+    result = {"id": transcript["id"], "turns": [], "llm_calls": 0, "error": None}
+    started = time.perf_counter()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull if quiet else sys.stdout):
+        try:
+            manager = ConversationManager()
+            manager.backend = _get_backend(backend)
+            # Interactive candidates sharing the quota in this process go first
+            manager.llm_priority = PRIORITY_BATCH
+            # Generate questions in the confirming turn itself, so per-state LLM call
+            # counts don't depend on when a background prefetch happens to finish
+            manager.prefetch_questions = False
+
+            for user_input in transcript["inputs"]:
+                if not manager.is_active:
+                    break
+                state = manager.state
+                calls_before = manager.llm_calls
+                turn_started = time.perf_counter()
+                response = manager.process_input(user_input)
+                result["turns"].append({
+                    "state": state,
+                    "seconds": time.perf_counter() - turn_started,
+                    "llm_calls": manager.llm_calls - calls_before,
+                    "response_chars": len(response)
+                })
+            result["llm_calls"] = manager.llm_calls
+
+            result["final_state"] = manager.state
+            result["completed"] = not manager.is_active
+            result["summary"] = manager.get_conversation_summary()
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def build_report(results: List[Dict[str, Any]], wall_seconds: float, workers: int) -> Dict[str, Any]:
+    """
+    Aggregate per-transcript results into a report.
+
+    Args:
+        results: Outputs of run_transcript
+        wall_seconds: Elapsed time for the whole batch
+        workers: Size of the process pool
+
+    Returns:
+        Dict: Aggregate statistics plus the individual results
+    """
+    latencies: Dict[str, List[float]] = {}
+    llm_calls: Dict[str, int] = {}
+    for result in results:
+        for turn in result["turns"]:
+            latencies.setdefault(turn["state"], []).append(turn["seconds"])
+            llm_calls[turn["state"]] = llm_calls.get(turn["state"], 0) + turn["llm_calls"]
+
+    per_state = {
+        state: {
+            "turns": len(values),
+            "llm_calls": llm_calls[state],
+            "mean_seconds": sum(values) / len(values),
+            "p50_seconds": percentile(values, 50),
+            "p95_seconds": percentile(values, 95),
+            "max_seconds": max(values)
+        }
+        for state, values in latencies.items()
+    }
+
+    return {
+        "transcripts": len(results),
+        "completed": sum(1 for result in results if result.get("completed")),
+        "errors": sum(1 for result in results if result["error"]),
+        "workers": workers,
+        "wall_seconds": wall_seconds,
+        "transcripts_per_second": len(results) / wall_seconds if wall_seconds else 0.0,
+        "llm_calls": sum(result["llm_calls"] for result in results),
+        "per_state": per_state,
+        "results": results
+    }
+
+
+def run_batch(transcripts: List[Dict[str, Any]], workers: int = 4, quiet: bool = True,
+              backend: str = LLM_BACKEND, cache_path: Optional[str] = BATCH_QUESTION_CACHE_PATH) -> Dict[str, Any]:
+    """
+    Run transcripts across a process pool and build the report.
+
+    Args:
+        transcripts: Transcripts with "id" and "inputs"
+        workers: Number of worker processes (1 runs in-process)
+        quiet: Silence the manager's debug output
+        backend: Name of the LLM backend to use
+        cache_path: Scratch question cache file (None keeps it in memory)
+
+    Returns:
+        Dict: Report produced by build_report
+    """
+    started = time.perf_counter()
+    if workers <= 1:
+        _use_scratch_cache(cache_path)
+        results = [run_transcript(transcript, quiet, backend) for transcript in transcripts]
+    else:
+        worker_cache_dir = None
+        if cache_path:
+            cache_dir = os.path.dirname(cache_path) or "."
+            os.makedirs(cache_dir, exist_ok=True)
+            worker_cache_dir = tempfile.mkdtemp(prefix=".workers-", dir=cache_dir)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(workers, cache_path, worker_cache_dir)) as pool:
+                results = list(pool.map(
+                    run_transcript, transcripts, [quiet] * len(transcripts), [backend] * len(transcripts)
+                ))
+        finally:
+            if worker_cache_dir:
+                _merge_worker_caches(cache_path, worker_cache_dir)
+    report = build_report(results, time.perf_counter() - started, workers)
+    report["backend"] = backend
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay scripted interviews through ConversationManager.")
+    parser.add_argument("paths", nargs="*", help="Transcript files or directories")
+    parser.add_argument("--from-user-data", metavar="DIR", help="Rebuild transcripts from saved candidate JSON files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--backend", choices=["gemini", "replay", "record"], default=LLM_BACKEND,
+                        help="LLM backend (replay runs offline from recorded fixtures)")
+    parser.add_argument("--question-cache", default=BATCH_QUESTION_CACHE_PATH,
+                        help="Scratch question cache file, kept apart from the live one")
+    parser.add_argument("--report", help="Write the JSON report here (defaults to stdout)")
+    parser.add_argument("--verbose", action="store_true", help="Show the manager's debug output")
+    args = parser.parse_args()
+
+    transcripts = list(load_transcripts(args.paths))
+    if args.from_user_data:
+        for record_id, record in JSONFileStore(args.from_user_data).iter_candidates():
+            transcript = transcript_from_record(record_id, record)
+            if transcript is None:
+                print(f"Skipping {record_id}: missing or invalid fields", file=sys.stderr)
+            else:
+                transcripts.append(transcript)
+
+    if not transcripts:
+        parser.error("no transcripts to run")
+
+    report = run_batch(transcripts, workers=args.workers, quiet=not args.verbose, backend=args.backend,
+                       cache_path=args.question_cache)
+    output = json.dumps(report, indent=2, default=str)
+    if args.report:
+        with open(args.report, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark per-turn LLM request overhead as an interview grows.
+
+Compares rebuilding the Gemini history on every call (the previous behaviour)
+with the live chat session kept by ConversationManager. Gemini itself is
+replaced by an in-process stand-in so only local overhead is measured.
+
+Usage:
+    python benchmarks/bench_chat_history.py [--turns 5000]
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot import ConversationManager  # noqa: E402
+from llm_backends import LLMBackend, LLMSession  # noqa: E402
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeChat:
+    """Mimics google.generativeai.ChatSession bookkeeping without network calls."""
+
+    def __init__(self, history):
+        # The SDK converts and copies the history passed to start_chat
+        self.history = [dict(item) for item in history]
+        self._last = None
+
+    def send_message(self, prompt, **kwargs):
+        self._last = ({"role": "user", "parts": [{"text": prompt}]},
+                      {"role": "model", "parts": [{"text": "ok"}]})
+        return _FakeResponse("ok")
+
+    def rewind(self):
+        last, self._last = self._last, None
+        return last
+
+
+class _FakeSession(LLMSession):
+    def __init__(self):
+        self.history = []
+
+    def send(self, prompt):
+        return "ok"
+
+
+class _FakeBackend(LLMBackend):
+    def start_session(self):
+        return _FakeSession()
+
+    def generate(self, prompt):
+        return "ok"
+
+
+def _legacy_request(manager, prompt):
+    """The pre-session implementation: convert everything and start a new chat."""
+    history = []
+    for msg in manager.conversation_history:
+        if msg.role == "user":
+            history.append({"role": "user", "parts": [{"text": msg.content}]})
+        elif msg.role == "assistant":
+            history.append({"role": "model", "parts": [{"text": msg.content}]})
+    chat = _FakeChat(history)
+    return chat.send_message(prompt).text
+
+
+def run(turns, checkpoints):
+    """
+    Grow one conversation and time an LLM call at each checkpoint.
+
+    Args:
+        turns: Total number of user/assistant turns to simulate
+        checkpoints: Turn counts at which to take measurements
+
+    Returns:
+        List: (turns, legacy microseconds, session microseconds) rows
+    """
+    manager = ConversationManager()
+    manager.backend = _FakeBackend()
+    rows = []
+    repeats = 20
+
+    # Silence the per-call debug logging so it doesn't dominate the timings
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for turn in range(1, turns + 1):
+            manager.transcript.append("user", f"answer {turn} " * 20)
+            manager.transcript.append("assistant", f"reply {turn} " * 20)
+            # Keep the session in sync every turn, as a real interview would
+            manager._get_llm_response("ping")
+
+            if turn in checkpoints:
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    _legacy_request(manager, "ping")
+                legacy = (time.perf_counter() - start) / repeats * 1e6
+
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    manager._get_llm_response("ping")
+                session = (time.perf_counter() - start) / repeats * 1e6
+                rows.append((turn, legacy, session))
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=5000)
+    args = parser.parse_args()
+
+    checkpoints = {n for n in (10, 100, 1000, 5000, 10000) if n <= args.turns}
+    print(f"{'turns':>8} {'rebuild (us)':>14} {'session (us)':>14}")
+    for turn, legacy, session in run(args.turns, checkpoints):
+        print(f"{turn:>8} {legacy:>14.1f} {session:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark the per-rerun cost of rendering the chat window as the transcript grows.
+
+Compares formatting every message into its own markdown element on each
+rerun (the previous behaviour) with ChatRenderer, which caches each message's
+HTML and returns one block. Streamlit itself is not involved; the number of
+markdown elements each approach sends is reported alongside the timings.
+
+Usage:
+    python benchmarks/bench_chat_render.py [--messages 5000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chat_render import ChatRenderer, format_message_html  # noqa: E402
+from transcript import Transcript, FOR_CHAT  # noqa: E402
+
+
+def _legacy_rerun(view):
+    """The previous main() loop: one freshly formatted element per message."""
+    elements = []
+    for message in view:
+        elements.append(format_message_html(message.role, message.content, message.timestamp))
+    return elements
+
+
+def _time(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def run(messages, checkpoints):
+    """
+    Grow one transcript and time a rerun at each checkpoint.
+
+    Args:
+        messages: Total number of messages to add
+        checkpoints: Message counts at which to take measurements
+
+    Returns:
+        List: (messages, legacy us, new-message us, unchanged us) rows
+    """
+    transcript = Transcript()
+    view = transcript.view(FOR_CHAT)
+    renderer = ChatRenderer()
+    rows = []
+    repeats = 20
+    for count in range(1, messages + 1):
+        role = "user" if count % 2 else "assistant"
+        transcript.append(role, f"message {count} " * 30)
+        renderer.render(view)
+        if count in checkpoints:
+            legacy = _time(lambda: _legacy_rerun(view), repeats)
+
+            def rerun_after_append():
+                # One new message per rerun, as in a live interview
+                transcript.append("assistant", "follow-up " * 30)
+                renderer.render(view)
+            incremental = _time(rerun_after_append, repeats)
+            unchanged = _time(lambda: renderer.render(view), repeats)
+            rows.append((count, legacy, incremental, unchanged))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=5000)
+    args = parser.parse_args()
+
+    checkpoints = {n for n in (10, 100, 1000, 5000, 10000) if n <= args.messages}
+    print(f"{'messages':>9} {'per-message (us)':>17} {'cached, +1 (us)':>16} {'cached, same (us)':>18} {'elements':>9}")
+    for count, legacy, incremental, unchanged in run(args.messages, checkpoints):
+        print(f"{count:>9} {legacy:>17.1f} {incremental:>16.1f} {unchanged:>18.1f} {f'{count} -> 1':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark the memory each live session spends on its transcript.
+
+Compares the previous layout, where ConversationManager.conversation_history
+and st.session_state.chat_history each held a dict per message (the latter
+with a formatted timestamp), with the shared, array-backed Transcript. One
+scripted interview is run against the simulated model to get realistic
+messages; every session then holds its own copy of those strings.
+
+Usage:
+    python benchmarks/bench_session_memory.py [--sessions 1000,10000]
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+from load_test import SimulatedBackend, candidate_script  # noqa: E402
+from transcript import Transcript, FOR_LLM, FOR_CHAT  # noqa: E402
+
+
+def _template():
+    """(role, content, visibility) of every message in one simulated interview."""
+    manager = chatbot.ConversationManager()
+    manager.backend = SimulatedBackend(latency_ms=0)
+    manager.use_question_cache = False
+    manager.use_question_bank = False
+    manager.prefetch_questions = False
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for user_input in candidate_script(1):
+            manager.process_input(user_input)
+    messages = [manager.transcript.message(index) for index in range(len(manager.transcript))]
+    return [(message.role, message.content, message.visibility) for message in messages]
+
+
+def _legacy_session(template, number):
+    """The previous layout: two lists of message dicts sharing the content strings."""
+    conversation_history = []
+    chat_history = []
+    for role, content, visibility in template:
+        if role != "system":
+            # Every session received its own strings from the candidate and the LLM
+            content = f"{content} #{number}"
+        if visibility & FOR_LLM:
+            conversation_history.append({"role": role, "content": content})
+        if visibility & FOR_CHAT:
+            chat_history.append({"role": role, "content": content,
+                                 "timestamp": datetime.now().strftime("%H:%M:%S")})
+    return conversation_history, chat_history
+
+
+def _transcript_session(template, number):
+    """The shared transcript."""
+    transcript = Transcript()
+    for role, content, visibility in template:
+        if role != "system":
+            content = f"{content} #{number}"
+        transcript.append(role, content, visibility)
+    return transcript
+
+
+def measure(build, template, sessions):
+    """
+    Build many sessions and measure the memory they hold.
+
+    Args:
+        build: Function creating one session's transcript data
+        template: Messages from _template()
+        sessions: Number of sessions kept alive at once
+
+    Returns:
+        Tuple: (bytes per session, seconds to build all sessions)
+    """
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        kept = [build(template, number) for number in range(sessions)]
+        elapsed = time.perf_counter() - start
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    del kept
+    return retained / sessions, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", default="1000,10000", help="Comma-separated concurrent session counts")
+    args = parser.parse_args()
+
+    template = _template()
+    print(f"{len(template)} messages per interview")
+    print(f"{'sessions':>9} {'dicts (B/session)':>18} {'transcript (B/session)':>23} {'saved':>7}")
+    for sessions in (int(value) for value in args.sessions.split(",")):
+        legacy, _ = measure(_legacy_session, template, sessions)
+        compact, _ = measure(_transcript_session, template, sessions)
+        print(f"{sessions:>9} {legacy:>18.0f} {compact:>23.0f} {1 - compact / legacy:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Check that importing the chatbot modules stays fast and side-effect free.
+
+Runs a fresh interpreter with `-X importtime` for each module, fails if the
+cumulative import time exceeds the budget, and fails if the import pulled in
+modules that must only be loaded on first use (the Gemini SDK, Streamlit,
+python-dotenv, asyncio, subprocess).
+
+Usage:
+    python benchmarks/check_import_time.py [--budget-ms 150] [--runs 3]
+
+Exits with status 1 when a check fails, so it can run in CI.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules checked, and modules they must not load at import time
+MODULES = ["config", "chatbot"]
+FORBIDDEN_MODULES = ["google.generativeai", "streamlit", "dotenv", "asyncio", "subprocess"]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure_import(module, runs):
+    """
+    Measure the best-of-N cumulative import time of a module in a fresh interpreter.
+
+    Args:
+        module: Module name to import
+        runs: Number of interpreter runs
+
+    Returns:
+        Tuple: (best cumulative milliseconds, sorted list of forbidden modules loaded)
+    """
+    best_us = None
+    loaded = []
+    check = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {FORBIDDEN_MODULES!r} if m in sys.modules))"
+    )
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", check],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        for line in result.stderr.splitlines():
+            match = _IMPORTTIME_LINE.match(line)
+            if match and len(match.group(3)) == 1 and match.group(4) == module:
+                cumulative = int(match.group(2))
+                best_us = cumulative if best_us is None else min(best_us, cumulative)
+        loaded = sorted(filter(None, result.stdout.strip().split(",")))
+    return (best_us or 0) / 1000, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check chatbot import time and side effects.")
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        elapsed_ms, loaded = measure_import(module, args.runs)
+        status = "ok"
+        if elapsed_ms > args.budget_ms:
+            status = f"over budget ({args.budget_ms:.0f} ms)"
+            failed = True
+        if loaded:
+            status = f"loaded at import: {', '.join(loaded)}"
+            failed = True
+        print(f"{module:<12} {elapsed_ms:8.1f} ms  {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
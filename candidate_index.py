@@ -0,0 +1,427 @@
+"""
+Queryable index over saved candidate interviews for the TalentScout Hiring Assistant.
+
+Usage:
+    python candidate_index.py --tech kubernetes --min-experience 5
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from config import TECH_ALIASES, CANDIDATE_INDEX_PATH
+from storage import CandidateStore, get_candidate_store
+from utils import canonicalize_tech, parse_experience_years
+
+# Bump when the persisted layout changes; older index files are rebuilt
+INDEX_FORMAT_VERSION = 2
+
+
+class CandidateIndex:
+    """
+    In-memory index of candidate records, maintained incrementally.
+
+    Each record is parsed once into a compact summary. Summaries feed an
+    inverted index on canonical tech names, an email index, and sorted keys
+    for numeric experience and submission time, so filters are answered
+    without touching the stored records.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the index, loading a persisted copy if one exists.
+
+        Args:
+            path: JSON file used by save() and load() (None keeps the index in memory)
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        # Store version (see CandidateStore.list_versions) of each record indexed by refresh()
+        self._versions: Dict[str, Any] = {}
+        self._by_tech: Dict[str, Set[str]] = {}
+        self._by_email: Dict[str, Set[str]] = {}
+        # Parallel sorted lists of (key, record_id) for range queries
+        self._by_experience: List[Tuple[float, str]] = []
+        self._by_submission: List[Tuple[str, str]] = []
+        self._dirty = False
+
+        if path:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    @staticmethod
+    def summarize(record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extract the indexed fields from a candidate record.
+
+        Args:
+            record: Candidate record as saved by the app
+
+        Returns:
+            Dict: Compact summary with canonical techs and numeric experience
+        """
+        tech_stack = record.get("tech_stack") or []
+        if isinstance(tech_stack, str):
+            tech_stack = [tech_stack]
+        return {
+            "name": record.get("name", ""),
+            "email": (record.get("email") or "").lower(),
+            "experience": parse_experience_years(record.get("experience")),
+            "techs": sorted({canonicalize_tech(tech, TECH_ALIASES) for tech in tech_stack if str(tech).strip()}),
+            "submission_time": record.get("submission_time") or "",
+            "interview_status": record.get("interview_status", "")
+        }
+
+    def add(self, record_id: str, record: Dict[str, Any]) -> None:
+        """
+        Index a record, replacing any previous version with the same id.
+
+        Args:
+            record_id: Identifier of the record in its store
+            record: Candidate record
+        """
+        self._add_summary(record_id, self.summarize(record))
+
+    def add_many(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Index many records at once, sorting the range keys a single time.
+
+        Args:
+            records: (record_id, record) pairs
+
+        Returns:
+            int: Number of records indexed
+        """
+        return self._add_summaries((record_id, self.summarize(record)) for record_id, record in records)
+
+    def _add_summary(self, record_id: str, summary: Dict[str, Any]) -> None:
+        with self._lock:
+            if record_id in self._summaries:
+                self.remove(record_id)
+
+            self._index_summary(record_id, summary)
+            if summary["experience"] is not None:
+                entry = (summary["experience"], record_id)
+                self._by_experience.insert(bisect_left(self._by_experience, entry), entry)
+            entry = (summary["submission_time"], record_id)
+            self._by_submission.insert(bisect_left(self._by_submission, entry), entry)
+            self._dirty = True
+
+    def _add_summaries(self, summaries: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        count = 0
+        with self._lock:
+            for record_id, summary in summaries:
+                if record_id in self._summaries:
+                    self.remove(record_id)
+                self._index_summary(record_id, summary)
+                if summary["experience"] is not None:
+                    self._by_experience.append((summary["experience"], record_id))
+                self._by_submission.append((summary["submission_time"], record_id))
+                count += 1
+            if count:
+                self._by_experience.sort()
+                self._by_submission.sort()
+                self._dirty = True
+        return count
+
+    def _index_summary(self, record_id: str, summary: Dict[str, Any]) -> None:
+        """Add a summary to the hash indexes. Must be called with the lock held."""
+        self._summaries[record_id] = summary
+        for tech in summary["techs"]:
+            self._by_tech.setdefault(tech, set()).add(record_id)
+        if summary["email"]:
+            self._by_email.setdefault(summary["email"], set()).add(record_id)
+
+    def remove(self, record_id: str) -> None:
+        """
+        Drop a record from the index.
+
+        Args:
+            record_id: Identifier of the record in its store
+        """
+        with self._lock:
+            self._versions.pop(record_id, None)
+            summary = self._summaries.pop(record_id, None)
+            if summary is None:
+                return
+
+            for tech in summary["techs"]:
+                ids = self._by_tech.get(tech)
+                if ids is not None:
+                    ids.discard(record_id)
+                    if not ids:
+                        del self._by_tech[tech]
+            ids = self._by_email.get(summary["email"])
+            if ids is not None:
+                ids.discard(record_id)
+                if not ids:
+                    del self._by_email[summary["email"]]
+            if summary["experience"] is not None:
+                _remove_sorted(self._by_experience, (summary["experience"], record_id))
+            _remove_sorted(self._by_submission, (summary["submission_time"], record_id))
+            self._dirty = True
+
+    def refresh(self, store: CandidateStore) -> Dict[str, int]:
+        """
+        Bring the index up to date with a store, parsing only records that are new
+        or were rewritten since they were indexed.
+
+        Args:
+            store: Candidate store to index
+
+        Returns:
+            Dict: Number of records added, updated and removed
+        """
+        versions = store.list_versions()
+        with self._lock:
+            known_versions = dict(self._versions)
+            known_ids = set(self._summaries)
+
+        stale_ids = sorted(
+            record_id for record_id, version in versions.items()
+            if record_id not in known_versions or known_versions[record_id] != version
+        )
+        records = (
+            (record_id, record)
+            for record_id, record in ((record_id, store.get_candidate(record_id)) for record_id in stale_ids)
+            if record is not None
+        )
+        self.add_many(records)
+        added = updated = 0
+        with self._lock:
+            for record_id in stale_ids:
+                if record_id in self._summaries:
+                    self._versions[record_id] = versions[record_id]
+                    if record_id in known_ids:
+                        updated += 1
+                    else:
+                        added += 1
+
+        removed_ids = known_ids - set(versions)
+        for record_id in removed_ids:
+            self.remove(record_id)
+
+        return {"added": added, "updated": updated, "removed": len(removed_ids)}
+
+    def query(
+        self,
+        techs: Optional[Iterable[str]] = None,
+        any_techs: Optional[Iterable[str]] = None,
+        min_experience: Optional[float] = None,
+        max_experience: Optional[float] = None,
+        email: Optional[str] = None,
+        submitted_after: Optional[str] = None,
+        submitted_before: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[str]:
+        """
+        Find candidates matching all of the given filters.
+
+        Args:
+            techs: Technologies the candidate must all have
+            any_techs: Technologies of which the candidate must have at least one
+            min_experience: Minimum years of experience (inclusive)
+            max_experience: Maximum years of experience (inclusive)
+            email: Exact email address (case-insensitive)
+            submitted_after: Earliest submission time, "YYYY-MM-DD[ HH:MM:SS]" (inclusive)
+            submitted_before: Latest submission time, "YYYY-MM-DD[ HH:MM:SS]" (exclusive)
+            status: Interview status such as "complete"
+            limit: Maximum number of results
+
+        Returns:
+            List[str]: Matching record ids, most recent submission first
+        """
+        with self._lock:
+            # Start from the most selective indexed set, then filter on summaries
+            candidate_sets = []
+            for tech in techs or []:
+                candidate_sets.append(self._by_tech.get(canonicalize_tech(tech, TECH_ALIASES), set()))
+            if any_techs:
+                union = set()
+                for tech in any_techs:
+                    union |= self._by_tech.get(canonicalize_tech(tech, TECH_ALIASES), set())
+                candidate_sets.append(union)
+            if email:
+                candidate_sets.append(self._by_email.get(email.lower(), set()))
+
+            if candidate_sets:
+                candidate_sets.sort(key=len)
+                matches = set(candidate_sets[0])
+                for ids in candidate_sets[1:]:
+                    matches &= ids
+                    if not matches:
+                        break
+                ranged = False
+            elif min_experience is not None or max_experience is not None:
+                matches = self._experience_range(min_experience, max_experience)
+                ranged = True
+            else:
+                matches = self._submission_range(submitted_after, submitted_before)
+                ranged = False
+
+            # Order by submission time; walking the sorted key list is cheaper than sorting large sets
+            if len(matches) * 4 > len(self._summaries):
+                ordered = (record_id for _, record_id in reversed(self._by_submission) if record_id in matches)
+            else:
+                ordered = sorted(
+                    matches,
+                    key=lambda record_id: (self._summaries[record_id]["submission_time"], record_id),
+                    reverse=True
+                )
+
+            check_experience = not ranged and (min_experience is not None or max_experience is not None)
+            results = []
+            for record_id in ordered:
+                summary = self._summaries[record_id]
+                if check_experience:
+                    experience = summary["experience"]
+                    if experience is None:
+                        continue
+                    if min_experience is not None and experience < min_experience:
+                        continue
+                    if max_experience is not None and experience > max_experience:
+                        continue
+                if submitted_after and summary["submission_time"] < submitted_after:
+                    continue
+                if submitted_before and summary["submission_time"] >= submitted_before:
+                    continue
+                if status and summary["interview_status"] != status:
+                    continue
+                results.append(record_id)
+                if limit and len(results) >= limit:
+                    break
+
+            return results
+
+    def get_summary(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the indexed summary of a record.
+
+        Args:
+            record_id: Identifier of the record in its store
+
+        Returns:
+            Optional[Dict]: Summary, or None if the record isn't indexed
+        """
+        with self._lock:
+            summary = self._summaries.get(record_id)
+            return dict(summary) if summary else None
+
+    def _experience_range(self, minimum: Optional[float], maximum: Optional[float]) -> Set[str]:
+        """Ids whose experience lies in [minimum, maximum]. Must be called with the lock held."""
+        start = bisect_left(self._by_experience, (minimum, "")) if minimum is not None else 0
+        end = bisect_right(self._by_experience, (maximum, "\uffff")) if maximum is not None else len(self._by_experience)
+        return {record_id for _, record_id in self._by_experience[start:end]}
+
+    def _submission_range(self, after: Optional[str], before: Optional[str]) -> Set[str]:
+        """Ids submitted in [after, before). Must be called with the lock held."""
+        start = bisect_left(self._by_submission, (after, "")) if after else 0
+        end = bisect_left(self._by_submission, (before, "")) if before else len(self._by_submission)
+        return {record_id for _, record_id in self._by_submission[start:end]}
+
+    def save(self) -> None:
+        """Persist the summaries so that a restart doesn't need to reparse records."""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty and os.path.exists(self.path):
+                return
+            data = {"version": INDEX_FORMAT_VERSION, "summaries": self._summaries, "versions": self._versions}
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+    def load(self) -> None:
+        """Load persisted summaries and rebuild the in-memory indexes from them."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Candidate index could not be loaded from {self.path}: {e}")
+            return
+        if data.get("version") != INDEX_FORMAT_VERSION:
+            return
+
+        with self._lock:
+            self._add_summaries(data.get("summaries", {}).items())
+            self._versions.update(data.get("versions", {}))
+            self._dirty = False
+
+
+def _remove_sorted(entries: List[Tuple[Any, str]], entry: Tuple[Any, str]) -> None:
+    """Remove an entry from a sorted list if present."""
+    position = bisect_left(entries, entry)
+    if position < len(entries) and entries[position] == entry:
+        del entries[position]
+
+
+_shared_index: Optional[CandidateIndex] = None
+_shared_index_lock = threading.Lock()
+
+
+def get_candidate_index(refresh: bool = True) -> CandidateIndex:
+    """
+    Get the process-wide candidate index, synced with the configured store.
+
+    Args:
+        refresh: Index records saved since the last call before returning
+
+    Returns:
+        CandidateIndex: Shared index instance
+    """
+    global _shared_index
+    with _shared_index_lock:
+        if _shared_index is None:
+            _shared_index = CandidateIndex(CANDIDATE_INDEX_PATH)
+        index = _shared_index
+    if refresh:
+        changes = index.refresh(get_candidate_store())
+        if any(changes.values()):
+            index.save()
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query saved candidates.")
+    parser.add_argument("--tech", action="append", default=[], help="Required technology (repeatable)")
+    parser.add_argument("--any-tech", action="append", default=[], help="At least one of these technologies (repeatable)")
+    parser.add_argument("--min-experience", type=float)
+    parser.add_argument("--max-experience", type=float)
+    parser.add_argument("--email")
+    parser.add_argument("--submitted-after")
+    parser.add_argument("--submitted-before")
+    parser.add_argument("--status")
+    parser.add_argument("--limit", type=int)
+    args = parser.parse_args()
+
+    index = get_candidate_index()
+    results = index.query(
+        techs=args.tech,
+        any_techs=args.any_tech,
+        min_experience=args.min_experience,
+        max_experience=args.max_experience,
+        email=args.email,
+        submitted_after=args.submitted_after,
+        submitted_before=args.submitted_before,
+        status=args.status,
+        limit=args.limit
+    )
+    for record_id in results:
+        print(json.dumps({"id": record_id, **index.get_summary(record_id)}))
+
+
+if __name__ == "__main__":
+    main()
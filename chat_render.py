@@ -0,0 +1,221 @@
+"""
+Chat rendering for the TalentScout Hiring Assistant.
+
+Streamlit reruns the whole script on every interaction, so the chat window
+is re-sent each time. ChatRenderer keeps the HTML of every message it has
+rendered and joins it into a single markdown block, so a rerun only formats
+messages added since the previous one.
+"""
+import re
+from datetime import datetime
+from typing import Dict, List
+
+from transcript import TranscriptView
+
+# Custom CSS for better UI with text wrapping fixes and better color contrast
+_STYLESHEET = """
+.chat-message {
+    padding: 1.5rem;
+    border-radius: 0.5rem;
+    margin-bottom: 1rem;
+    display: flex;
+    flex-direction: column;
+}
+.chat-message.user {
+    background-color: #F0F2F6;
+    border-left: 5px solid #7E57C2;
+    color: #111; /* Dark text for light backgrounds */
+}
+.chat-message.assistant {
+    background-color: #FAFAFA;
+    border-left: 5px solid #26A69A;
+    color: #111; /* Dark text for light backgrounds */
+}
+.chat-message .message-content {
+    display: flex;
+    margin-top: 0;
+    /* Fix for text wrapping */
+    white-space: normal;
+    word-wrap: break-word;
+    overflow-wrap: break-word;
+}
+.message-timestamp {
+    font-size: 0.8rem;
+    color: #666;
+    margin-top: 0.2rem;
+}
+.visually-hidden {
+    display: none;
+}
+div.stButton > button {
+    width: 100%;
+}
+/* Improved Technical Question Styling with text wrapping fixes */
+.technical-question-container {
+    background-color: #f8f9fa;
+    padding: 1.5rem;
+    border-radius: 0.5rem;
+    border-left: 5px solid #3498db;
+    margin-bottom: 1.5rem;
+    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+    /* Fix for text wrapping */
+    white-space: normal;
+    word-wrap: break-word;
+    overflow-wrap: break-word;
+}
+.technical-question-text {
+    font-size: 1.1rem;
+    line-height: 1.6;
+    color: #2c3e50;
+    margin: 0;
+    padding: 0;
+    text-align: left;
+    /* Fix for text wrapping */
+    white-space: normal;
+    word-wrap: break-word;
+    overflow-wrap: break-word;
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+}
+/* Styling for text areas */
+.stTextArea textarea {
+    border: 1px solid #ddd;
+    border-radius: 5px;
+    padding: 10px;
+    font-size: 1rem;
+    line-height: 1.5;
+    resize: vertical;
+    /* Fix for text wrapping */
+    white-space: normal;
+    word-wrap: break-word;
+    overflow-wrap: break-word;
+}
+/* Button styling */
+.stButton button {
+    background-color: #3498db;
+    color: white;
+    border: none;
+    padding: 0.5rem 1rem;
+    border-radius: 5px;
+    cursor: pointer;
+    font-weight: 500;
+    transition: background-color 0.3s;
+}
+.stButton button:hover {
+    background-color: #2980b9;
+}
+/* Success message styling */
+.stSuccess {
+    background-color: #d4edda;
+    color: #155724;
+    padding: 1rem;
+    border-radius: 5px;
+    border-left: 5px solid #28a745;
+    margin-bottom: 1rem;
+}
+/* Global text wrapping styles */
+p, div, span, h1, h2, h3, h4, h5, h6 {
+    white-space: normal !important;
+    word-wrap: break-word !important;
+    overflow-wrap: break-word !important;
+}
+/* Fix for markdown content */
+.markdown-text-container {
+    white-space: normal !important;
+    word-wrap: break-word !important;
+    overflow-wrap: break-word !important;
+}
+/* Force Streamlit elements to wrap properly */
+.element-container, .stMarkdown, .stText {
+    white-space: normal !important;
+    word-wrap: break-word !important;
+    overflow-wrap: break-word !important;
+}
+"""
+
+
+def _minify_css(stylesheet: str) -> str:
+    """Drop comments and redundant whitespace from a stylesheet."""
+    stylesheet = re.sub(r"/\*.*?\*/", "", stylesheet, flags=re.S)
+    stylesheet = re.sub(r"\s+", " ", stylesheet)
+    return re.sub(r"\s*([{};:,>])\s*", r"\1", stylesheet).strip()
+
+
+# Minified once at import; the same string is emitted on every rerun
+CHAT_CSS = f"<style>{_minify_css(_STYLESHEET)}</style>"
+
+# Speaker label per role
+_SPEAKERS = {"user": "You", "assistant": "Hiring Assistant"}
+
+
+def format_message_html(role: str, content: str, timestamp: str = None) -> str:
+    """
+    Build the styled HTML block for a chat message.
+
+    Args:
+        role: 'user' or 'assistant'
+        content: Message content
+        timestamp: Optional timestamp for the message
+
+    Returns:
+        str: HTML for the message, on one line so blocks can be concatenated in markdown
+    """
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%H:%M:%S")
+    # Ensure content is properly formatted for HTML
+    content = content.replace("\n", "<br>")
+    css_class = "user" if role == "user" else "assistant"
+    speaker = _SPEAKERS.get(role, _SPEAKERS["assistant"])
+    return (
+        f'<div class="chat-message {css_class}">'
+        f'<div class="message-content"><b>{speaker}:</b> {content}</div>'
+        f'<div class="message-timestamp">{timestamp}</div>'
+        f'</div>'
+    )
+
+
+class ChatRenderer:
+    """
+    Renders a transcript view as one HTML block, caching each message's HTML.
+
+    One renderer belongs to one session. Messages are keyed by their index in
+    the transcript, which never changes once appended.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._messages: Dict[int, str] = {}
+        self._positions: List[int] = []
+        self._version = None
+        self._html = ""
+
+    def render(self, view: TranscriptView) -> str:
+        """
+        Get the HTML of every message in a view.
+
+        Args:
+            view: Messages to show, usually the transcript's FOR_CHAT view
+
+        Returns:
+            str: Concatenated message HTML (unchanged transcripts return the cached block)
+        """
+        if view.version == self._version:
+            return self._html
+        positions = view.positions()
+        rendered = len(self._positions)
+        if positions[:rendered] == self._positions:
+            # Messages were only added; format and append the new ones
+            self._html += "".join(self._message_html(view, index) for index in positions[rendered:])
+        else:
+            self._html = "".join(self._message_html(view, index) for index in positions)
+        self._positions = list(positions)
+        self._version = view.version
+        return self._html
+
+    def _message_html(self, view: TranscriptView, index: int) -> str:
+        """HTML of the transcript message at an index, formatted on first use."""
+        html = self._messages.get(index)
+        if html is None:
+            message = view.transcript.message(index)
+            html = format_message_html(message.role, message.content, message.timestamp)
+            self._messages[index] = html
+        return html
@@ -1,50 +1,177 @@
 """
 Chatbot logic for the TalentScout Hiring Assistant.
 """
-import os
-import subprocess
-
-# Ensure required packages are installed
-required_packages = ["python-dotenv", "google-generativeai"]
-
-for package in required_packages:
-    try:
-        __import__(package.replace("-", "_"))  # Try importing the package
-    except ImportError:
-        subprocess.run(["pip", "install", package])
-
-import google.generativeai as genai  # Now import your required module
-
+import threading
 import time
-from typing import Dict, List, Tuple, Any, Optional
+from collections import deque
+from typing import Dict, List, Tuple, Any, Optional, Iterator
 
 
 from config import (
-    GEMINI_API_KEY, 
-    GEMINI_MODEL, 
     SYSTEM_PROMPT, 
     EXIT_KEYWORDS,
     REQUIRED_INFO,
     INFO_PROMPTS,
     CONFIRMATION_MESSAGE,
     TECH_QUESTION_PROMPT,
-    CLOSING_MESSAGE
+    TECH_QUESTION_JSON_PROMPT,
+    QUESTION_REPAIR_PROMPT,
+    QUESTION_OUTPUT_FORMAT,
+    QUESTION_DIFFICULTIES,
+    CLOSING_MESSAGE,
+    QUESTION_CACHE_ENABLED,
+    QUESTION_BANK_ENABLED,
+    QUESTION_PREFETCH_ENABLED,
+    QUESTION_PREFETCH_WORKERS,
+    QUESTION_COUNT_MAX,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS,
+    LLM_REQUEST_TIMEOUT_SECONDS,
+    LLM_MAX_CONCURRENT_REQUESTS,
+    LLM_COALESCE_REQUESTS,
+    LLM_QUEUE_TIMEOUT_SECONDS,
+    PROMPT_TOKEN_BUDGET,
+    HISTORY_RECENT_MESSAGES,
+    HISTORY_SUMMARY_MAX_EXCERPTS,
+    HISTORY_SUMMARY_EXCERPT_CHARS
+)
+from concurrency import (
+    AsyncConcurrencyLimiter,
+    SingleFlight,
+    RateLimitTimeout,
+    PRIORITY_LIVE,
+    PRIORITY_NAMES,
+    backoff_delay
 )
+from llm_backends import LLMBackend, get_llm_backend, get_rate_scheduler
+from metrics import get_metrics_registry, SIZE_BUCKETS
+from question_bank import get_question_bank
+from question_cache import get_question_cache, make_cache_key
+from transcript import Transcript, TranscriptView, FOR_LLM
 from utils import (
     validate_email, 
     validate_phone, 
     format_candidate_summary,
     check_exit_keywords,
-    parse_tech_stack
+    parse_tech_stack,
+    parse_technical_questions,
+    parse_question_json,
+    QuestionJSONStreamParser,
+    estimate_tokens
 )
 
-# Configure Gemini API
-genai.configure(api_key=GEMINI_API_KEY)
+# Returned by _get_llm_response when every retry has failed
+LLM_ERROR_RESPONSE = "I'm currently experiencing difficulties in generating a response. Please try again later."
+
+# Shared by every ConversationManager in the process so async sessions can't flood Gemini
+_llm_limiter = AsyncConcurrencyLimiter(LLM_MAX_CONCURRENT_REQUESTS)
+
+# Identical one-off prompts in flight at the same time (e.g. many candidates with the same
+# stack confirming together) share a single backend request
+_llm_flight = SingleFlight()
+
+# Runs speculative question generation for every ConversationManager in the process
+_prefetch_executor = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def _get_prefetch_executor():
+    """Get the process-wide executor for question prefetches, created on first use."""
+    global _prefetch_executor
+    with _prefetch_executor_lock:
+        if _prefetch_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _prefetch_executor = ThreadPoolExecutor(
+                max_workers=QUESTION_PREFETCH_WORKERS, thread_name_prefix="question-prefetch"
+            )
+        return _prefetch_executor
+
+_metrics = get_metrics_registry()
+_turn_seconds = _metrics.histogram(
+    "talentscout_turn_seconds", "Time to process one user input, by conversation state", ["state", "mode"]
+)
+_llm_call_seconds = _metrics.histogram(
+    "talentscout_llm_call_seconds", "Duration of an LLM call including retries", ["mode", "outcome"]
+)
+_llm_retries = _metrics.counter("talentscout_llm_retries_total", "LLM request attempts that were retried", ["mode"])
+_llm_errors = _metrics.counter(
+    "talentscout_llm_errors_total", "Failed LLM request attempts, by exception type", ["mode", "error"]
+)
+_llm_coalesced = _metrics.counter(
+    "talentscout_llm_coalesced_total", "LLM request attempts served by an identical request already in flight", ["mode"]
+)
+_llm_prompt_tokens = _metrics.histogram(
+    "talentscout_llm_prompt_tokens", "Estimated tokens sent per LLM call (history and prompt)", ["mode"], SIZE_BUCKETS
+)
+_llm_response_tokens = _metrics.histogram(
+    "talentscout_llm_response_tokens", "Estimated tokens received per LLM call", ["mode"], SIZE_BUCKETS
+)
+_llm_queue_seconds = _metrics.histogram(
+    "talentscout_llm_queue_seconds", "Time an LLM request waited for rate-limit capacity", ["priority"]
+)
+_llm_queue_timeouts = _metrics.counter(
+    "talentscout_llm_queue_timeouts_total", "LLM requests abandoned after LLM_QUEUE_TIMEOUT_SECONDS in the queue", ["priority"]
+)
+_llm_queue_depth = _metrics.gauge("talentscout_llm_queue_depth", "LLM requests waiting for rate-limit capacity")
+_question_json_outcomes = _metrics.counter(
+    "talentscout_question_json_total", "Structured question responses by validation outcome", ["outcome"]
+)
+_question_bank_assemblies = _metrics.counter(
+    "talentscout_question_bank_assemblies_total", "Question sets by how much of the tech stack the bank covered", ["coverage"]
+)
+_question_prefetches = _metrics.counter(
+    "talentscout_question_prefetches_total",
+    "Background question generations by outcome (ready, waited, discarded or failed)", ["outcome"]
+)
+_history_compactions = _metrics.counter(
+    "talentscout_history_compactions_total", "Times a session history was compacted to PROMPT_TOKEN_BUDGET"
+)
+_history_compacted_messages = _metrics.counter(
+    "talentscout_history_compacted_messages_total", "Messages folded into the summary of a compacted history"
+)
+_question_cache_stats = _metrics.gauge("talentscout_question_cache", "Question cache counters", ["stat"])
+
+
+def _collect_question_cache_stats() -> None:
+    """Copy the question cache counters into gauges before an export."""
+    if QUESTION_CACHE_ENABLED:
+        for stat, value in get_question_cache().stats().items():
+            _question_cache_stats.set(value, stat=stat)
+
+
+_metrics.register_collector(_collect_question_cache_stats)
+_metrics.register_collector(lambda: _llm_queue_depth.set(get_rate_scheduler().waiting))
+
+# Returned when question generation is not possible
+NO_TECH_STACK_RESPONSE = "I'm unable to generate technical questions because no tech stack information was provided."
+QUESTION_ERROR_RESPONSE = "I'm currently experiencing difficulties in generating technical questions. Please try again later."
+
+# Longest rejected response quoted back to the LLM in a repair prompt
+QUESTION_REPAIR_MAX_CHARS = 4000
+
+# Prompt used when the conversation is in an unknown state
+FALLBACK_PROMPT = "Please respond to this message in the context of our conversation."
 
 class ConversationManager:
     """
     Manages the conversation state and flow for the hiring assistant chatbot.
     """
+
+    # States whose handlers never call the LLM
+    LOCAL_STATES = ("greeting", "collecting_info", "asking_tech_questions", "closing")
+    
+    # Queue priority of this conversation's LLM requests; batch runs use PRIORITY_BATCH
+    llm_priority = PRIORITY_LIVE
+    
+    # Whether questions may be generated in the background (with QUESTION_PREFETCH_ENABLED);
+    # batch runs turn it off so every LLM call belongs to the turn that made it
+    prefetch_questions = True
+    
+    # Whether questions may come from the question cache and bank (with QUESTION_CACHE_ENABLED
+    # and QUESTION_BANK_ENABLED); load tests turn them off so every candidate reaches the LLM
+    use_question_cache = True
+    use_question_bank = True
     
     def __init__(self):
         """Initialize the conversation manager."""
@@ -53,16 +180,38 @@ class ConversationManager:
         self.current_info_field = None
         self.candidate_info = {}
         self.technical_questions = []
-        self.conversation_history = []
+        # Structured questions ({"question", "technology", "difficulty"}) when QUESTION_OUTPUT_FORMAT is "json"
+        self.question_details = []
+        # Messages of the interview, shared with the UI; conversation_history is the LLM's view of it
+        self.transcript = Transcript()
+        
+        # The LLM backend is resolved on first use (see the backend property)
+        self._backend = None
         
-        # Initialize the model
-        self.model = genai.GenerativeModel(model_name=GEMINI_MODEL)
+        # Live backend session reused for every LLM call in this interview; its history
+        # mirrors conversation_history in Gemini format and is extended incrementally
+        # (_synced_messages counts transcript messages already looked at)
+        self._session = None
+        self._synced_messages = 0
+        
+        # (tech stack, Future) of question generation started as soon as the tech stack
+        # was collected; see _start_question_prefetch
+        self._prefetch = None
+        
+        # Estimated size of the chat history, and the state of the compacted summary
+        # that replaces older turns once PROMPT_TOKEN_BUDGET is exceeded
+        self._history_tokens = 0
+        self._summary_messages = 0
+        self._compacted_messages = 0
+        self._history_excerpts = deque(maxlen=HISTORY_SUMMARY_MAX_EXCERPTS)
+        
+        # Finished LLM calls (successful or not) made for this conversation, prefetches included;
+        # the lock is needed because prefetches count their calls from the executor thread
+        self.llm_calls = 0
+        self._llm_calls_lock = threading.Lock()
         
         # Add system message to conversation history
-        self.conversation_history.append({
-            "role": "system",
-            "content": SYSTEM_PROMPT
-        })
+        self.transcript.append("system", SYSTEM_PROMPT, FOR_LLM)
         
         # Store candidate responses to technical questions
         self.question_responses = {}
@@ -70,6 +219,29 @@ class ConversationManager:
         # Set conversation to active
         self.is_active = True
 
+    @property
+    def conversation_history(self) -> TranscriptView:
+        """Messages sent to the LLM as context, read-only (append to transcript instead)."""
+        return self.transcript.view(FOR_LLM)
+
+    @property
+    def backend(self) -> LLMBackend:
+        """The LLM backend for this conversation, the process-wide one unless replaced."""
+        if self._backend is None:
+            self._backend = get_llm_backend()
+        return self._backend
+
+    @backend.setter
+    def backend(self, value: LLMBackend) -> None:
+        # The new backend's session is rebuilt from the transcript, and compacted again if needed
+        self._backend = value
+        self._session = None
+        self._synced_messages = 0
+        self._history_tokens = 0
+        self._summary_messages = 0
+        self._compacted_messages = 0
+        self._history_excerpts.clear()
+
     def process_input(self, user_input: str) -> str:
         """
         Process user input based on current conversation state.
@@ -80,39 +252,115 @@ class ConversationManager:
         Returns:
             str: Response from the chatbot
         """
-        # Check for exit keywords
-        if check_exit_keywords(user_input, EXIT_KEYWORDS):
-            self.is_active = False
-            return "Thank you for your time. The conversation has ended."
+        with _turn_seconds.time(state=self.state, mode="sync"):
+            # Check for exit keywords
+            if check_exit_keywords(user_input, EXIT_KEYWORDS):
+                self.is_active = False
+                return "Thank you for your time. The conversation has ended."
+        
+            # Add user input to conversation history
+            self.transcript.append("user", user_input)
+        
+            # Process based on current state
+            response = self._handle_state(user_input)
+        
+            # Add response to conversation history
+            self.transcript.append("assistant", response)
+        
+            return response
+
+    async def aprocess_input(self, user_input: str) -> str:
+        """
+        Process user input without blocking the calling thread while waiting on the LLM.
+        
+        Args:
+            user_input: Text input from the user
+            
+        Returns:
+            str: Response from the chatbot
+        """
+        with _turn_seconds.time(state=self.state, mode="async"):
+            # Check for exit keywords
+            if check_exit_keywords(user_input, EXIT_KEYWORDS):
+                self.is_active = False
+                return "Thank you for your time. The conversation has ended."
+        
+            # Add user input to conversation history
+            self.transcript.append("user", user_input)
+        
+            # Only states that call the LLM need an async path
+            if self.state == "confirming_info":
+                response = await self._aconfirm_info(user_input)
+            elif self.state in self.LOCAL_STATES:
+                response = self._handle_state(user_input)
+            else:
+                response = await self._aget_llm_response(FALLBACK_PROMPT)
+        
+            # Add response to conversation history
+            self.transcript.append("assistant", response)
+        
+            return response
+
+    def process_input_stream(self, user_input: str) -> Iterator[str]:
+        """
+        Process user input, yielding the response in chunks as the LLM streams it.
         
-        # Add user input to conversation history
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_input
-        })
+        Only technical question generation is streamed; other states yield their
+        complete response as a single chunk.
         
-        # Process based on current state
+        Args:
+            user_input: Text input from the user
+            
+        Yields:
+            str: Consecutive pieces of the response from the chatbot
+        """
+        with _turn_seconds.time(state=self.state, mode="stream"):
+            # Check for exit keywords
+            if check_exit_keywords(user_input, EXIT_KEYWORDS):
+                self.is_active = False
+                yield "Thank you for your time. The conversation has ended."
+                return
+        
+            # Add user input to conversation history
+            self.transcript.append("user", user_input)
+        
+            if self.state == "confirming_info" and user_input.lower().startswith("y"):
+                self.state = "asking_tech_questions"
+                chunks = []
+                for chunk in self._stream_technical_questions():
+                    chunks.append(chunk)
+                    yield chunk
+                response = "".join(chunks)
+            else:
+                response = self._handle_state(user_input)
+                yield response
+        
+            # Add response to conversation history
+            self.transcript.append("assistant", response)
+
+    def _handle_state(self, user_input: str) -> str:
+        """
+        Dispatch user input to the handler for the current state.
+        
+        Args:
+            user_input: Text input from the user
+            
+        Returns:
+            str: Response from the state handler
+        """
         if self.state == "greeting":
-            response = self._handle_greeting()
+            return self._handle_greeting()
         elif self.state == "collecting_info":
-            response = self._collect_candidate_info(user_input)
+            return self._collect_candidate_info(user_input)
         elif self.state == "confirming_info":
-            response = self._confirm_info(user_input)
+            return self._confirm_info(user_input)
         elif self.state == "asking_tech_questions":
-            response = self._handle_tech_questions(user_input)
+            return self._handle_tech_questions(user_input)
         elif self.state == "closing":
-            response = self._handle_closing()
+            return self._handle_closing()
         else:
             # Default fallback
-            response = self._get_llm_response("Please respond to this message in the context of our conversation.")
-        
-        # Add response to conversation history
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": response
-        })
-        
-        return response
+            return self._get_llm_response(FALLBACK_PROMPT)
 
     def _handle_greeting(self) -> str:
         """
@@ -149,6 +397,7 @@ class ConversationManager:
         # Store the validated information
         if self.current_info_field == "tech_stack":
             self.candidate_info[self.current_info_field] = parse_tech_stack(user_input)
+            self._start_question_prefetch()
         else:
             self.candidate_info[self.current_info_field] = user_input
         
@@ -180,11 +429,27 @@ class ConversationManager:
             return self._generate_technical_questions()
         else:
             # Information needs correction
+            self._cancel_question_prefetch()
             self.state = "collecting_info"
             self.current_info_field = REQUIRED_INFO[0]
             self.candidate_info = {}
             return "Let's start again. " + INFO_PROMPTS[self.current_info_field]
 
+    async def _aconfirm_info(self, user_input: str) -> str:
+        """
+        Async counterpart of _confirm_info.
+        
+        Args:
+            user_input: Text input from the user
+            
+        Returns:
+            str: Response based on confirmation
+        """
+        if user_input.lower().startswith("y"):
+            self.state = "asking_tech_questions"
+            return await self._agenerate_technical_questions()
+        return self._confirm_info(user_input)
+
     def _generate_technical_questions(self) -> str:
         """Generate technical questions based on candidate's tech stack."""
         
@@ -195,25 +460,501 @@ class ConversationManager:
         print(f"DEBUG: Tech Stack Received -> {tech_stack}")
         
         if not tech_stack:
-            return "I'm unable to generate technical questions because no tech stack information was provided."
+            return NO_TECH_STACK_RESPONSE
+
+        # Generation usually started in the background while the candidate read the summary
+        questions = self._take_prefetched_questions(tech_stack)
+        if questions is None:
+            questions = self._build_technical_questions(tech_stack)
+        if not questions:
+            return QUESTION_ERROR_RESPONSE
+        return self._present_technical_questions(questions)
+
+    def _build_technical_questions(self, tech_stack: List[str]) -> Optional[Any]:
+        """
+        Assemble or generate the questions for a tech stack without presenting them.
+        
+        Questions depend only on the tech stack (which is also what they are cached
+        on), so they are requested as one-off prompts outside the chat session. This
+        lets background prefetches run safely and identical prompts from concurrent
+        candidates share one request.
+        
+        Args:
+            tech_stack: Technologies declared by the candidate
+            
+        Returns:
+            Optional[Any]: Question dicts, or LLM response text in text mode; None if
+            nothing could be generated
+        """
+        # Technologies covered by the question bank need no LLM call
+        bank_questions, tech_stack = self._assemble_from_bank(tech_stack)
+        if not tech_stack:
+            return bank_questions
+
+        # Serve previously generated questions for the same stack when possible
+        questions = self._get_cached_questions(tech_stack)
+        if not questions:
+            prompt = self._build_question_prompt(tech_stack)
+
+            # Get questions from LLM
+            start_time = time.time()
+            questions_response = self._get_llm_response(prompt, use_session=False)
+
+            # Debugging: Check response
+            print(f"DEBUG: LLM Response -> {questions_response}")
+
+            # Without generated questions the bank ones are still worth presenting
+            if not questions_response or questions_response.startswith(LLM_ERROR_RESPONSE):
+                return bank_questions or None
+
+            questions, repair_prompt = self._questions_from_response(questions_response)
+            cacheable = True
+            if repair_prompt:
+                repaired_response = self._get_llm_response(repair_prompt, use_session=False)
+                questions, cacheable = self._accept_repaired_questions(questions_response, repaired_response)
+                if not questions:
+                    return bank_questions or None
+
+            if cacheable:
+                self._cache_questions(tech_stack, questions, time.time() - start_time)
+
+        return self._merge_bank_questions(bank_questions, questions, tech_stack)
+
+    async def _agenerate_technical_questions(self) -> str:
+        """Async counterpart of _generate_technical_questions."""
+        tech_stack = self.candidate_info.get("tech_stack", [])
+        if not tech_stack:
+            return NO_TECH_STACK_RESPONSE
+
+        questions = await self._atake_prefetched_questions(tech_stack)
+        if questions is None:
+            questions = await self._abuild_technical_questions(tech_stack)
+        if not questions:
+            return QUESTION_ERROR_RESPONSE
+        return self._present_technical_questions(questions)
+
+    async def _abuild_technical_questions(self, tech_stack: List[str]) -> Optional[Any]:
+        """Async counterpart of _build_technical_questions."""
+        bank_questions, tech_stack = self._assemble_from_bank(tech_stack)
+        if not tech_stack:
+            return bank_questions
+
+        questions = self._get_cached_questions(tech_stack)
+        if not questions:
+            prompt = self._build_question_prompt(tech_stack)
+            start_time = time.time()
+            questions_response = await self._aget_llm_response(prompt, use_session=False)
+            if not questions_response or questions_response.startswith(LLM_ERROR_RESPONSE):
+                return bank_questions or None
+
+            questions, repair_prompt = self._questions_from_response(questions_response)
+            cacheable = True
+            if repair_prompt:
+                repaired_response = await self._aget_llm_response(repair_prompt, use_session=False)
+                questions, cacheable = self._accept_repaired_questions(questions_response, repaired_response)
+                if not questions:
+                    return bank_questions or None
+
+            if cacheable:
+                self._cache_questions(tech_stack, questions, time.time() - start_time)
+
+        return self._merge_bank_questions(bank_questions, questions, tech_stack)
+
+    def _start_question_prefetch(self) -> None:
+        """Start generating questions for the collected tech stack in the background."""
+        self._cancel_question_prefetch()
+        tech_stack = self.candidate_info.get("tech_stack", [])
+        if not (QUESTION_PREFETCH_ENABLED and self.prefetch_questions) or not tech_stack:
+            return
+        future = _get_prefetch_executor().submit(self._build_technical_questions, list(tech_stack))
+        self._prefetch = (tuple(tech_stack), future)
+
+    def _cancel_question_prefetch(self) -> None:
+        """Drop a pending prefetch; a generation already running finishes but its result is discarded."""
+        if self._prefetch is not None:
+            _, future = self._prefetch
+            self._prefetch = None
+            future.cancel()
+            _question_prefetches.inc(outcome="discarded")
+
+    def _claim_prefetch(self, tech_stack: List[str]) -> Optional[Any]:
+        """Detach the prefetch for this tech stack, or None (discarding a stale one)."""
+        if self._prefetch is None:
+            return None
+        prefetched_stack, future = self._prefetch
+        if prefetched_stack != tuple(tech_stack):
+            self._cancel_question_prefetch()
+            return None
+        self._prefetch = None
+        _question_prefetches.inc(outcome="ready" if future.done() else "waited")
+        return future
+
+    def _take_prefetched_questions(self, tech_stack: List[str]) -> Optional[Any]:
+        """
+        Take the result of the background prefetch, waiting for it if it is still running.
+        
+        Args:
+            tech_stack: Tech stack the questions are needed for
+            
+        Returns:
+            Optional[Any]: Prefetched questions, or None if there is no usable prefetch
+        """
+        future = self._claim_prefetch(tech_stack)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception:
+            _question_prefetches.inc(outcome="failed")
+            return None
+
+    async def _atake_prefetched_questions(self, tech_stack: List[str]) -> Optional[Any]:
+        """Async counterpart of _take_prefetched_questions that waits without blocking the event loop."""
+        import asyncio
+
+        future = self._claim_prefetch(tech_stack)
+        if future is None:
+            return None
+        try:
+            return await asyncio.wrap_future(future)
+        except Exception:
+            _question_prefetches.inc(outcome="failed")
+            return None
+
+    def _stream_technical_questions(self) -> Iterator[str]:
+        """
+        Streaming counterpart of _generate_technical_questions.
+        
+        Yields:
+            str: Consecutive pieces of the message presenting the questions
+        """
+        tech_stack = self.candidate_info.get("tech_stack", [])
+        if not tech_stack:
+            yield NO_TECH_STACK_RESPONSE
+            return
+
+        # A prefetched result is presented at once instead of being streamed
+        questions = self._take_prefetched_questions(tech_stack)
+        if questions:
+            yield self._present_technical_questions(questions)
+            return
+
+        bank_questions, tech_stack = self._assemble_from_bank(tech_stack)
+        if not tech_stack:
+            yield self._present_technical_questions(bank_questions)
+            return
+
+        questions_response = self._get_cached_questions(tech_stack)
+        if questions_response:
+            yield self._present_technical_questions(self._merge_bank_questions(bank_questions, questions_response, tech_stack))
+            return
+
+        if QUESTION_OUTPUT_FORMAT == "json":
+            yield from self._stream_structured_questions(tech_stack, bank_questions)
+            return
+
+        if bank_questions:
+            # Free-form text can't be renumbered as it streams, so present the merged list at once
+            questions = self._build_technical_questions(self.candidate_info["tech_stack"])
+            yield self._present_technical_questions(questions) if questions else QUESTION_ERROR_RESPONSE
+            return
+
+        prompt = self._build_question_prompt(tech_stack)
+        start_time = time.time()
+        parts = []
+        completed = True
+        try:
+            for chunk in self._stream_llm_response(prompt, use_session=False):
+                if not parts:
+                    yield "Here are your technical questions:\n\n"
+                parts.append(chunk)
+                yield chunk
+        except Exception:
+            # Counted as an interrupted call by _stream_llm_response
+            completed = False
+
+        questions_response = "".join(parts).strip()
+        if not questions_response:
+            yield QUESTION_ERROR_RESPONSE
+            return
+
+        # Only complete generations are worth reusing
+        if completed:
+            self._cache_questions(tech_stack, questions_response, time.time() - start_time)
+        self.question_details = []
+        self.technical_questions = questions_response.split("\n")
+        yield "\n\nPlease provide your answers."
+
+    def _stream_structured_questions(self, tech_stack: List[str],
+                                     bank_questions: Optional[List[Dict[str, str]]] = None) -> Iterator[str]:
+        """
+        Stream structured questions, presenting each one as soon as its JSON object is complete.
+        
+        Args:
+            tech_stack: Technologies to generate questions for
+            bank_questions: Questions assembled from the question bank, shown first
+            
+        Yields:
+            str: Consecutive pieces of the message presenting the questions
+        """
+        prompt = self._build_question_prompt(tech_stack)
+        start_time = time.time()
+        parser = QuestionJSONStreamParser(QUESTION_DIFFICULTIES)
+        limit = self._generated_question_limit(bank_questions, tech_stack)
+        parts = []
+        generated = []
+        questions = list(bank_questions or [])
+        if questions:
+            yield "Here are your technical questions:\n\n"
+            for number, question in enumerate(questions, 1):
+                yield f"{number}. {question['question']}\n"
+        error = None
+        try:
+            for chunk in self._stream_llm_response(prompt, use_session=False):
+                parts.append(chunk)
+                for question in parser.feed(chunk):
+                    generated.append(question)
+                    if len(generated) > limit:
+                        continue
+                    if not questions:
+                        yield "Here are your technical questions:\n\n"
+                    questions.append(question)
+                    yield f"{len(questions)}. {question['question']}\n"
+            if parts:
+                parser.finish()
+        except ValueError as e:
+            error = str(e)
+        except Exception:
+            error = "the response was cut off"
+
+        if not parts:
+            if not questions:
+                yield QUESTION_ERROR_RESPONSE
+                return
+            # The bank questions already shown are all the candidate gets
+            self.question_details = questions
+            self.technical_questions = [question["question"] for question in questions]
+            yield "\nPlease provide your answers."
+            return
+
+        questions_response = "".join(parts)
+        cacheable = error is None
+        if error:
+            repaired_response = self._get_llm_response(self._build_repair_prompt(questions_response, error), use_session=False)
+            repaired, cacheable = self._accept_repaired_questions(questions_response, repaired_response)
+            # Questions already shown stay; the repaired list only adds the ones that are missing
+            for question in (repaired or [])[len(generated):limit]:
+                if not questions:
+                    yield "Here are your technical questions:\n\n"
+                questions.append(question)
+                yield f"{len(questions)}. {question['question']}\n"
+            generated = generated + (repaired or [])[len(generated):]
+        else:
+            _question_json_outcomes.inc(outcome="valid")
+
+        if not questions:
+            yield QUESTION_ERROR_RESPONSE
+            return
+
+        if cacheable:
+            self._cache_questions(tech_stack, generated, time.time() - start_time)
+        self.question_details = questions
+        self.technical_questions = [question["question"] for question in questions]
+        yield "\nPlease provide your answers."
 
+    def _build_question_prompt(self, tech_stack: List[str]) -> str:
+        """
+        Build the question generation prompt for a tech stack.
+        
+        Args:
+            tech_stack: Technologies declared by the candidate
+            
+        Returns:
+            str: Prompt text for the LLM
+        """
         # Convert to a comma-separated string
         tech_stack_str = ", ".join(tech_stack)
         
         # Debugging: Print the formatted prompt
-        prompt = TECH_QUESTION_PROMPT.format(tech_stack=tech_stack_str)
+        if QUESTION_OUTPUT_FORMAT == "json":
+            prompt = TECH_QUESTION_JSON_PROMPT.format(tech_stack=tech_stack_str)
+        else:
+            prompt = TECH_QUESTION_PROMPT.format(tech_stack=tech_stack_str)
         print(f"DEBUG: Prompt Sent to LLM -> {prompt}")
+        return prompt
+
+    def _build_repair_prompt(self, questions_response: str, error: str) -> str:
+        """
+        Build the prompt asking the LLM to fix a structured question response.
+        
+        Args:
+            questions_response: The rejected response
+            error: Why it was rejected
+            
+        Returns:
+            str: Prompt text for the LLM
+        """
+        return QUESTION_REPAIR_PROMPT.format(error=error, response=questions_response[:QUESTION_REPAIR_MAX_CHARS])
+
+    def _questions_from_response(self, questions_response: str) -> Tuple[Any, Optional[str]]:
+        """
+        Turn an LLM response into questions in the configured output format.
+        
+        Args:
+            questions_response: LLM response to the question prompt
+            
+        Returns:
+            Tuple: (questions, None) if the response is usable, or (None, repair prompt)
+            if it is a structured response that failed validation. Text responses
+            are returned as-is.
+        """
+        if QUESTION_OUTPUT_FORMAT != "json":
+            return questions_response, None
+        try:
+            questions = parse_question_json(questions_response, QUESTION_DIFFICULTIES)
+        except ValueError as e:
+            return None, self._build_repair_prompt(questions_response, str(e))
+        _question_json_outcomes.inc(outcome="valid")
+        return questions, None
+
+    def _accept_repaired_questions(self, questions_response: str,
+                                   repaired_response: str) -> Tuple[Optional[List[Dict[str, str]]], bool]:
+        """
+        Validate the response to a repair prompt, salvaging the original response if it is still unusable.
+        
+        Args:
+            questions_response: The originally rejected response
+            repaired_response: Response to the repair prompt
+            
+        Returns:
+            Tuple: Questions (None if nothing could be recovered) and whether they may be cached
+        """
+        if repaired_response and not repaired_response.startswith(LLM_ERROR_RESPONSE):
+            try:
+                questions = parse_question_json(repaired_response, QUESTION_DIFFICULTIES)
+                _question_json_outcomes.inc(outcome="repaired")
+                return questions, True
+            except ValueError:
+                # Still unusable; counted as failed below
+                pass
 
-        # Get questions from LLM
-        questions_response = self._get_llm_response(prompt)
+        # Last resort: read whatever numbered questions the original text contains
+        _question_json_outcomes.inc(outcome="failed")
+        salvaged = [
+            {"question": question, "technology": "", "difficulty": ""}
+            for question in parse_technical_questions(questions_response)
+        ]
+        return salvaged or None, False
 
-        # Debugging: Check response
-        print(f"DEBUG: LLM Response -> {questions_response}")
+    def _question_cache_key(self, tech_stack: List[str]) -> str:
+        """
+        Cache key for a tech stack; structured and text questions are cached separately,
+        and so are questions from non-Gemini backends (see LLMBackend.cache_scope).
+        """
+        namespace = "questions_json" if QUESTION_OUTPUT_FORMAT == "json" else "questions"
+        scope = self.backend.cache_scope
+        if scope:
+            namespace = f"{namespace}@{scope}"
+        return make_cache_key(tech_stack, namespace=namespace)
 
-        if not questions_response or "I'm having trouble processing" in questions_response:
-            return "I'm currently experiencing difficulties in generating technical questions. Please try again later."
+    def _get_cached_questions(self, tech_stack: List[str]) -> Optional[Any]:
+        """
+        Look up previously generated questions for a tech stack.
+        
+        Args:
+            tech_stack: Technologies declared by the candidate
+            
+        Returns:
+            Optional[Any]: Cached questions (a list of question dicts in JSON mode,
+            the LLM response text otherwise), or None on a miss
+        """
+        if not (QUESTION_CACHE_ENABLED and self.use_question_cache):
+            return None
+        # Hits and misses are exported through the talentscout_question_cache gauges
+        return get_question_cache().get(self._question_cache_key(tech_stack))
 
-        self.technical_questions = questions_response.split("\n")
+    def _cache_questions(self, tech_stack: List[str], questions: Any, latency: float) -> None:
+        """
+        Store generated questions for reuse by later candidates with the same stack.
+        
+        Args:
+            tech_stack: Technologies declared by the candidate
+            questions: Question dicts in JSON mode, the LLM response text otherwise
+            latency: Seconds the LLM took to generate the questions
+        """
+        if QUESTION_CACHE_ENABLED and self.use_question_cache:
+            get_question_cache().put(self._question_cache_key(tech_stack), questions, latency=latency)
+
+    def _assemble_from_bank(self, tech_stack: List[str]) -> Tuple[List[Dict[str, str]], List[str]]:
+        """
+        Assemble questions for a tech stack from the pre-generated question bank.
+
+        Args:
+            tech_stack: Technologies declared by the candidate
+
+        Returns:
+            Tuple: (bank questions, technologies the bank doesn't cover); the whole
+            stack is left to the LLM when the bank is disabled or empty
+        """
+        if not (QUESTION_BANK_ENABLED and self.use_question_bank):
+            return [], tech_stack
+        bank = get_question_bank()
+        if not len(bank):
+            return [], tech_stack
+
+        questions, uncovered = bank.assemble(tech_stack)
+        coverage = "full" if not uncovered else "partial" if questions else "none"
+        _question_bank_assemblies.inc(coverage=coverage)
+        return questions, uncovered
+
+    def _generated_question_limit(self, bank_questions: Optional[List[Dict[str, str]]], tech_stack: List[str]) -> int:
+        """Number of LLM questions to keep next to the bank ones: fill up to QUESTION_COUNT_MAX, one per technology at least."""
+        if not bank_questions:
+            return QUESTION_COUNT_MAX
+        return max(QUESTION_COUNT_MAX - len(bank_questions), len(tech_stack))
+
+    def _merge_bank_questions(self, bank_questions: List[Dict[str, str]], questions: Any,
+                              tech_stack: List[str]) -> Any:
+        """
+        Append LLM questions for uncovered technologies to the bank questions.
+
+        Args:
+            bank_questions: Questions assembled from the bank
+            questions: Generated questions (dicts, or response text in text mode)
+            tech_stack: Technologies the LLM generated questions for
+
+        Returns:
+            Any: `questions` unchanged without bank questions, otherwise the merged list of dicts
+        """
+        if not bank_questions:
+            return questions
+        if not isinstance(questions, list):
+            questions = [
+                {"question": question, "technology": "", "difficulty": ""}
+                for question in parse_technical_questions(questions)
+            ]
+        return bank_questions + questions[:self._generated_question_limit(bank_questions, tech_stack)]
+
+    def _present_technical_questions(self, questions: Any) -> str:
+        """
+        Store the generated questions and format them for the candidate.
+        
+        Args:
+            questions: Question dicts, or LLM response text containing the questions
+            
+        Returns:
+            str: Message presenting the questions
+        """
+        if isinstance(questions, list):
+            self.question_details = questions
+            self.technical_questions = [question["question"] for question in questions]
+            questions_response = "\n".join(
+                f"{number}. {question}" for number, question in enumerate(self.technical_questions, 1)
+            )
+        else:
+            questions_response = questions
+            self.question_details = []
+            self.technical_questions = questions_response.split("\n")
         return f"Here are your technical questions:\n\n{questions_response}\n\nPlease provide your answers."
 
     def _handle_tech_questions(self, user_input: str) -> str:
@@ -243,74 +984,354 @@ class ConversationManager:
         self.is_active = False
         return CLOSING_MESSAGE
 
-    def _get_llm_response(self, prompt: str) -> str:
+    def _build_llm_request(self, prompt: str) -> Tuple[List[Dict[str, Any]], str]:
         """
-        Get response from the Gemini language model.
+        Bring the live backend session up to date for an LLM call.
+        
+        Only messages added to the transcript since the previous call are
+        converted to Gemini format and appended to the session's history.
         
         Args:
             prompt: Prompt text for the LLM
             
         Returns:
-            str: Response from the LLM or error message
+            Tuple: The session's Gemini-format history and the prompt to send
         """
-        # Create messages for the API call in Gemini format
-        history = []
+        if self._session is None:
+            self._session = self.backend.start_session()
+        history = self._session.history
         
         # Convert history format from OpenAI to Gemini
-        for msg in self.conversation_history:
-            if msg["role"] == "system":
+        transcript = self.transcript
+        for index in range(self._synced_messages, len(transcript)):
+            if not transcript.visible(index, FOR_LLM):
+                continue
+            role = transcript.role(index)
+            content = transcript.content(index)
+            if role == "system":
                 # For system prompts, we'll add them to the first user message
                 continue
-            elif msg["role"] == "user":
-                history.append({"role": "user", "parts": [{"text": msg["content"]}]})
-            elif msg["role"] == "assistant":
-                history.append({"role": "model", "parts": [{"text": msg["content"]}]})
+            elif role == "user":
+                history.append({"role": "user", "parts": [{"text": content}]})
+            elif role == "assistant":
+                history.append({"role": "model", "parts": [{"text": content}]})
+            else:
+                continue
+            self._history_tokens += estimate_tokens(content)
+        self._synced_messages = len(transcript)
+        
+        # Keep the request within the token budget. The system prompt is only sent inside
+        # the compacted summary, or prepended to the very first prompt, so it is counted there
+        if PROMPT_TOKEN_BUDGET and history:
+            if self._history_tokens + estimate_tokens(prompt) > PROMPT_TOKEN_BUDGET:
+                self._compact_history(history)
         
         # Add current prompt
         current_prompt = prompt
         if len(history) == 0:
             # If this is the first message, prepend the system prompt
-            system_content = next((msg["content"] for msg in self.conversation_history if msg["role"] == "system"), "")
+            system_content = next((msg.content for msg in self.conversation_history if msg.role == "system"), "")
             if system_content:
                 current_prompt = f"{system_content}\n\n{prompt}"
+
+        return history, current_prompt
+
+    def _prepare_llm_request(self, prompt: str, use_session: bool) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Prepare an LLM call in the session's context, or as a one-off that leaves the session untouched.
+        
+        Args:
+            prompt: Prompt text for the LLM
+            use_session: Whether the call should see the conversation history
+            
+        Returns:
+            Tuple: The history the call is made on top of (empty for one-offs) and the prompt to send
+        """
+        if use_session:
+            return self._build_llm_request(prompt)
+        return [], f"{SYSTEM_PROMPT}\n\n{prompt}"
+
+    def _compact_history(self, history: List[Dict[str, Any]]) -> None:
+        """
+        Replace older turns in the chat history with a compact summary, in place.
+        
+        The summary carries the system prompt, the collected candidate_info and
+        short excerpts of the most recent older messages. The last
+        HISTORY_RECENT_MESSAGES messages are kept verbatim.
+        
+        Args:
+            history: The live session's Gemini-format history
+        """
+        turns = history[self._summary_messages:]
+        recent = turns[-HISTORY_RECENT_MESSAGES:] if HISTORY_RECENT_MESSAGES else []
+        # The verbatim part must open with a candidate message to keep roles alternating
+        while recent and recent[0]["role"] != "user":
+            recent = recent[1:]
+        older = turns[:len(turns) - len(recent)]
+        if not older:
+            return
+
+        for entry in older:
+            speaker = "Candidate" if entry["role"] == "user" else "Assistant"
+            text = " ".join(entry["parts"][0]["text"].split())
+            if len(text) > HISTORY_SUMMARY_EXCERPT_CHARS:
+                text = text[:HISTORY_SUMMARY_EXCERPT_CHARS].rstrip() + "..."
+            self._history_excerpts.append(f"- {speaker}: {text}")
+        self._compacted_messages += len(older)
+
+        summary_parts = [SYSTEM_PROMPT.strip()]
+        if self.candidate_info:
+            summary_parts.append("Candidate information collected so far:\n" + format_candidate_summary(self.candidate_info))
+        summary_parts.append(
+            f"Summary of the {self._compacted_messages} earlier messages of this conversation "
+            f"(most recent {len(self._history_excerpts)} shown):\n" + "\n".join(self._history_excerpts)
+        )
+        summary = [
+            {"role": "user", "parts": [{"text": "\n\n".join(summary_parts)}]},
+            {"role": "model", "parts": [{"text": "Understood. I'll continue the screening from here."}]}
+        ]
+
+        history[:] = summary + recent
+        self._summary_messages = len(summary)
+        self._history_tokens = sum(estimate_tokens(entry["parts"][0]["text"]) for entry in history)
+        _history_compactions.inc()
+        _history_compacted_messages.inc(len(older))
+
+    def _get_llm_response(self, prompt: str, use_session: bool = True) -> str:
+        """
+        Get response from the LLM backend.
+        
+        Args:
+            prompt: Prompt text for the LLM
+            use_session: Answer in the context of the conversation's session; False sends a
+                one-off request that leaves the session untouched, safe from another thread
+            
+        Returns:
+            str: Response from the LLM or error message
+        """
+        history, current_prompt = self._prepare_llm_request(prompt, use_session)
+        started = time.perf_counter()
             
         try:
             # Make API call with retry logic
-            max_retries = 5
+            max_retries = LLM_MAX_RETRIES
             for attempt in range(max_retries):
                 try:
-                    # Start a chat session if we have history, or generate content for a one-off
+                    # Answer in the context of the session if we have history, or as a one-off
                     if history:
-                        chat = self.model.start_chat(history=history)
-                        response = chat.send_message(current_prompt)
+                        self._wait_for_quota(history, current_prompt)
+                        llm_response = self._session.send(current_prompt)
+                    elif LLM_COALESCE_REQUESTS:
+                        llm_response, shared = _llm_flight.do(
+                            (id(self.backend), current_prompt), self._generate_one_off, current_prompt
+                        )
+                        if shared:
+                            _llm_coalesced.inc(mode="sync")
                     else:
-                        response = self.model.generate_content(current_prompt)
-                    
-                    # Extract response content
-                    llm_response = response.text.strip()
-                    
-                    # Debugging log
-                    print(f"Gemini Response: {llm_response[:100]}...")  # Log first 100 chars
+                        llm_response = self._generate_one_off(current_prompt)
+                    llm_response = llm_response.strip()
 
                     if not llm_response:
                         raise ValueError("Received an empty response from Gemini.")
                     
+                    self._observe_llm_call("sync", "success", started, history, current_prompt, llm_response)
                     return llm_response
 
 
                 except Exception as e:
-                    if attempt < max_retries - 1:
-                        # Exponential backoff
-                        wait_time = 2 ** attempt
-                        print(f"API Error: {e}. Retrying in {wait_time} seconds...")
+                    _llm_errors.inc(mode="sync", error=type(e).__name__)
+                    # Waiting out the quota already was the backoff; retrying would only queue again
+                    if attempt < max_retries - 1 and not isinstance(e, RateLimitTimeout):
+                        _llm_retries.inc(mode="sync")
+                        # Jittered exponential backoff, so sessions that failed together don't retry in lockstep
+                        wait_time = backoff_delay(attempt, LLM_BACKOFF_BASE_SECONDS, LLM_BACKOFF_MAX_SECONDS)
                         time.sleep(wait_time)
                         continue
                     else:
                         raise e
 
-        except Exception as e:
-            print(f"Gemini API call failed: {e}")
-            return "I'm currently experiencing difficulties in generating a response. Please try again later."
+        except Exception:
+            self._observe_llm_call("sync", "error", started, history, current_prompt)
+            return LLM_ERROR_RESPONSE
+
+    def _stream_llm_response(self, prompt: str, use_session: bool = True) -> Iterator[str]:
+        """
+        Stream a response from the LLM backend.
+        
+        Failed attempts are retried until the first chunk arrives; once text has
+        been yielded, errors propagate to the caller because the partial output
+        can't be taken back.
+        
+        Args:
+            prompt: Prompt text for the LLM
+            use_session: Answer in the context of the conversation's session, or as a one-off
+            
+        Yields:
+            str: Text chunks as the backend generates them (nothing if every attempt failed)
+        """
+        history, current_prompt = self._prepare_llm_request(prompt, use_session)
+        call_started = time.perf_counter()
+
+        for attempt in range(LLM_MAX_RETRIES):
+            started = False
+            parts = []
+            try:
+                self._wait_for_quota(history, current_prompt)
+                if history:
+                    chunks = self._session.stream(current_prompt)
+                else:
+                    chunks = self.backend.stream(current_prompt)
+
+                for text in chunks:
+                    if text:
+                        started = True
+                        parts.append(text)
+                        yield text
+
+                if not started:
+                    raise ValueError("Received an empty response from Gemini.")
+                self._observe_llm_call("stream", "success", call_started, history, current_prompt, "".join(parts))
+                return
+
+            except Exception as e:
+                _llm_errors.inc(mode="stream", error=type(e).__name__)
+                if started:
+                    self._observe_llm_call("stream", "interrupted", call_started, history, current_prompt, "".join(parts))
+                    raise
+                if attempt < LLM_MAX_RETRIES - 1 and not isinstance(e, RateLimitTimeout):
+                    _llm_retries.inc(mode="stream")
+                    wait_time = backoff_delay(attempt, LLM_BACKOFF_BASE_SECONDS, LLM_BACKOFF_MAX_SECONDS)
+                    time.sleep(wait_time)
+                else:
+                    self._observe_llm_call("stream", "error", call_started, history, current_prompt)
+                    return
+
+    async def _aget_llm_response(self, prompt: str, use_session: bool = True) -> str:
+        """
+        Get response from the LLM backend without blocking the event loop.
+        
+        Each attempt holds a slot of the process-wide limiter and is bounded by
+        LLM_REQUEST_TIMEOUT_SECONDS. Failed attempts are retried with jittered
+        exponential backoff; the slot is released while waiting.
+        
+        Args:
+            prompt: Prompt text for the LLM
+            use_session: Answer in the context of the conversation's session, or as a one-off
+            
+        Returns:
+            str: Response from the LLM or error message
+        """
+        # Imported here to keep module import fast; the running event loop has already loaded it
+        import asyncio
+
+        history, current_prompt = self._prepare_llm_request(prompt, use_session)
+        started = time.perf_counter()
+
+        async def request() -> str:
+            # Queue for quota before taking a concurrency slot so queued requests don't hold one
+            await self._await_quota(history, current_prompt)
+            async with _llm_limiter:
+                if history:
+                    pending = self._session.asend(current_prompt)
+                else:
+                    pending = self.backend.agenerate(current_prompt)
+                return await asyncio.wait_for(pending, timeout=LLM_REQUEST_TIMEOUT_SECONDS)
+
+        for attempt in range(LLM_MAX_RETRIES):
+            try:
+                # Waiters on an identical in-flight prompt don't take a limiter slot
+                if not history and LLM_COALESCE_REQUESTS:
+                    llm_response, shared = await _llm_flight.ado((id(self.backend), current_prompt), request)
+                    if shared:
+                        _llm_coalesced.inc(mode="async")
+                else:
+                    llm_response = await request()
+
+                llm_response = llm_response.strip()
+
+                if not llm_response:
+                    raise ValueError("Received an empty response from Gemini.")
+
+                self._observe_llm_call("async", "success", started, history, current_prompt, llm_response)
+                return llm_response
+
+            except Exception as e:
+                _llm_errors.inc(mode="async", error=type(e).__name__)
+                if attempt < LLM_MAX_RETRIES - 1 and not isinstance(e, RateLimitTimeout):
+                    _llm_retries.inc(mode="async")
+                    wait_time = backoff_delay(attempt, LLM_BACKOFF_BASE_SECONDS, LLM_BACKOFF_MAX_SECONDS)
+                    await asyncio.sleep(wait_time)
+                else:
+                    break
+
+        self._observe_llm_call("async", "error", started, history, current_prompt)
+        return LLM_ERROR_RESPONSE
+
+    def _generate_one_off(self, current_prompt: str) -> str:
+        """Send a one-off prompt to the backend once quota allows."""
+        self._wait_for_quota([], current_prompt)
+        return self.backend.generate(current_prompt)
+
+    def _request_tokens(self, history: List[Dict[str, Any]], current_prompt: str) -> int:
+        """Estimated tokens a request sends, counted against LLM_TOKENS_PER_MINUTE."""
+        return estimate_tokens(current_prompt) + (self._history_tokens if history else 0)
+
+    def _wait_for_quota(self, history: List[Dict[str, Any]], current_prompt: str) -> None:
+        """
+        Wait for the shared rate scheduler to admit a request to a rate-limited backend.
+        
+        Args:
+            history: History the request is made on top of
+            current_prompt: Prompt being sent
+            
+        Raises:
+            RateLimitTimeout: If no capacity freed up within LLM_QUEUE_TIMEOUT_SECONDS
+        """
+        if not self.backend.rate_limited:
+            return
+        priority = PRIORITY_NAMES.get(self.llm_priority, str(self.llm_priority))
+        try:
+            waited = get_rate_scheduler().acquire(
+                self._request_tokens(history, current_prompt), self.llm_priority, LLM_QUEUE_TIMEOUT_SECONDS
+            )
+        except RateLimitTimeout:
+            _llm_queue_timeouts.inc(priority=priority)
+            raise
+        _llm_queue_seconds.observe(waited, priority=priority)
+
+    async def _await_quota(self, history: List[Dict[str, Any]], current_prompt: str) -> None:
+        """Async counterpart of _wait_for_quota."""
+        if not self.backend.rate_limited:
+            return
+        priority = PRIORITY_NAMES.get(self.llm_priority, str(self.llm_priority))
+        try:
+            waited = await get_rate_scheduler().aacquire(
+                self._request_tokens(history, current_prompt), self.llm_priority, LLM_QUEUE_TIMEOUT_SECONDS
+            )
+        except RateLimitTimeout:
+            _llm_queue_timeouts.inc(priority=priority)
+            raise
+        _llm_queue_seconds.observe(waited, priority=priority)
+
+    def _observe_llm_call(self, mode: str, outcome: str, started: float, history: List[Dict[str, Any]],
+                          current_prompt: str, response: str = "") -> None:
+        """
+        Record the metrics of a finished LLM call.
+        
+        Args:
+            mode: "sync", "stream" or "async"
+            outcome: "success", "error" or "interrupted"
+            started: perf_counter() value taken before the first attempt
+            history: History the request was sent on top of (empty for one-off prompts)
+            current_prompt: Prompt sent on top of the history
+            response: Text received, if any
+        """
+        with self._llm_calls_lock:
+            self.llm_calls += 1
+        _llm_call_seconds.observe(time.perf_counter() - started, mode=mode, outcome=outcome)
+        _llm_prompt_tokens.observe(self._request_tokens(history, current_prompt), mode=mode)
+        if response:
+            _llm_response_tokens.observe(estimate_tokens(response), mode=mode)
 
     def get_conversation_summary(self) -> Dict[str, Any]:
         """
@@ -322,6 +1343,58 @@ class ConversationManager:
         summary = {
             "candidate_info": self.candidate_info,
             "technical_questions": self.technical_questions,
+            "question_details": self.question_details,
             "technical_responses": self.question_responses.get("technical_answers", "")
         }
-        return summary
\ No newline at end of file
+        return summary
+
+    def to_snapshot(self) -> Dict[str, Any]:
+        """
+        Capture the conversation as compact JSON-serializable data.
+        
+        The live backend session, the history compaction state and any pending
+        prefetch are left out; they are rebuilt from the conversation history
+        after from_snapshot.
+        
+        Returns:
+            Dict: Snapshot for from_snapshot (see session_store.py for persistence)
+        """
+        return {
+            "state": self.state,
+            "field": self.current_info_field,
+            "info": self.candidate_info,
+            "questions": self.technical_questions,
+            "details": self.question_details,
+            # The system prompt always opens the transcript and is restored from config
+            "transcript": self.transcript.to_rows(start=1),
+            "responses": self.question_responses,
+            "active": self.is_active
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, Any], backend: Optional[LLMBackend] = None) -> "ConversationManager":
+        """
+        Recreate a conversation captured by to_snapshot.
+        
+        Args:
+            snapshot: Data returned by to_snapshot
+            backend: LLM backend to use (defaults to the process-wide one)
+            
+        Returns:
+            ConversationManager: Manager ready to continue the interview
+        """
+        manager = cls()
+        if backend is not None:
+            manager.backend = backend
+        manager.state = snapshot["state"]
+        manager.current_info_field = snapshot["field"]
+        manager.candidate_info = snapshot["info"]
+        manager.technical_questions = snapshot["questions"]
+        manager.question_details = snapshot["details"]
+        manager.transcript.extend_rows(snapshot["transcript"])
+        manager.question_responses = snapshot["responses"]
+        manager.is_active = snapshot["active"]
+        # A prefetch interrupted by the restart is started again on this node
+        if manager.state == "confirming_info":
+            manager._start_question_prefetch()
+        return manager
@@ -0,0 +1,433 @@
+"""
+Process-wide concurrency helpers for the TalentScout Hiring Assistant.
+"""
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    # asyncio is expensive to import; at runtime it is only needed inside coroutines,
+    # where the running event loop has already loaded it
+    import asyncio
+    # concurrent.futures pulls in logging; it is imported when the first call is coalesced
+    from concurrent.futures import Future
+
+# Request priorities for RateScheduler; lower values are served first
+PRIORITY_LIVE = 0
+PRIORITY_BATCH = 10
+PRIORITY_NAMES = {PRIORITY_LIVE: "live", PRIORITY_BATCH: "batch"}
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 16.0) -> float:
+    """
+    Compute a jittered exponential backoff delay ("full jitter").
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Delay ceiling for the first retry, in seconds
+        cap: Maximum delay ceiling, in seconds
+
+    Returns:
+        float: Seconds to wait, uniformly drawn from [0, min(cap, base * 2**attempt)]
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class AsyncConcurrencyLimiter:
+    """
+    Limits how many coroutines may hold a slot at once across the whole process.
+
+    Unlike asyncio.Semaphore, which is bound to a single event loop, this limiter
+    can be shared by coroutines running on different loops (for example one
+    asyncio.run() per Streamlit script thread). Waiting never blocks a thread.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit: Maximum number of concurrent slot holders
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.limit = limit
+        self._active = 0
+        self._waiters: Deque[Tuple["asyncio.AbstractEventLoop", "asyncio.Future"]] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> int:
+        """Number of slots currently held."""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """Number of coroutines waiting for a slot."""
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        """Wait until a slot is available and take it."""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._active < self.limit and not self._waiters:
+                self._active += 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                handed_over = waiter not in self._waiters
+                if not handed_over:
+                    self._waiters.remove(waiter)
+            # A slot handed to us before the cancellation landed must be passed on
+            if handed_over and waiter[1].done() and not waiter[1].cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Release a slot, handing it directly to the next waiter if there is one."""
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                if loop.is_closed():
+                    continue
+                loop.call_soon_threadsafe(self._wake, future)
+                return
+            self._active -= 1
+
+    def _wake(self, future: "asyncio.Future") -> None:
+        """Resolve a waiter's future on its own loop, or pass the slot on if it was cancelled."""
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+    async def __aenter__(self) -> "AsyncConcurrencyLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single execution.
+
+    The first caller for a key (the leader) runs the call; callers arriving while
+    it is in flight wait for and receive the same result or exception. Nothing is
+    cached: once the call finishes, the next caller starts a new one. Threads and
+    coroutines on any event loop can share a key.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "Future"] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of keys with a call in progress."""
+        return len(self._calls)
+
+    def _join(self, key: Hashable) -> Tuple["Future", bool]:
+        """Get the in-flight future for a key, registering a new one if there is none."""
+        from concurrent.futures import Future
+
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = self._calls[key] = Future()
+            return future, True
+
+    def _finish(self, key: Hashable, future: "Future", result: Any = None, error: BaseException = None) -> None:
+        """Publish the leader's outcome to the waiters and retire the key."""
+        with self._lock:
+            self._calls.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Tuple[Any, bool]:
+        """
+        Run fn(*args), or wait for the identical call already in flight.
+
+        Args:
+            key: Identifies calls that are interchangeable
+            fn: Function to call
+            *args: Arguments for fn
+
+        Returns:
+            Tuple: The result and whether it was shared from another caller's call
+
+        Raises:
+            Exception: Whatever the call raised, in the leader and every waiter
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result(), True
+        try:
+            result = fn(*args)
+        except Exception as e:
+            self._finish(key, future, error=e)
+            raise
+        except BaseException:
+            self._finish(key, future, error=RuntimeError("The shared call was interrupted"))
+            raise
+        self._finish(key, future, result)
+        return result, False
+
+    async def ado(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any) -> Tuple[Any, bool]:
+        """
+        Async counterpart of do(); fn is a coroutine function.
+
+        A waiter that is cancelled stops waiting without affecting the shared call.
+        If the leader is cancelled, its waiters receive a RuntimeError.
+        """
+        import asyncio
+
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.shield(asyncio.wrap_future(future)), True
+        try:
+            result = await fn(*args)
+        except Exception as e:
+            self._finish(key, future, error=e)
+            raise
+        except BaseException:
+            self._finish(key, future, error=RuntimeError("The shared call was cancelled"))
+            raise
+        self._finish(key, future, result)
+        return result, False
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a request would have to wait longer than allowed for rate-limit capacity."""
+
+
+class _TokenBucket:
+    """Capacity that refills continuously at a per-minute rate, holding at most `burst_seconds` of it."""
+
+    def __init__(self, per_minute: float, burst_seconds: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if it is now)."""
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+
+class _RateWaiter:
+    """A queued request: its cost and how to wake it once granted."""
+
+    __slots__ = ("tokens", "wake", "loop", "granted", "abandoned")
+
+    def __init__(self, tokens: float, wake: Callable[[], None], loop: Optional["asyncio.AbstractEventLoop"] = None):
+        self.tokens = tokens
+        self.wake = wake
+        self.loop = loop
+        self.granted = False
+        self.abandoned = False
+
+
+class RateScheduler:
+    """
+    Requests-per-minute and tokens-per-minute budgets shared across the whole process.
+
+    Requests queue in priority order (FIFO within a priority) and are granted once
+    both token buckets can cover them, so a batch request never overtakes a waiting
+    live one. Like AsyncConcurrencyLimiter, threads and coroutines on any event
+    loop can share one scheduler; a timer thread re-checks the head of the queue
+    when capacity is expected to free up.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 burst_seconds: float = 10.0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            requests_per_minute: Request budget (None or 0 for no limit)
+            tokens_per_minute: Token budget (None or 0 for no limit)
+            burst_seconds: Unused budget is banked for at most this long, which bounds
+                bursts; any 60-second window sees at most (60 + burst_seconds) / 60 of a budget
+        """
+        self._requests = _TokenBucket(requests_per_minute, burst_seconds) if requests_per_minute else None
+        self._tokens = _TokenBucket(tokens_per_minute, burst_seconds) if tokens_per_minute else None
+        self._queue: List[Tuple[int, int, _RateWaiter]] = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._timer_due = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any budget is enforced."""
+        return self._requests is not None or self._tokens is not None
+
+    @property
+    def waiting(self) -> int:
+        """Number of requests queued for capacity."""
+        return len(self._queue)
+
+    def _delay(self, tokens: float) -> float:
+        """Seconds until both buckets can cover a request. Must be called with the lock held."""
+        delay = 0.0
+        if self._requests is not None:
+            delay = max(delay, self._requests.delay(1))
+        if self._tokens is not None:
+            delay = max(delay, self._tokens.delay(tokens))
+        return delay
+
+    def _dispatch(self) -> None:
+        """Grant queued requests in priority order while capacity lasts."""
+        with self._lock:
+            now = time.monotonic()
+            for bucket in (self._requests, self._tokens):
+                if bucket is not None:
+                    bucket.refill(now)
+            while self._queue:
+                waiter = self._queue[0][2]
+                if waiter.abandoned or (waiter.loop is not None and waiter.loop.is_closed()):
+                    heapq.heappop(self._queue)
+                    continue
+                delay = self._delay(waiter.tokens)
+                if delay > 0:
+                    self._schedule(now + delay)
+                    return
+                heapq.heappop(self._queue)
+                if self._requests is not None:
+                    self._requests.take(1)
+                if self._tokens is not None:
+                    self._tokens.take(waiter.tokens)
+                waiter.granted = True
+                waiter.wake()
+
+    def _schedule(self, due: float) -> None:
+        """Make sure _dispatch runs again by `due`. Must be called with the lock held."""
+        if self._timer is not None and self._timer_due <= due:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_due = due
+        self._timer = threading.Timer(max(0.0, due - time.monotonic()), self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+        self._dispatch()
+
+    def _enqueue(self, waiter: _RateWaiter, priority: int) -> None:
+        with self._lock:
+            heapq.heappush(self._queue, (priority, next(self._order), waiter))
+        self._dispatch()
+
+    def _abandon(self, waiter: _RateWaiter) -> bool:
+        """Take a waiter that gave up out of the queue; returns whether it was granted anyway."""
+        with self._lock:
+            if not waiter.granted:
+                waiter.abandoned = True
+                self._queue = [entry for entry in self._queue if entry[2] is not waiter]
+                heapq.heapify(self._queue)
+            return waiter.granted
+
+    def try_acquire(self, tokens: float = 0) -> bool:
+        """
+        Charge a request only if capacity is available now and nobody is queued.
+
+        Args:
+            tokens: Estimated tokens the request consumes
+
+        Returns:
+            bool: Whether the request was admitted
+        """
+        if not self.enabled:
+            return True
+        with self._lock:
+            if self._queue:
+                return False
+            now = time.monotonic()
+            for bucket in (self._requests, self._tokens):
+                if bucket is not None:
+                    bucket.refill(now)
+            if self._delay(tokens) > 0:
+                return False
+            if self._requests is not None:
+                self._requests.take(1)
+            if self._tokens is not None:
+                self._tokens.take(tokens)
+            return True
+
+    def acquire(self, tokens: float = 0, priority: int = PRIORITY_LIVE, timeout: Optional[float] = None) -> float:
+        """
+        Block until the request fits both budgets, then charge it.
+
+        Args:
+            tokens: Estimated tokens the request consumes
+            priority: Queue priority (PRIORITY_LIVE or PRIORITY_BATCH)
+            timeout: Longest wait in seconds (None waits indefinitely)
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            RateLimitTimeout: If capacity was not granted within `timeout`
+        """
+        if not self.enabled:
+            return 0.0
+        started = time.monotonic()
+        event = threading.Event()
+        waiter = _RateWaiter(tokens, event.set)
+        self._enqueue(waiter, priority)
+        if not event.wait(timeout) and not self._abandon(waiter):
+            raise RateLimitTimeout(f"No rate-limit capacity within {timeout:g}s")
+        return time.monotonic() - started
+
+    async def aacquire(self, tokens: float = 0, priority: int = PRIORITY_LIVE,
+                       timeout: Optional[float] = None) -> float:
+        """Async counterpart of acquire() that waits without blocking the event loop."""
+        import asyncio
+
+        if not self.enabled:
+            return 0.0
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        waiter = _RateWaiter(tokens, wake, loop)
+        self._enqueue(waiter, priority)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        except asyncio.TimeoutError:
+            if not self._abandon(waiter):
+                raise RateLimitTimeout(f"No rate-limit capacity within {timeout:g}s") from None
+        return time.monotonic() - started
@@ -1,21 +1,161 @@
 """
 Configuration settings for the TalentScout Hiring Assistant application.
 """
-import os  
-from dotenv import load_dotenv  
+import os
+import threading
+from typing import Optional
 
-load_dotenv()  
-import streamlit as st
+# Gemini API configuration
+# The API key is resolved lazily by get_gemini_api_key() so that importing this
+# module stays cheap and free of side effects (no .env parsing, no Streamlit).
+_gemini_api_key: Optional[str] = None
+_gemini_api_key_lock = threading.Lock()
 
-# Load API key from Streamlit secrets
-GEMINI_API_KEY = st.secrets["GEMINI_API_KEY"]
 
-# Gemini API configuration
+def get_gemini_api_key() -> str:
+    """
+    Resolve the Gemini API key on first use.
+    Checks the GEMINI_API_KEY environment variable (after loading a .env file if
+    python-dotenv is installed), then Streamlit secrets.
+
+    Returns:
+        str: The API key
+
+    Raises:
+        RuntimeError: If no API key is configured
+    """
+    global _gemini_api_key
+    with _gemini_api_key_lock:
+        if _gemini_api_key is None:
+            try:
+                from dotenv import load_dotenv
+                load_dotenv()
+            except ImportError:
+                pass
+
+            api_key = os.getenv("GEMINI_API_KEY")
+            if not api_key:
+                try:
+                    import streamlit as st
+                    api_key = st.secrets["GEMINI_API_KEY"]
+                except Exception:
+                    api_key = None
+
+            if not api_key:
+                raise RuntimeError(
+                    "GEMINI_API_KEY is not configured. Set it in the environment, a .env file "
+                    "or .streamlit/secrets.toml."
+                )
+            _gemini_api_key = api_key
+        return _gemini_api_key
+
+
+def __getattr__(name: str):
+    # Keep `from config import GEMINI_API_KEY` working, resolved on first access
+    if name == "GEMINI_API_KEY":
+        return get_gemini_api_key()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')  
 
 GEMINI_MODEL = "gemini-1.5-pro-latest"  # Adjust to the appropriate model
 
+# LLM backend: "gemini", "replay" (answers from recorded fixtures, fully offline) or
+# "record" (Gemini, saving every response to LLM_FIXTURES_PATH for later replay)
+LLM_BACKEND = "gemini"
+LLM_FIXTURES_PATH = os.path.join("fixtures", "llm_fixtures.json")
+# Synthetic latency added to each replayed response (None replays the recorded latency)
+LLM_REPLAY_LATENCY_MS = 0.0
+# What the replay backend does with unrecorded prompts: "fallback" (generic answer) or "error"
+LLM_REPLAY_ON_MISS = "fallback"
+
+# Hedged requests: when GEMINI_MODEL hasn't answered a one-off request within its recent
+# LLM_HEDGE_PERCENTILE latency (bounded by the min/max below, LLM_HEDGE_INITIAL_SECONDS until
+# LLM_HEDGE_MIN_SAMPLES requests have been seen), the request is also sent to the faster
+# fallback model and the first answer wins
+LLM_HEDGE_ENABLED = True
+LLM_HEDGE_FALLBACK_MODEL = "gemini-1.5-flash-latest"
+LLM_HEDGE_PERCENTILE = 95
+LLM_HEDGE_INITIAL_SECONDS = 8.0
+LLM_HEDGE_MIN_SECONDS = 2.0
+LLM_HEDGE_MAX_SECONDS = 20.0
+LLM_HEDGE_MIN_SAMPLES = 20
+# Recent requests per model used to compute the percentile
+LLM_HEDGE_WINDOW = 200
+# Worker threads shared by all hedged requests (losing requests keep one busy until they
+# finish); when all are busy, requests run on the caller's thread without a hedge
+LLM_HEDGE_MAX_WORKERS = 32
+
+# LLM request configuration
+LLM_MAX_RETRIES = 5
+LLM_BACKOFF_BASE_SECONDS = 1.0
+LLM_BACKOFF_MAX_SECONDS = 16.0
+LLM_REQUEST_TIMEOUT_SECONDS = 60
+# Process-wide limit on concurrent async Gemini requests
+LLM_MAX_CONCURRENT_REQUESTS = 8
+# Let concurrent identical one-off prompts (such as question generation for the same tech stack)
+# share a single in-flight request
+LLM_COALESCE_REQUESTS = True
+# Gemini quota shared by every session in the process (None disables a budget). Requests queue for
+# capacity, live candidate turns ahead of batch work, instead of failing and retrying
+LLM_REQUESTS_PER_MINUTE = 360
+LLM_TOKENS_PER_MINUTE = 4_000_000
+# Unused quota is banked for at most this many seconds, which bounds bursts after idle periods
+LLM_RATE_BURST_SECONDS = 10
+# Longest a request waits in the queue before the turn gives up with an error message
+LLM_QUEUE_TIMEOUT_SECONDS = 30
+
+# Prompt size budget: older turns are replaced by a local summary once the estimated
+# size of system prompt + history + prompt exceeds this many tokens (0 disables compaction)
+PROMPT_TOKEN_BUDGET = 6000
+# Number of most recent messages always sent verbatim
+HISTORY_RECENT_MESSAGES = 8
+# Number of excerpts of older messages kept in the summary, and their length
+HISTORY_SUMMARY_MAX_EXCERPTS = 12
+HISTORY_SUMMARY_EXCERPT_CHARS = 160
+
+# Stream LLM output into the chat as it is generated
+STREAM_RESPONSES = True
+
+# Metrics export: Prometheus text file rewritten at most every METRICS_DUMP_INTERVAL_SECONDS
+# ("" disables), and an optional local HTTP endpoint at http://127.0.0.1:METRICS_PORT/metrics
+METRICS_DUMP_PATH = os.path.join("cache", "metrics.prom")
+METRICS_DUMP_INTERVAL_SECONDS = 30
+METRICS_PORT = None
+
+# Technical question cache configuration
+QUESTION_CACHE_ENABLED = True
+QUESTION_CACHE_PATH = os.path.join("cache", "question_cache.json")
+QUESTION_CACHE_MAX_ENTRIES = 256
+QUESTION_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+# Drop a cached question set after it has been served this many times (0 = never rotate)
+QUESTION_CACHE_ROTATE_AFTER = 5
+# Cache used by batch_runner.py, kept apart from the one serving live candidates
+BATCH_QUESTION_CACHE_PATH = os.path.join("cache", "batch_question_cache.json")
+
+# Candidate storage configuration ("json" writes one file per save, "sqlite" uses SQLITE_DB_PATH)
+STORAGE_BACKEND = "json"
+USER_DATA_DIR = "user_data"
+SQLITE_DB_PATH = os.path.join(USER_DATA_DIR, "candidates.db")
+
+# Interview snapshots used to resume sessions after a restart or on another node
+# ("sqlite" uses SESSION_DB_PATH, "redis" shares SESSION_REDIS_URL between nodes,
+# "memory" is an in-process Redis stand-in, None disables resuming)
+SESSION_STORE_BACKEND = "sqlite"
+SESSION_DB_PATH = os.path.join("cache", "sessions.db")
+SESSION_REDIS_URL = "redis://localhost:6379/0"
+# Snapshots of interviews untouched for this long are dropped
+SESSION_TTL_SECONDS = 24 * 60 * 60
+
+# Persisted candidate index used by candidate_index.py
+CANDIDATE_INDEX_PATH = os.path.join("cache", "candidate_index.json")
+
+# Bulk export configuration used by export_candidates.py
+EXPORT_STATE_PATH = os.path.join("cache", "export_state.json")
+# Number of question/answer column pairs in CSV exports
+EXPORT_CSV_MAX_QUESTIONS = 10
+# Conversation downloads from the app are gzip-compressed from this many messages on
+EXPORT_GZIP_MIN_MESSAGES = 200
+
 # System prompt for the chatbot
 SYSTEM_PROMPT = """
 You are a hiring assistant for TalentScout, a tech recruitment agency specializing in technology placements.
@@ -45,6 +185,68 @@ End the conversation when the candidate says "exit", "quit", "bye", or "end".
 # Exit keywords to end the conversation
 EXIT_KEYWORDS = ["exit", "quit", "bye", "end", "goodbye"]
 
+# Technologies detected in free-form chat input by extract_user_data
+TECH_KEYWORDS = [
+    "python", "javascript", "java", "c#", "c++", "ruby", "php", "swift", "kotlin", "go", "rust", "typescript",
+    "html", "css", "react", "angular", "vue", "node", "django", "flask", "spring",
+    "aws", "azure", "gcp", "docker", "kubernetes", "sql", "nosql",
+    "mongodb", "postgresql", "mysql", "redis", "tensorflow", "pytorch", "machine learning"
+]
+
+# Technologies accepted by validate_tech_stack
+VALID_TECHNOLOGIES = [
+    # Programming languages
+    "python", "javascript", "typescript", "java", "c#", "c++", "c", "ruby", "php", "swift", 
+    "kotlin", "go", "rust", "scala", "perl", "r", "dart", "lua", "haskell", "objective-c",
+    
+    # Web frameworks/libraries
+    "react", "angular", "vue", "svelte", "jquery", "express", "django", "flask", "spring", 
+    "asp.net", "laravel", "ruby on rails", "rails", "fastapi", "next.js", "nuxt", "gatsby",
+    
+    # Mobile frameworks
+    "react native", "flutter", "ionic", "xamarin", "android", "ios", "swift ui", "jetpack compose",
+    
+    # Databases
+    "sql", "mysql", "postgresql", "mongodb", "sqlite", "oracle", "sql server", "cassandra", 
+    "redis", "dynamodb", "firebase", "supabase", "neo4j", "couchdb", "mariadb",
+    
+    # Cloud/DevOps
+    "aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "terraform", "jenkins", 
+    "circleci", "travis", "github actions", "gitlab ci", "ansible", "prometheus", "grafana",
+    
+    # AI/ML
+    "tensorflow", "pytorch", "scikit-learn", "keras", "pandas", "numpy", "matplotlib",
+    "machine learning", "deep learning", "nlp", "computer vision", "data science",
+    
+    # Other common tools/tech
+    "git", "linux", "node", "npm", "yarn", "webpack", "graphql", "rest", "soap",
+    "html", "css", "sass", "less", "bootstrap", "tailwind", "material ui"
+]
+
+# Alternate spellings mapped to canonical technology names
+TECH_ALIASES = {
+    "k8s": "kubernetes",
+    "golang": "go",
+    "js": "javascript",
+    "ts": "typescript",
+    "node.js": "node",
+    "nodejs": "node",
+    "postgres": "postgresql",
+    "mongo": "mongodb",
+    "reactjs": "react",
+    "react.js": "react",
+    "vue.js": "vue",
+    "vuejs": "vue",
+    "angularjs": "angular",
+    "amazon web services": "aws",
+    "google cloud platform": "gcp",
+    "google cloud": "gcp",
+    "ml": "machine learning",
+    "sklearn": "scikit-learn",
+    "csharp": "c#",
+    "cpp": "c++"
+}
+
 # Required candidate information fields
 REQUIRED_INFO = [
     "name",
@@ -85,6 +287,121 @@ For each technology mentioned, provide at least one question. Focus more questio
 primary technologies if they have indicated any preferences.
 """
 
+# Format requested for generated technical questions: "json" (structured, validated, one repair
+# retry) or "text" (free-form numbered list parsed with heuristics)
+QUESTION_OUTPUT_FORMAT = "json"
+QUESTION_DIFFICULTIES = ["basic", "intermediate", "advanced"]
+
+# Structured variant of TECH_QUESTION_PROMPT used when QUESTION_OUTPUT_FORMAT is "json"
+TECH_QUESTION_JSON_PROMPT = """
+Based on the candidate's tech stack: {tech_stack}
+
+Generate 3-5 relevant technical questions to assess their proficiency in these technologies.
+The questions should:
+1. Be specific to the mentioned technologies
+2. Range from fundamental to advanced concepts
+3. Include scenario-based questions where appropriate
+4. Assess both theoretical knowledge and practical application
+
+For each technology mentioned, provide at least one question. Focus more questions on the candidate's
+primary technologies if they have indicated any preferences.
+
+Respond with only a JSON array and no other text or markdown. Each element must be an object with these keys:
+- "question": the question text, without numbering
+- "technology": the technology from the tech stack that the question assesses
+- "difficulty": one of "basic", "intermediate" or "advanced"
+
+Example: [{{"question": "What is a Python generator?", "technology": "Python", "difficulty": "basic"}}]
+"""
+
+# Sent once when a structured question response fails validation
+QUESTION_REPAIR_PROMPT = """
+Your previous response could not be used: {error}.
+
+Previous response:
+{response}
+
+Return the corrected questions as only a JSON array of objects with the keys "question", "technology"
+and "difficulty" ("basic", "intermediate" or "advanced"). Do not include markdown or any other text.
+"""
+
+# Pre-generated question bank built with question_bank.py. When enabled, questions for technologies
+# in the bank are assembled locally and the LLM is only asked about technologies the bank lacks
+QUESTION_BANK_ENABLED = True
+QUESTION_BANK_PATH = os.path.join("data", "question_bank.json")
+# Start generating questions in the background as soon as the tech stack is collected, so they are
+# ready when the candidate confirms their details; the result is discarded if details are corrected
+QUESTION_PREFETCH_ENABLED = True
+QUESTION_PREFETCH_WORKERS = 8
+
+# Number of questions assembled per candidate
+QUESTION_COUNT_MIN = 3
+QUESTION_COUNT_MAX = 5
+
+# Sent by question_bank.py for each technology when building the bank
+QUESTION_BANK_PROMPT = """
+Generate {count} technical interview questions for each difficulty level ("basic", "intermediate"
+and "advanced") to assess a candidate's proficiency in {technology}.
+The questions should:
+1. Be specific to {technology} and independent of each other
+2. Include scenario-based questions where appropriate
+3. Assess both theoretical knowledge and practical application
+4. Be answerable in a few sentences without access to code
+
+Respond with only a JSON array and no other text or markdown. Each element must be an object with these keys:
+- "question": the question text, without numbering
+- "technology": "{technology}"
+- "difficulty": one of "basic", "intermediate" or "advanced"
+"""
+
+# Answer scoring: technical answers are graded against ANSWER_SCORING_RUBRIC by answer_scoring.py,
+# several question/answer pairs per LLM request, and the scores are saved with the candidate
+ANSWER_SCORING_ENABLED = True
+ANSWER_SCORE_MIN = 0
+ANSWER_SCORE_MAX = 5
+# Question/answer pairs graded per LLM request
+ANSWER_SCORING_BATCH_SIZE = 20
+# Scores are cached by (question, answer) hash, so identical answers are graded once
+ANSWER_SCORE_CACHE_PATH = os.path.join("cache", "answer_scores.db")
+ANSWER_SCORE_CACHE_MAX_ENTRIES = 10000
+
+ANSWER_SCORING_RUBRIC = """
+0 - No answer, or unrelated to the question
+1 - Mostly incorrect, with major misconceptions
+2 - Partially correct but missing key concepts
+3 - Correct on the fundamentals with some gaps or imprecision
+4 - Correct and complete, with minor omissions
+5 - Correct, complete and insightful, showing practical experience
+"""
+
+# Sent by answer_scoring.py for each batch of answers
+ANSWER_SCORING_PROMPT = """
+You are grading a candidate's answers to technical screening questions.
+Score each answer from {min_score} to {max_score} using this rubric:
+{rubric}
+Grade each answer only on its own question. Judge technical accuracy and depth, not writing style.
+
+Answers to grade (JSON):
+{items}
+
+Respond with only a JSON array and no other text or markdown, with one element per answer. Each element
+must be an object with these keys:
+- "id": the id of the answer
+- "score": an integer from {min_score} to {max_score}
+- "rationale": one short sentence justifying the score
+"""
+
+# Sent once when a scoring response fails validation
+ANSWER_SCORING_REPAIR_PROMPT = """
+Your previous response could not be used: {error}.
+
+Previous response:
+{response}
+
+Return the corrected scores as only a JSON array of objects with the keys "id", "score" and "rationale".
+Do not include markdown or any other text.
+"""
+
 # Closing message
 CLOSING_MESSAGE = """
 Thank you for completing the initial screening process with TalentScout. We've collected your information and assessed your technical knowledge. Our recruitment team will review your responses and get back to you soon if there's a potential match. 
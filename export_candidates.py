@@ -0,0 +1,285 @@
+"""
+Bulk export of saved candidates to JSONL or CSV for the TalentScout Hiring Assistant.
+
+Usage:
+    python export_candidates.py --format csv --output candidates.csv
+    python export_candidates.py --format jsonl --incremental --tech python
+
+Records are streamed one at a time from the configured candidate store, so
+memory use does not grow with the size of the corpus.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from config import EXPORT_STATE_PATH, EXPORT_CSV_MAX_QUESTIONS, TECH_ALIASES
+from storage import CandidateStore, get_candidate_store
+from utils import canonicalize_tech, parse_experience_years
+
+# Candidate fields exported as columns, in order
+EXPORT_FIELDS = [
+    "id", "name", "email", "phone", "experience", "experience_years", "position",
+    "location", "tech_stack", "submission_time", "interview_status"
+]
+
+
+def flatten_record(record_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten a candidate record into a single-level row.
+
+    Args:
+        record_id: Identifier of the record in its store
+        record: Candidate record
+
+    Returns:
+        Dict: Row with question_N/answer_N keys in place of technical_responses
+    """
+    tech_stack = record.get("tech_stack") or []
+    if isinstance(tech_stack, str):
+        tech_stack = [tech_stack]
+
+    row = {
+        "id": record_id,
+        "name": record.get("name", ""),
+        "email": record.get("email", ""),
+        "phone": record.get("phone", ""),
+        "experience": record.get("experience", ""),
+        "experience_years": parse_experience_years(record.get("experience")),
+        "position": record.get("position") or record.get("desired_position", ""),
+        "location": record.get("location", ""),
+        "tech_stack": "; ".join(str(tech) for tech in tech_stack),
+        "submission_time": record.get("submission_time", ""),
+        "interview_status": record.get("interview_status", "")
+    }
+
+    responses = record.get("technical_responses") or {}
+    for number, (_, response) in enumerate(sorted(responses.items(), key=_question_order), start=1):
+        if not isinstance(response, dict):
+            response = {"question": "", "answer": response}
+        row[f"question_{number}"] = response.get("question", "")
+        row[f"answer_{number}"] = response.get("answer", "")
+        row[f"score_{number}"] = response.get("score", "")
+    return row
+
+
+def _question_order(item: Tuple[str, Any]) -> Tuple[int, str]:
+    """Sort "question_10" after "question_9"."""
+    key = str(item[0])
+    suffix = key.rsplit("_", 1)[-1]
+    return (int(suffix), key) if suffix.isdigit() else (sys.maxsize, key)
+
+
+def _matches(
+    record: Dict[str, Any],
+    techs: Optional[List[str]],
+    min_experience: Optional[float],
+    status: Optional[str]
+) -> bool:
+    """Check a record against the export filters."""
+    if status and record.get("interview_status") != status:
+        return False
+    if min_experience is not None:
+        experience = parse_experience_years(record.get("experience"))
+        if experience is None or experience < min_experience:
+            return False
+    if techs:
+        record_techs = {canonicalize_tech(tech, TECH_ALIASES) for tech in record.get("tech_stack") or []}
+        if not all(canonicalize_tech(tech, TECH_ALIASES) in record_techs for tech in techs):
+            return False
+    return True
+
+
+def iter_export_rows(
+    store: CandidateStore,
+    techs: Optional[List[str]] = None,
+    min_experience: Optional[float] = None,
+    status: Optional[str] = None,
+    since: Optional[str] = None,
+    exclude_ids: Iterable[str] = ()
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield flattened rows for the records matching the filters.
+
+    Args:
+        store: Candidate store to read from
+        techs: Technologies the candidate must all have
+        min_experience: Minimum years of experience
+        status: Interview status such as "complete"
+        since: Only export records submitted at or after this time
+        exclude_ids: Record ids to skip (records already exported at exactly `since`)
+
+    Yields:
+        Dict: Flattened rows
+    """
+    exclude_ids = set(exclude_ids)
+    for record_id, record in store.iter_candidates():
+        submitted = record.get("submission_time") or ""
+        if since is not None and (submitted < since or (submitted == since and record_id in exclude_ids)):
+            continue
+        if _matches(record, techs, min_experience, status):
+            yield flatten_record(record_id, record)
+
+
+def write_rows(rows: Iterable[Dict[str, Any]], out: TextIO, fmt: str = "jsonl") -> Dict[str, Any]:
+    """
+    Write rows as JSONL or CSV, one at a time.
+
+    Args:
+        rows: Flattened rows
+        out: Text stream to write to
+        fmt: "jsonl" or "csv"
+
+    Returns:
+        Dict: Number of rows written, truncated rows, and the newest submission watermark
+    """
+    stats = {"exported": 0, "truncated": 0, "watermark": None, "watermark_ids": []}
+
+    if fmt == "csv":
+        columns = EXPORT_FIELDS + [
+            f"{kind}_{number}" for number in range(1, EXPORT_CSV_MAX_QUESTIONS + 1) for kind in ("question", "answer", "score")
+        ]
+        writer = csv.DictWriter(out, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+    elif fmt != "jsonl":
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    for row in rows:
+        if fmt == "csv":
+            if f"question_{EXPORT_CSV_MAX_QUESTIONS + 1}" in row:
+                stats["truncated"] += 1
+            writer.writerow(row)
+        else:
+            out.write(json.dumps(row, ensure_ascii=False))
+            out.write("\n")
+        stats["exported"] += 1
+
+        # Track the newest submission time and the ids sharing it for incremental exports
+        submitted = row["submission_time"] or ""
+        if stats["watermark"] is None or submitted > stats["watermark"]:
+            stats["watermark"] = submitted
+            stats["watermark_ids"] = [row["id"]]
+        elif submitted == stats["watermark"]:
+            stats["watermark_ids"].append(row["id"])
+
+    return stats
+
+
+def load_export_state(path: str = EXPORT_STATE_PATH) -> Dict[str, Any]:
+    """
+    Load the watermark of the previous incremental export.
+
+    Args:
+        path: State file path
+
+    Returns:
+        Dict: {"since": submission time or None, "ids": ids exported at that time}
+    """
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"since": None, "ids": []}
+
+
+def save_export_state(state: Dict[str, Any], path: str = EXPORT_STATE_PATH) -> None:
+    """
+    Atomically save the incremental export watermark.
+
+    Args:
+        state: {"since": ..., "ids": [...]}
+        path: State file path
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def export_candidates(
+    out: TextIO,
+    fmt: str = "jsonl",
+    store: Optional[CandidateStore] = None,
+    techs: Optional[List[str]] = None,
+    min_experience: Optional[float] = None,
+    status: Optional[str] = None,
+    since: Optional[str] = None,
+    incremental: bool = False,
+    state_path: str = EXPORT_STATE_PATH
+) -> Dict[str, Any]:
+    """
+    Export saved candidates matching the filters.
+
+    Args:
+        out: Text stream to write to
+        fmt: "jsonl" or "csv"
+        store: Candidate store (defaults to the configured one)
+        techs: Technologies the candidate must all have
+        min_experience: Minimum years of experience
+        status: Interview status such as "complete"
+        since: Only export records submitted at or after this time
+        incremental: Only export records saved since the previous incremental export
+        state_path: Where the incremental watermark is kept
+
+    Returns:
+        Dict: Export statistics
+    """
+    store = store or get_candidate_store()
+    exclude_ids: List[str] = []
+    state = None
+    if incremental:
+        state = load_export_state(state_path)
+        if state.get("since") is not None and (since is None or state["since"] > since):
+            since = state["since"]
+            exclude_ids = state.get("ids", [])
+
+    rows = iter_export_rows(store, techs, min_experience, status, since, exclude_ids)
+    stats = write_rows(rows, out, fmt)
+
+    if incremental:
+        if stats["watermark"] is not None:
+            ids = stats["watermark_ids"]
+            if stats["watermark"] == state.get("since"):
+                ids = list(set(ids) | set(state.get("ids", [])))
+            save_export_state({"since": stats["watermark"], "ids": ids}, state_path)
+
+    return {"exported": stats["exported"], "truncated": stats["truncated"], "since": since}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export saved candidates to JSONL or CSV.")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--output", "-o", help="Output file (defaults to stdout)")
+    parser.add_argument("--tech", action="append", default=[], help="Required technology (repeatable)")
+    parser.add_argument("--min-experience", type=float)
+    parser.add_argument("--status")
+    parser.add_argument("--since", help="Only records submitted at or after YYYY-MM-DD[ HH:MM:SS]")
+    parser.add_argument("--incremental", action="store_true", help="Only records saved since the last incremental export")
+    parser.add_argument("--state-file", default=EXPORT_STATE_PATH)
+    args = parser.parse_args()
+
+    out = open(args.output, 'w', newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        stats = export_candidates(
+            out,
+            fmt=args.format,
+            techs=args.tech,
+            min_experience=args.min_experience,
+            status=args.status,
+            since=args.since,
+            incremental=args.incremental,
+            state_path=args.state_file
+        )
+    finally:
+        if args.output:
+            out.close()
+    print(json.dumps(stats), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
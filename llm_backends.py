@@ -0,0 +1,876 @@
+"""
+LLM backends for the TalentScout Hiring Assistant.
+"""
+import hashlib
+import json
+import os
+import re
+import string
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+from config import (
+    get_gemini_api_key,
+    GEMINI_MODEL,
+    LLM_BACKEND,
+    LLM_FIXTURES_PATH,
+    LLM_REPLAY_LATENCY_MS,
+    LLM_REPLAY_ON_MISS,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    LLM_RATE_BURST_SECONDS,
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_FALLBACK_MODEL,
+    LLM_HEDGE_PERCENTILE,
+    LLM_HEDGE_INITIAL_SECONDS,
+    LLM_HEDGE_MIN_SECONDS,
+    LLM_HEDGE_MAX_SECONDS,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_HEDGE_WINDOW,
+    LLM_HEDGE_MAX_WORKERS,
+    TECH_QUESTION_JSON_PROMPT,
+    QUESTION_REPAIR_PROMPT,
+    QUESTION_BANK_PROMPT,
+    ANSWER_SCORING_PROMPT,
+    ANSWER_SCORING_REPAIR_PROMPT
+)
+from concurrency import RateScheduler
+from metrics import get_metrics_registry
+from utils import estimate_tokens, percentile
+
+# Returned by ReplayBackend for prompts without a fixture when LLM_REPLAY_ON_MISS is "fallback".
+# It is shaped like a question list so offline interviews can run to the end.
+REPLAY_FALLBACK_RESPONSE = """1. Describe a recent project and the technologies you used in it.
+2. How do you test and debug your code?
+3. Explain a design trade-off you made and why you chose it."""
+# Fallback for prompts that ask for structured (JSON) questions
+REPLAY_FALLBACK_JSON_RESPONSE = json.dumps([
+    {"question": "Describe a recent project and the technologies you used in it.",
+     "technology": "general", "difficulty": "basic"},
+    {"question": "How do you test and debug your code?", "technology": "general", "difficulty": "intermediate"},
+    {"question": "Explain a design trade-off you made and why you chose it.",
+     "technology": "general", "difficulty": "advanced"}
+])
+
+# Canned answers for unrecorded prompts, by the prompt template that produced them. Prompts
+# built from no listed template get REPLAY_FALLBACK_RESPONSE; None means no canned answer
+# can satisfy the prompt (scores must match the ids sent), so the miss raises KeyError.
+REPLAY_FALLBACKS = [
+    (TECH_QUESTION_JSON_PROMPT, REPLAY_FALLBACK_JSON_RESPONSE),
+    (QUESTION_REPAIR_PROMPT, REPLAY_FALLBACK_JSON_RESPONSE),
+    (QUESTION_BANK_PROMPT, REPLAY_FALLBACK_JSON_RESPONSE),
+    (ANSWER_SCORING_PROMPT, None),
+    (ANSWER_SCORING_REPAIR_PROMPT, None)
+]
+
+# Size of the pieces ReplayBackend streams a response in
+REPLAY_CHUNK_CHARS = 40
+
+_metrics = get_metrics_registry()
+_model_seconds = _metrics.histogram(
+    "talentscout_llm_model_seconds", "Latency of successful requests per model (first chunk for streams)", ["model", "kind"]
+)
+_hedges = _metrics.counter(
+    "talentscout_llm_hedges_total", "Requests that outlived the hedging threshold, by outcome", ["outcome"]
+)
+
+
+class LLMSession:
+    """
+    A conversation with a backend.
+
+    `history` is a list of Gemini-format messages ({"role": "user"|"model",
+    "parts": [{"text": ...}]}) owned by the caller, who appends real turns to
+    it. Prompts sent through the session are answered in the context of that
+    history but are not added to it.
+    """
+
+    history: List[Dict[str, Any]]
+
+    def send(self, prompt: str) -> str:
+        """
+        Get a complete response to a prompt.
+
+        Args:
+            prompt: Prompt text
+
+        Returns:
+            str: Response text
+        """
+        raise NotImplementedError
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Stream a response to a prompt.
+
+        Args:
+            prompt: Prompt text
+
+        Yields:
+            str: Text chunks as they are generated
+        """
+        raise NotImplementedError
+
+    async def asend(self, prompt: str) -> str:
+        """
+        Async counterpart of send.
+
+        Args:
+            prompt: Prompt text
+
+        Returns:
+            str: Response text
+        """
+        raise NotImplementedError
+
+
+class LLMBackend:
+    """
+    Base class for LLM backends.
+
+    Backends raise on failure; retries, timeouts, concurrency limits and rate
+    limits are applied by the caller.
+    """
+
+    name = "base"
+    # Whether requests count against the quota enforced by get_rate_scheduler()
+    rate_limited = False
+
+    @property
+    def cache_scope(self) -> Optional[str]:
+        """
+        Label keeping questions generated by this backend apart in the question cache.
+
+        Only real Gemini models return None and share the production cache, so
+        replayed, recorded or simulated responses are never served to live candidates.
+        """
+        return self.name
+
+    def start_session(self) -> LLMSession:
+        """
+        Start a conversation with an empty history.
+
+        Returns:
+            LLMSession: The new session
+        """
+        raise NotImplementedError
+
+    def generate(self, prompt: str) -> str:
+        """
+        Get a complete response to a one-off prompt.
+
+        Args:
+            prompt: Prompt text
+
+        Returns:
+            str: Response text
+        """
+        raise NotImplementedError
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Stream a response to a one-off prompt.
+
+        Args:
+            prompt: Prompt text
+
+        Yields:
+            str: Text chunks as they are generated
+        """
+        raise NotImplementedError
+
+    async def agenerate(self, prompt: str) -> str:
+        """
+        Async counterpart of generate.
+
+        Args:
+            prompt: Prompt text
+
+        Returns:
+            str: Response text
+        """
+        raise NotImplementedError
+
+
+# The Gemini SDK is imported and configured on first use (see _get_genai) so that
+# importing this module is fast and has no side effects
+_genai = None
+_genai_lock = threading.Lock()
+
+
+def _get_genai() -> Any:
+    """
+    Import and configure the Gemini SDK once per process.
+
+    Returns:
+        Any: The configured google.generativeai module
+    """
+    global _genai
+    with _genai_lock:
+        if _genai is None:
+            import google.generativeai as genai
+
+            # Configure Gemini API
+            genai.configure(api_key=get_gemini_api_key())
+            _genai = genai
+        return _genai
+
+
+class GeminiSession(LLMSession):
+    """Session backed by a live Gemini ChatSession."""
+
+    def __init__(self, chat: Any):
+        self._chat = chat
+
+    @property
+    def history(self) -> List[Dict[str, Any]]:
+        return self._chat.history
+
+    def send(self, prompt: str) -> str:
+        response = self._chat.send_message(prompt)
+        # The prompt is not part of the conversation; only real turns stay in history
+        self._chat.rewind()
+        return response.text
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        response = self._chat.send_message(prompt, stream=True)
+        try:
+            for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        finally:
+            self._chat.rewind()
+
+    async def asend(self, prompt: str) -> str:
+        response = await self._chat.send_message_async(prompt)
+        self._chat.rewind()
+        return response.text
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini through the google-generativeai SDK."""
+
+    name = "gemini"
+    rate_limited = True
+    cache_scope = None
+
+    def __init__(self, model_name: str = GEMINI_MODEL):
+        """
+        Initialize the backend. The SDK is loaded on the first request.
+
+        Args:
+            model_name: Gemini model to use
+        """
+        self.model_name = model_name
+        self._model = None
+
+    @property
+    def model(self) -> Any:
+        """The GenerativeModel, created on first use."""
+        if self._model is None:
+            self._model = _get_genai().GenerativeModel(model_name=self.model_name)
+        return self._model
+
+    def start_session(self) -> LLMSession:
+        return GeminiSession(self.model.start_chat(history=[]))
+
+    def generate(self, prompt: str) -> str:
+        return self.model.generate_content(prompt).text
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        for chunk in self.model.generate_content(prompt, stream=True):
+            if chunk.text:
+                yield chunk.text
+
+    async def agenerate(self, prompt: str) -> str:
+        response = await self.model.generate_content_async(prompt)
+        return response.text
+
+
+class LatencyTracker:
+    """Recent latencies of one model, used to adapt the hedging threshold."""
+
+    def __init__(self, window: int = LLM_HEDGE_WINDOW):
+        """
+        Initialize the tracker.
+
+        Args:
+            window: Number of most recent observations kept
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float:
+        """Percentile of the recent latencies (0.0 without observations)."""
+        with self._lock:
+            samples = list(self._samples)
+        return percentile(samples, pct)
+
+
+# Runs the requests of every HedgedBackend in the process, created on first use
+_hedge_executor = None
+_hedge_executor_lock = threading.Lock()
+# Free workers of _hedge_executor; a request never queues behind busy ones
+_hedge_slots = threading.BoundedSemaphore(LLM_HEDGE_MAX_WORKERS)
+
+
+def _submit_to_pool(call: Callable[[], Any]) -> Optional["Future"]:
+    """
+    Run a blocking call on the shared hedge pool.
+
+    Args:
+        call: Function to run
+
+    Returns:
+        Optional[Future]: Its result, or None if every worker is busy
+    """
+    global _hedge_executor
+    if not _hedge_slots.acquire(blocking=False):
+        return None
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _hedge_executor = ThreadPoolExecutor(max_workers=LLM_HEDGE_MAX_WORKERS, thread_name_prefix="llm-hedge")
+    future = _hedge_executor.submit(call)
+    future.add_done_callback(lambda _: _hedge_slots.release())
+    return future
+
+
+class HedgedBackend(LLMBackend):
+    """
+    Sends each one-off request to a primary model and, if it hasn't answered within
+    a threshold, also to a faster fallback model, returning whichever answers first.
+
+    The threshold is the primary model's recent LLM_HEDGE_PERCENTILE latency, so only
+    the slowest requests are duplicated. Streams are hedged on the time to the first
+    chunk. A hedge is only sent when the rate scheduler has spare capacity right now.
+    Session requests go to the primary model alone: a losing request would still be
+    running on its chat session when the next turn arrives.
+    """
+
+    name = "hedged"
+
+    def __init__(self, primary: LLMBackend, fallback: LLMBackend,
+                 primary_name: str = "primary", fallback_name: str = "fallback"):
+        """
+        Initialize the hedged backend.
+
+        Args:
+            primary: Backend for the preferred model
+            fallback: Backend for the faster fallback model
+            primary_name: Model label used in metrics
+            fallback_name: Model label used in metrics
+        """
+        self.primary = primary
+        self.fallback = fallback
+        self.rate_limited = primary.rate_limited or fallback.rate_limited
+        self.models = {primary: primary_name, fallback: fallback_name}
+        # Per model and kind ("response" or "first_chunk")
+        self.latency = {
+            (backend, kind): LatencyTracker()
+            for backend in (primary, fallback) for kind in ("response", "first_chunk")
+        }
+
+    @property
+    def cache_scope(self) -> Optional[str]:
+        if self.primary.cache_scope is None and self.fallback.cache_scope is None:
+            return None
+        return self.name
+
+    def threshold(self, kind: str = "response") -> float:
+        """
+        Seconds to wait for the primary model before hedging.
+
+        Args:
+            kind: "response" for complete responses, "first_chunk" for streams
+
+        Returns:
+            float: The primary's recent percentile latency within the configured bounds,
+            or LLM_HEDGE_INITIAL_SECONDS until enough requests have been observed
+        """
+        tracker = self.latency[(self.primary, kind)]
+        if len(tracker) < LLM_HEDGE_MIN_SAMPLES:
+            return LLM_HEDGE_INITIAL_SECONDS
+        return min(LLM_HEDGE_MAX_SECONDS, max(LLM_HEDGE_MIN_SECONDS, tracker.percentile(LLM_HEDGE_PERCENTILE)))
+
+    def _observe(self, backend: LLMBackend, kind: str, seconds: float) -> None:
+        self.latency[(backend, kind)].observe(seconds)
+        _model_seconds.observe(seconds, model=self.models[backend], kind=kind)
+
+    def _can_hedge(self, prompt: str) -> bool:
+        """Whether the quota allows a duplicate request without delaying anyone."""
+        if not self.fallback.rate_limited:
+            return True
+        return get_rate_scheduler().try_acquire(estimate_tokens(prompt))
+
+    def _generate_timed(self, backend: LLMBackend, prompt: str) -> str:
+        """Call backend.generate, tracking its latency."""
+        started = time.perf_counter()
+        response = backend.generate(prompt)
+        self._observe(backend, "response", time.perf_counter() - started)
+        return response
+
+    def _start(self, backend: LLMBackend, prompt: str) -> Optional["Future"]:
+        """Run backend.generate on the shared pool, or return None if every worker is busy."""
+        return _submit_to_pool(lambda: self._generate_timed(backend, prompt))
+
+    def start_session(self) -> LLMSession:
+        return self.primary.start_session()
+
+    def generate(self, prompt: str) -> str:
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        primary = self._start(self.primary, prompt)
+        if primary is None:
+            # No worker to wait on; a hedge would have nowhere to run either
+            return self._generate_timed(self.primary, prompt)
+        done, _ = wait([primary], timeout=self.threshold())
+        if done:
+            return primary.result()
+        fallback = self._start(self.fallback, prompt) if self._can_hedge(prompt) else None
+        if fallback is None:
+            _hedges.inc(outcome="skipped")
+            return primary.result()
+
+        pending = {primary, fallback}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # The loser runs to completion in the background; its latency is still recorded
+                    _hedges.inc(outcome="primary" if future is primary else "fallback")
+                    return future.result()
+                error = future.exception()
+        _hedges.inc(outcome="failed")
+        raise error
+
+    async def agenerate(self, prompt: str) -> str:
+        import asyncio
+
+        async def call(backend: LLMBackend) -> str:
+            started = time.perf_counter()
+            response = await backend.agenerate(prompt)
+            self._observe(backend, "response", time.perf_counter() - started)
+            return response
+
+        primary = asyncio.ensure_future(call(self.primary))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.threshold())
+            if done:
+                return primary.result()
+            if not self._can_hedge(prompt):
+                _hedges.inc(outcome="skipped")
+                return await primary
+
+            pending.add(asyncio.ensure_future(call(self.fallback)))
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        _hedges.inc(outcome="primary" if task is primary else "fallback")
+                        return task.result()
+                    error = task.exception()
+            _hedges.inc(outcome="failed")
+            raise error
+        finally:
+            # Unlike threads, the losing (or abandoned) coroutine can be cancelled
+            for task in pending:
+                task.cancel()
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        import queue
+
+        chunks = queue.Queue()
+        # Source whose chunks are passed on; losers, and every source once the caller
+        # stops reading, stop at their next chunk
+        state = {"winner": None, "closed": False}
+
+        def pump(backend: LLMBackend) -> None:
+            started = time.perf_counter()
+            first = True
+            try:
+                for text in backend.stream(prompt):
+                    if not text:
+                        continue
+                    if first:
+                        self._observe(backend, "first_chunk", time.perf_counter() - started)
+                        first = False
+                    if state["closed"] or state["winner"] not in (None, backend):
+                        return
+                    chunks.put((backend, text, None))
+                chunks.put((backend, None, None))
+            except Exception as e:
+                chunks.put((backend, None, e))
+
+        if _submit_to_pool(lambda: pump(self.primary)) is None:
+            yield from self.primary.stream(prompt)
+            return
+        deadline = time.monotonic() + self.threshold("first_chunk")
+        running = {self.primary}
+        started = {self.primary}
+        hedged = False
+        error = None
+        try:
+            while True:
+                try:
+                    timeout = None if hedged or state["winner"] else max(0.0, deadline - time.monotonic())
+                    backend, text, failure = chunks.get(timeout=timeout)
+                except queue.Empty:
+                    hedged = True
+                    if self._can_hedge(prompt) and _submit_to_pool(lambda: pump(self.fallback)) is not None:
+                        running.add(self.fallback)
+                        started.add(self.fallback)
+                    else:
+                        _hedges.inc(outcome="skipped")
+                    continue
+
+                if state["winner"] is None and text is not None:
+                    state["winner"] = backend
+                    if self.fallback in started:
+                        _hedges.inc(outcome="primary" if backend is self.primary else "fallback")
+                if state["winner"] is not None and backend is not state["winner"]:
+                    continue
+                if text is not None:
+                    yield text
+                    continue
+
+                # The winner finished, or a source ended before producing anything
+                if state["winner"] is backend:
+                    if failure:
+                        raise failure
+                    return
+                running.discard(backend)
+                error = failure or error
+                if not running:
+                    if self.fallback in started:
+                        _hedges.inc(outcome="failed")
+                    if error:
+                        raise error
+                    return
+        finally:
+            state["closed"] = True
+
+
+def fixture_key(prompt: str) -> str:
+    """
+    Build the fixture key for a prompt.
+
+    Args:
+        prompt: Prompt text
+
+    Returns:
+        str: SHA-256 hex digest of the prompt
+    """
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def load_fixtures(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load recorded fixtures.
+
+    Args:
+        path: Fixture file path
+
+    Returns:
+        Dict: {fixture key: {"prompt", "response", "latency_seconds"}}, empty if the file is missing
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f).get("fixtures", {})
+
+
+def template_pattern(template: str) -> Pattern:
+    """
+    Compile a pattern matching any text produced by formatting a prompt template.
+
+    Args:
+        template: str.format template
+
+    Returns:
+        Pattern: Regex with the template's literal text kept and every field matching anything
+    """
+    parts = []
+    for literal, field, _, _ in string.Formatter().parse(template):
+        parts.append(re.escape(literal))
+        if field is not None:
+            parts.append(".*?")
+    return re.compile("".join(parts), re.DOTALL)
+
+
+class _ReplaySession(LLMSession):
+    def __init__(self, backend: "ReplayBackend"):
+        self._backend = backend
+        self.history = []
+
+    def send(self, prompt: str) -> str:
+        return self._backend.generate(prompt)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        return self._backend.stream(prompt)
+
+    async def asend(self, prompt: str) -> str:
+        return await self._backend.agenerate(prompt)
+
+
+class ReplayBackend(LLMBackend):
+    """
+    Deterministic offline backend answering from recorded fixtures.
+
+    Responses depend only on the prompt text, so replays are reproducible
+    regardless of the conversation history.
+    """
+
+    name = "replay"
+
+    def __init__(self, fixtures_path: str = LLM_FIXTURES_PATH, latency_ms: Optional[float] = LLM_REPLAY_LATENCY_MS,
+                 on_miss: str = LLM_REPLAY_ON_MISS,
+                 fallbacks: Sequence[Tuple[str, Optional[str]]] = REPLAY_FALLBACKS):
+        """
+        Load the fixtures.
+
+        Args:
+            fixtures_path: Fixture file written by RecordingBackend
+            latency_ms: Synthetic latency per request, or None to replay each fixture's recorded latency
+            on_miss: "fallback" answers unknown prompts with a canned response, "error" raises KeyError
+            fallbacks: (prompt template, canned response) pairs used by the "fallback" policy;
+                the first template the prompt was built from wins (see REPLAY_FALLBACKS)
+        """
+        if on_miss not in ("fallback", "error"):
+            raise ValueError(f"Unknown on_miss policy: {on_miss}")
+        self.fixtures = load_fixtures(fixtures_path)
+        self.latency_ms = latency_ms
+        self.on_miss = on_miss
+        self.fallbacks = [(template_pattern(template), response) for template, response in fallbacks]
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, prompt: str) -> Dict[str, Any]:
+        """Find the fixture for a prompt, applying the miss policy."""
+        fixture = self.fixtures.get(fixture_key(prompt))
+        if fixture is not None:
+            self.hits += 1
+            return fixture
+        self.misses += 1
+        fallback = REPLAY_FALLBACK_RESPONSE
+        if self.on_miss == "fallback":
+            fallback = next((response for pattern, response in self.fallbacks if pattern.search(prompt)), fallback)
+        if self.on_miss == "error" or fallback is None:
+            raise KeyError(f"No fixture for prompt {fixture_key(prompt)[:12]}")
+        return {"response": fallback, "latency_seconds": 0.0}
+
+    def _latency(self, fixture: Dict[str, Any]) -> float:
+        """Seconds to wait before answering."""
+        if self.latency_ms is None:
+            return fixture.get("latency_seconds", 0.0)
+        return self.latency_ms / 1000
+
+    def start_session(self) -> LLMSession:
+        return _ReplaySession(self)
+
+    def generate(self, prompt: str) -> str:
+        fixture = self._lookup(prompt)
+        time.sleep(self._latency(fixture))
+        return fixture["response"]
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        fixture = self._lookup(prompt)
+        time.sleep(self._latency(fixture))
+        response = fixture["response"]
+        for start in range(0, len(response), REPLAY_CHUNK_CHARS):
+            yield response[start:start + REPLAY_CHUNK_CHARS]
+
+    async def agenerate(self, prompt: str) -> str:
+        import asyncio
+
+        fixture = self._lookup(prompt)
+        await asyncio.sleep(self._latency(fixture))
+        return fixture["response"]
+
+
+class _RecordingSession(LLMSession):
+    def __init__(self, backend: "RecordingBackend", session: LLMSession):
+        self._backend = backend
+        self._session = session
+
+    @property
+    def history(self) -> List[Dict[str, Any]]:
+        return self._session.history
+
+    def send(self, prompt: str) -> str:
+        return self._backend._timed(prompt, lambda: self._session.send(prompt))
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        return self._backend._timed_stream(prompt, self._session.stream(prompt))
+
+    async def asend(self, prompt: str) -> str:
+        started = time.perf_counter()
+        response = await self._session.asend(prompt)
+        self._backend.record(prompt, response, time.perf_counter() - started)
+        return response
+
+
+class RecordingBackend(LLMBackend):
+    """Wraps another backend and records every successful response as a fixture."""
+
+    name = "record"
+
+    def __init__(self, backend: LLMBackend, fixtures_path: str = LLM_FIXTURES_PATH):
+        """
+        Initialize the recorder, keeping any fixtures already in the file.
+
+        Args:
+            backend: Backend that answers the prompts
+            fixtures_path: Fixture file to write
+        """
+        self.backend = backend
+        self.rate_limited = backend.rate_limited
+        self.fixtures_path = fixtures_path
+        self.fixtures = load_fixtures(fixtures_path)
+        self._lock = threading.Lock()
+
+    def record(self, prompt: str, response: str, latency: float) -> None:
+        """
+        Store a response and rewrite the fixture file.
+
+        Args:
+            prompt: Prompt text
+            response: Complete response text
+            latency: Seconds the backend took to respond
+        """
+        with self._lock:
+            self.fixtures[fixture_key(prompt)] = {
+                "prompt": prompt,
+                "response": response,
+                "latency_seconds": round(latency, 4)
+            }
+            directory = os.path.dirname(self.fixtures_path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"fixtures": self.fixtures}, f, indent=2)
+            os.replace(tmp_path, self.fixtures_path)
+
+    def _timed(self, prompt: str, call) -> str:
+        """Run a request and record its response."""
+        started = time.perf_counter()
+        response = call()
+        self.record(prompt, response, time.perf_counter() - started)
+        return response
+
+    def _timed_stream(self, prompt: str, chunks: Iterator[str]) -> Iterator[str]:
+        """Pass a stream through and record it once it completes."""
+        started = time.perf_counter()
+        parts = []
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        self.record(prompt, "".join(parts), time.perf_counter() - started)
+
+    def start_session(self) -> LLMSession:
+        return _RecordingSession(self, self.backend.start_session())
+
+    def generate(self, prompt: str) -> str:
+        return self._timed(prompt, lambda: self.backend.generate(prompt))
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        return self._timed_stream(prompt, self.backend.stream(prompt))
+
+    async def agenerate(self, prompt: str) -> str:
+        started = time.perf_counter()
+        response = await self.backend.agenerate(prompt)
+        self.record(prompt, response, time.perf_counter() - started)
+        return response
+
+
+_shared_backend: Optional[LLMBackend] = None
+_shared_backend_lock = threading.Lock()
+
+
+def _create_gemini_backend() -> LLMBackend:
+    """Gemini on GEMINI_MODEL, hedged with LLM_HEDGE_FALLBACK_MODEL when hedging is enabled."""
+    if LLM_HEDGE_ENABLED and LLM_HEDGE_FALLBACK_MODEL:
+        return HedgedBackend(
+            GeminiBackend(GEMINI_MODEL), GeminiBackend(LLM_HEDGE_FALLBACK_MODEL),
+            GEMINI_MODEL, LLM_HEDGE_FALLBACK_MODEL
+        )
+    return GeminiBackend()
+
+
+def create_llm_backend(name: str = LLM_BACKEND) -> LLMBackend:
+    """
+    Create an LLM backend by name.
+
+    Args:
+        name: "gemini", "replay" or "record" (Gemini, recording fixtures)
+
+    Returns:
+        LLMBackend: The backend instance
+    """
+    if name == "gemini":
+        return _create_gemini_backend()
+    elif name == "replay":
+        return ReplayBackend()
+    elif name == "record":
+        return RecordingBackend(_create_gemini_backend())
+    raise ValueError(f"Unknown LLM backend: {name}")
+
+
+def get_llm_backend() -> LLMBackend:
+    """
+    Get the process-wide LLM backend selected by LLM_BACKEND.
+
+    Returns:
+        LLMBackend: Shared backend instance
+    """
+    global _shared_backend
+    with _shared_backend_lock:
+        if _shared_backend is None:
+            _shared_backend = create_llm_backend()
+        return _shared_backend
+
+
+_shared_scheduler: Optional[RateScheduler] = None
+_shared_scheduler_lock = threading.Lock()
+
+
+def get_rate_scheduler() -> RateScheduler:
+    """
+    Get the process-wide scheduler enforcing LLM_REQUESTS_PER_MINUTE and LLM_TOKENS_PER_MINUTE.
+
+    Returns:
+        RateScheduler: Shared scheduler for requests to rate-limited backends
+    """
+    global _shared_scheduler
+    with _shared_scheduler_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = RateScheduler(LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, LLM_RATE_BURST_SECONDS)
+        return _shared_scheduler
+
+
+def set_rate_scheduler(scheduler: Optional[RateScheduler]) -> None:
+    """
+    Replace the process-wide rate scheduler, e.g. with a share of the quota in a worker process.
+
+    Args:
+        scheduler: Scheduler to use from now on (None recreates the configured one on next use)
+    """
+    global _shared_scheduler
+    with _shared_scheduler_lock:
+        _shared_scheduler = scheduler
@@ -0,0 +1,365 @@
+"""
+Concurrent-session load test for the TalentScout Hiring Assistant.
+
+Usage:
+    python load_test.py --concurrency 1,8,32,128 --latency-ms 800 --error-rate 0.02
+    python load_test.py --concurrency 64 --latency-dist lognormal --stream
+
+Simulates candidates walking the full greeting -> collecting_info -> confirming_info ->
+asking_tech_questions -> closing flow, one thread per concurrent candidate, against a
+local stand-in for the Gemini backend. For each concurrency level it reports turn latency
+percentiles, throughput and the memory retained per finished session.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import random
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+import chatbot
+from chatbot import ConversationManager
+from concurrency import RateScheduler
+from llm_backends import HedgedBackend, LLMBackend, LLMSession, set_rate_scheduler
+from question_cache import QuestionCache, set_question_cache
+from utils import percentile
+
+# Tech stacks cycled through by simulated candidates
+TECH_STACKS = [
+    "Python, Django, PostgreSQL",
+    "JavaScript, React, Node",
+    "Java, Spring, MySQL",
+    "Go, Kubernetes, Docker",
+    "AWS, Terraform, Linux",
+    "TypeScript, Angular, MongoDB"
+]
+
+SIMULATED_QUESTIONS = (
+    "1. Explain how you would structure a medium-sized project using {tech}.\n"
+    "2. Describe a performance problem you diagnosed in {tech} and how you fixed it.\n"
+    "3. How do you test code that depends on {tech}?"
+)
+
+
+class SimulatedBackend(LLMBackend):
+    """
+    Local stand-in for Gemini with configurable latency and errors.
+
+    Latency is spent in time.sleep, which releases the GIL like a network call does,
+    or in asyncio.sleep on the async path, which leaves the event loop free.
+    """
+
+    name = "simulated"
+
+    def __init__(self, latency_ms: float = 800.0, latency_dist: str = "fixed",
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        Initialize the simulated backend.
+
+        Args:
+            latency_ms: Mean response latency in milliseconds
+            latency_dist: "fixed", "uniform" (0-2x mean) or "lognormal" (long tail)
+            error_rate: Probability that a request fails
+            seed: Seed for the latency and error draws
+        """
+        if latency_dist not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {latency_dist}")
+        self.latency_ms = latency_ms
+        self.latency_dist = latency_dist
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw_latency(self) -> float:
+        """Draw a latency in seconds from the configured distribution."""
+        mean = self.latency_ms / 1000
+        with self._lock:
+            if self.latency_dist == "uniform":
+                return self._random.uniform(0, 2 * mean)
+            if self.latency_dist == "lognormal":
+                # sigma=0.75 gives p99 around 4x the median; mu keeps the mean at `mean`
+                sigma = 0.75
+                return self._random.lognormvariate(0, sigma) * mean / math.exp(sigma ** 2 / 2)
+            return mean
+
+    def _start_request(self) -> bool:
+        """Count a request and decide whether it fails."""
+        with self._lock:
+            self.requests += 1
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return failed
+
+    def generate(self, prompt: str) -> str:
+        """Simulate one request: wait, maybe fail, then answer."""
+        failed = self._start_request()
+        time.sleep(self._draw_latency())
+        return self._respond(prompt, failed)
+
+    def _respond(self, prompt: str, failed: bool) -> str:
+        """Answer a prompt once its latency has passed."""
+        if failed:
+            raise RuntimeError("Simulated Gemini error")
+
+        if "tech stack:" in prompt:
+            tech = prompt.split("tech stack:", 1)[1].strip().splitlines()[0]
+            if "JSON array" in prompt:
+                return json.dumps([
+                    {"question": question.split(". ", 1)[1], "technology": tech, "difficulty": difficulty}
+                    for question, difficulty in zip(SIMULATED_QUESTIONS.format(tech=tech).splitlines(),
+                                                    ["basic", "intermediate", "advanced"])
+                ])
+            return SIMULATED_QUESTIONS.format(tech=tech)
+        return "Thank you, let's continue with the screening."
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        response = self.generate(prompt)
+        for start in range(0, len(response), 40):
+            yield response[start:start + 40]
+
+    async def agenerate(self, prompt: str) -> str:
+        failed = self._start_request()
+        await asyncio.sleep(self._draw_latency())
+        return self._respond(prompt, failed)
+
+    def start_session(self) -> LLMSession:
+        return SimulatedSession(self)
+
+
+class SimulatedSession(LLMSession):
+    """Session bound to a SimulatedBackend; answers ignore the history."""
+
+    def __init__(self, backend: SimulatedBackend):
+        self.backend = backend
+        self.history = []
+
+    def send(self, prompt: str) -> str:
+        return self.backend.generate(prompt)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        return self.backend.stream(prompt)
+
+    async def asend(self, prompt: str) -> str:
+        return await self.backend.agenerate(prompt)
+
+
+def candidate_script(number: int) -> List[str]:
+    """
+    Build the inputs a simulated candidate sends, one per turn.
+
+    Args:
+        number: Candidate number, used to vary the answers
+
+    Returns:
+        List[str]: Inputs from greeting to the technical answers
+    """
+    return [
+        "Hello",
+        f"Candidate {number}",
+        f"candidate{number}@example.com",
+        f"555{number % 10000000:07d}",
+        f"{number % 15 + 1} years",
+        "Software Engineer",
+        "Remote",
+        TECH_STACKS[number % len(TECH_STACKS)],
+        "yes",
+        "1. I would split it into modules. 2. I profiled it. 3. With mocks and integration tests."
+    ]
+
+
+def run_session(backend: LLMBackend, number: int, stream: bool = False, think_seconds: float = 0.0,
+                use_question_cache: bool = False, use_question_bank: bool = False) -> Dict[str, Any]:
+    """
+    Walk one simulated candidate through the whole interview.
+
+    Args:
+        backend: Shared simulated backend
+        number: Candidate number
+        stream: Consume responses through process_input_stream like the UI does
+        think_seconds: Pause between turns
+        use_question_cache: Serve repeated tech stacks from the question cache
+        use_question_bank: Assemble questions from the question bank
+
+    Returns:
+        Dict: Per-turn (state, seconds) pairs, final state and the manager
+    """
+    manager = ConversationManager()
+    manager.backend = backend
+    # Each simulated candidate should reach the backend unless the cache or bank is under test
+    manager.use_question_cache = use_question_cache
+    manager.use_question_bank = use_question_bank
+    turns = []
+
+    for user_input in candidate_script(number):
+        state = manager.state
+        started = time.perf_counter()
+        if stream:
+            for _ in manager.process_input_stream(user_input):
+                pass
+        else:
+            manager.process_input(user_input)
+        turns.append((state, time.perf_counter() - started))
+        if think_seconds:
+            time.sleep(think_seconds)
+
+    return {"turns": turns, "completed": not manager.is_active, "final_state": manager.state, "manager": manager}
+
+
+def measure_session_memory(sessions: int, stream: bool, **session_options: bool) -> float:
+    """
+    Measure the memory retained by finished sessions, traced separately from timed runs.
+
+    Args:
+        sessions: Number of sessions to keep alive while measuring
+        stream: Whether sessions use the streaming path
+        **session_options: use_question_cache/use_question_bank, as for run_session
+
+    Returns:
+        float: Retained bytes per session
+    """
+    backend = SimulatedBackend(latency_ms=0)
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        kept = [run_session(backend, number, stream, **session_options)["manager"] for number in range(sessions)]
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    del kept
+    return retained / sessions
+
+
+def coalesced_llm_requests() -> int:
+    """Total LLM requests so far that shared an identical in-flight request."""
+    return int(sum(chatbot._llm_coalesced.value(mode=mode) for mode in ("sync", "stream", "async")))
+
+
+def run_level(concurrency: int, sessions: int, backend: LLMBackend,
+              stream: bool, think_seconds: float, **session_options: bool) -> Dict[str, Any]:
+    """
+    Run a batch of sessions at a fixed concurrency.
+
+    Args:
+        concurrency: Number of candidates active at once
+        sessions: Total sessions to run
+        backend: Shared simulated backend, possibly hedged
+        stream: Use the streaming path
+        think_seconds: Pause between turns
+        **session_options: use_question_cache/use_question_bank, as for run_session
+
+    Returns:
+        Dict: Latency percentiles, throughput and error counts for the level
+    """
+    simulated = backend.primary if isinstance(backend, HedgedBackend) else backend
+    fallback = backend.fallback if isinstance(backend, HedgedBackend) else None
+    requests_before, errors_before = simulated.requests, simulated.errors
+    hedges_before = fallback.requests if fallback else 0
+    coalesced_before = coalesced_llm_requests()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(
+            lambda number: run_session(backend, number, stream, think_seconds, **session_options), range(sessions)
+        ))
+    elapsed = time.perf_counter() - started
+
+    latencies = [seconds for result in results for _, seconds in result["turns"]]
+    llm_latencies = [
+        seconds for result in results for state, seconds in result["turns"] if state == "confirming_info"
+    ]
+
+    return {
+        "concurrency": concurrency,
+        "sessions": sessions,
+        "completed": sum(1 for result in results if result["completed"]),
+        "wall_seconds": elapsed,
+        "sessions_per_second": sessions / elapsed,
+        "turns_per_second": len(latencies) / elapsed,
+        "turn_p50_ms": percentile(latencies, 50) * 1000,
+        "turn_p95_ms": percentile(latencies, 95) * 1000,
+        "turn_p99_ms": percentile(latencies, 99) * 1000,
+        "llm_turn_p50_ms": percentile(llm_latencies, 50) * 1000,
+        "llm_turn_p95_ms": percentile(llm_latencies, 95) * 1000,
+        "llm_turn_p99_ms": percentile(llm_latencies, 99) * 1000,
+        "llm_requests": simulated.requests - requests_before,
+        "llm_errors": simulated.errors - errors_before,
+        "llm_hedges": (fallback.requests if fallback else 0) - hedges_before,
+        "llm_coalesced": coalesced_llm_requests() - coalesced_before
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test ConversationManager with a simulated Gemini backend.")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--sessions", type=int, help="Sessions per level (defaults to 4x the concurrency)")
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="Mean simulated LLM latency")
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability a simulated LLM request fails")
+    parser.add_argument("--rpm", type=float, help="Requests-per-minute quota to enforce on the simulated model")
+    parser.add_argument("--tpm", type=float, help="Tokens-per-minute quota to enforce on the simulated model")
+    parser.add_argument("--hedge-latency-ms", type=float,
+                        help="Hedge slow requests to a simulated fallback model with this fixed latency")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Pause between a candidate's turns")
+    parser.add_argument("--stream", action="store_true", help="Consume responses through process_input_stream")
+    parser.add_argument("--question-cache", action="store_true", help="Serve repeated tech stacks from the question cache")
+    parser.add_argument("--question-bank", action="store_true", help="Assemble questions from the pre-generated question bank")
+    parser.add_argument("--memory-sessions", type=int, default=50, help="Sessions kept alive to measure memory (0 skips)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--verbose", action="store_true", help="Show the manager's debug output")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    session_options = {"use_question_cache": args.question_cache, "use_question_bank": args.question_bank}
+    # Simulated questions are kept in memory, away from the cache serving live candidates
+    set_question_cache(QuestionCache())
+
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    backend = SimulatedBackend(args.latency_ms, args.latency_dist, args.error_rate, args.seed)
+    if args.rpm or args.tpm:
+        # Queue requests through the shared scheduler as if the simulated model had a Gemini quota
+        backend.rate_limited = True
+        set_rate_scheduler(RateScheduler(args.rpm, args.tpm))
+    if args.hedge_latency_ms is not None:
+        fallback = SimulatedBackend(args.hedge_latency_ms, "fixed", args.error_rate, args.seed)
+        fallback.rate_limited = backend.rate_limited
+        backend = HedgedBackend(backend, fallback, "simulated", "simulated-fallback")
+    report = {"latency_ms": args.latency_ms, "latency_dist": args.latency_dist,
+              "error_rate": args.error_rate, "stream": args.stream, "levels": []}
+
+    with open(os.devnull, "w") as devnull, contextlib.ExitStack() as stack:
+        if not args.verbose:
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+        for concurrency in levels:
+            sessions = args.sessions or concurrency * 4
+            report["levels"].append(run_level(concurrency, sessions, backend, args.stream, args.think_ms / 1000,
+                                              **session_options))
+        if args.memory_sessions:
+            report["bytes_per_session"] = measure_session_memory(args.memory_sessions, args.stream,
+                                                                 **session_options)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Simulated LLM: {args.latency_dist} latency, mean {args.latency_ms:.0f} ms, error rate {args.error_rate:.1%}")
+    print(f"{'conc':>5} {'sessions':>8} {'sess/s':>8} {'turns/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'llm p99':>8} {'errors':>6} {'shared':>6} {'hedged':>6}")
+    for level in report["levels"]:
+        print(f"{level['concurrency']:>5} {level['sessions']:>8} {level['sessions_per_second']:>8.2f} "
+              f"{level['turns_per_second']:>8.1f} {level['turn_p50_ms']:>8.2f} {level['turn_p95_ms']:>8.1f} "
+              f"{level['turn_p99_ms']:>8.1f} {level['llm_turn_p99_ms']:>8.1f} {level['llm_errors']:>6} "
+              f"{level['llm_coalesced']:>6} {level['llm_hedges']:>6}")
+    if "bytes_per_session" in report:
+        print(f"Memory retained per finished session: {report['bytes_per_session'] / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Migrate saved candidate JSON files into the SQLite candidate store.
+
+Usage:
+    python migrate_user_data.py [--source user_data] [--db user_data/candidates.db] [--batch-size 500]
+
+Files that were already migrated are skipped, so the tool can be re-run safely.
+"""
+import argparse
+import json
+import os
+import sys
+
+from config import USER_DATA_DIR, SQLITE_DB_PATH
+from storage import JSONFileStore, SQLiteStore
+
+
+def migrate(source_dir: str, db_path: str, batch_size: int = 500) -> dict:
+    """
+    Ingest every JSON file from a directory into a SQLite store.
+
+    Args:
+        source_dir: Directory containing the JSON files written by the JSON backend
+        db_path: SQLite database to write to
+        batch_size: Number of records written per transaction
+
+    Returns:
+        dict: Counts of files read, records written, files already migrated and files that failed to parse
+    """
+    json_store = JSONFileStore(source_dir)
+    sqlite_store = SQLiteStore(db_path)
+    stats = {"files": 0, "migrated": 0, "skipped": 0, "failed": 0}
+    already_migrated = sqlite_store.list_sources()
+
+    batch, sources = [], []
+
+    def flush():
+        if batch:
+            sqlite_store.save_many(batch, sources=sources)
+            stats["migrated"] += len(batch)
+            batch.clear()
+            sources.clear()
+
+    try:
+        for path in json_store.list_ids():
+            stats["files"] += 1
+            if os.path.basename(path) in already_migrated:
+                stats["skipped"] += 1
+                continue
+            record = json_store.get_candidate(path)
+            if not isinstance(record, dict):
+                print(f"Skipping unreadable file: {path}", file=sys.stderr)
+                stats["failed"] += 1
+                continue
+            batch.append((record, json_store.get_transcript(path)))
+            sources.append(os.path.basename(path))
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    finally:
+        sqlite_store.close()
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate user_data/*.json into the SQLite candidate store.")
+    parser.add_argument("--source", default=USER_DATA_DIR, help="Directory with candidate JSON files")
+    parser.add_argument("--db", default=SQLITE_DB_PATH, help="SQLite database path")
+    parser.add_argument("--batch-size", type=int, default=500, help="Records per transaction")
+    args = parser.parse_args()
+
+    stats = migrate(args.source, args.db, args.batch_size)
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+Pre-generated technical question bank for the TalentScout Hiring Assistant.
+
+Usage:
+    python question_bank.py build --tech python --tech aws --per-difficulty 5
+    python question_bank.py build --all --backend gemini --workers 4
+    python question_bank.py stats
+
+The bank stores questions per canonical technology and difficulty. At runtime
+ConversationManager assembles a candidate's questions from it locally and only
+asks the LLM about technologies the bank doesn't cover.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config import (
+    QUESTION_BANK_PATH,
+    QUESTION_BANK_PROMPT,
+    QUESTION_DIFFICULTIES,
+    QUESTION_REPAIR_PROMPT,
+    QUESTION_COUNT_MIN,
+    QUESTION_COUNT_MAX,
+    TECH_ALIASES,
+    VALID_TECHNOLOGIES
+)
+from concurrency import PRIORITY_BATCH
+from utils import canonicalize_tech, estimate_tokens, parse_question_json
+
+# Difficulty picked for a technology's 1st, 2nd, 3rd... question, so one question
+# is mid-level and more questions spread towards both ends
+DIFFICULTY_ORDER = ["intermediate", "advanced", "basic"]
+
+
+class QuestionBank:
+    """
+    Questions grouped by canonical technology and difficulty.
+
+    Layout: {technology: {difficulty: [{"question", "technology", "difficulty"}, ...]}}.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the bank, loading the persisted copy if one exists.
+
+        Args:
+            path: JSON file used by save() and load() (None keeps the bank in memory)
+        """
+        self.path = path
+        self._questions: Dict[str, Dict[str, List[Dict[str, str]]]] = {}
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    def __len__(self) -> int:
+        return sum(len(items) for levels in self._questions.values() for items in levels.values())
+
+    def technologies(self) -> List[str]:
+        """Canonical technologies with at least one question."""
+        return sorted(tech for tech, levels in self._questions.items() if any(levels.values()))
+
+    def covers(self, tech: str) -> bool:
+        """
+        Check whether the bank has questions for a technology.
+
+        Args:
+            tech: Technology name as entered by the candidate
+
+        Returns:
+            bool: True if any question is stored for its canonical name
+        """
+        levels = self._questions.get(canonicalize_tech(tech, TECH_ALIASES))
+        return bool(levels) and any(levels.values())
+
+    def add(self, tech: str, questions: Sequence[Dict[str, str]]) -> int:
+        """
+        Add questions for a technology, skipping ones already stored.
+
+        Args:
+            tech: Technology the questions assess
+            questions: Validated question dicts with a "difficulty"
+
+        Returns:
+            int: Number of questions added
+        """
+        tech = canonicalize_tech(tech, TECH_ALIASES)
+        added = 0
+        with self._lock:
+            levels = self._questions.setdefault(tech, {})
+            for question in questions:
+                bucket = levels.setdefault(question["difficulty"], [])
+                text = " ".join(question["question"].lower().split())
+                if any(" ".join(existing["question"].lower().split()) == text for existing in bucket):
+                    continue
+                bucket.append({"question": question["question"], "technology": tech,
+                               "difficulty": question["difficulty"]})
+                added += 1
+        return added
+
+    def assemble(self, tech_stack: List[str], rng: Optional[random.Random] = None) -> Tuple[List[Dict[str, str]], List[str]]:
+        """
+        Pick questions for a candidate from the bank.
+
+        Technologies listed earlier are treated as the candidate's primary ones:
+        every technology gets a slot while slots last, and the remaining slots go
+        to technologies in proportion to 1/rank.
+
+        Args:
+            tech_stack: Technologies in the order the candidate listed them
+            rng: Random source used to pick among stored questions
+
+        Returns:
+            Tuple: (questions for covered technologies, technologies the bank doesn't cover)
+        """
+        rng = rng or random
+        # Canonical name -> spelling the candidate used, which uncovered technologies keep
+        stack: Dict[str, str] = {}
+        for tech in tech_stack:
+            canonical = canonicalize_tech(tech, TECH_ALIASES)
+            if canonical and canonical not in stack:
+                stack[canonical] = tech
+
+        total = min(QUESTION_COUNT_MAX, max(QUESTION_COUNT_MIN, len(stack)))
+        slots = self._allocate(len(stack), total)
+
+        questions = []
+        uncovered = []
+        for (tech, original), count in zip(stack.items(), slots):
+            if not self.covers(tech):
+                uncovered.append(original)
+                continue
+            questions.extend(self._pick(tech, count, rng))
+        return questions, uncovered
+
+    @staticmethod
+    def _allocate(count: int, total: int) -> List[int]:
+        """Split `total` question slots over `count` technologies ranked by priority."""
+        slots = [0] * count
+        for position in range(min(count, total)):
+            slots[position] = 1
+        for _ in range(total - sum(slots)):
+            # Give the next slot to the technology furthest below its 1/rank share
+            best = max(range(count), key=lambda position: 1 / (position + 1) / (slots[position] + 1))
+            slots[best] += 1
+        return slots
+
+    def _pick(self, tech: str, count: int, rng: Any) -> List[Dict[str, str]]:
+        """Pick `count` distinct questions for a technology, spreading difficulties."""
+        levels = self._questions.get(tech, {})
+        pools = {difficulty: list(items) for difficulty, items in levels.items() if items}
+        picked = []
+        for position in range(count):
+            wanted = DIFFICULTY_ORDER[position % len(DIFFICULTY_ORDER)]
+            # Fall back to the closest difficulty that still has questions left
+            order = sorted(QUESTION_DIFFICULTIES, key=lambda level: abs(
+                QUESTION_DIFFICULTIES.index(level) - QUESTION_DIFFICULTIES.index(wanted)
+            ))
+            difficulty = next((level for level in order if pools.get(level)), None)
+            if difficulty is None:
+                break
+            pool = pools[difficulty]
+            picked.append(dict(pool.pop(rng.randrange(len(pool)))))
+        # Present easier questions first
+        picked.sort(key=lambda question: QUESTION_DIFFICULTIES.index(question["difficulty"])
+                    if question["difficulty"] in QUESTION_DIFFICULTIES else 0)
+        return picked
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Count stored questions.
+
+        Returns:
+            Dict: {technology: {difficulty: count}}
+        """
+        return {
+            tech: {difficulty: len(items) for difficulty, items in levels.items()}
+            for tech, levels in sorted(self._questions.items())
+        }
+
+    def save(self) -> None:
+        """Atomically write the bank to its path."""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"technologies": self._questions}, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def load(self) -> None:
+        """Load the bank from its path, ignoring a missing or corrupt file."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self._questions = json.load(f).get("technologies", {})
+        except (OSError, ValueError) as e:
+            print(f"Question bank could not be loaded from {self.path}: {e}")
+            self._questions = {}
+
+
+_shared_bank: Optional[QuestionBank] = None
+_shared_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    """
+    Get the process-wide question bank loaded from QUESTION_BANK_PATH.
+
+    Returns:
+        QuestionBank: Shared bank
+    """
+    global _shared_bank
+    with _shared_bank_lock:
+        if _shared_bank is None:
+            _shared_bank = QuestionBank(QUESTION_BANK_PATH)
+        return _shared_bank
+
+
+def _generate(backend: Any, prompt: str) -> str:
+    """Send a prompt at batch priority, behind any live interviews sharing the quota."""
+    if backend.rate_limited:
+        from llm_backends import get_rate_scheduler
+        get_rate_scheduler().acquire(estimate_tokens(prompt), PRIORITY_BATCH)
+    return backend.generate(prompt)
+
+
+def generate_for_technology(backend: Any, tech: str, per_difficulty: int) -> List[Dict[str, str]]:
+    """
+    Ask the LLM for a technology's questions at every difficulty.
+
+    Args:
+        backend: LLMBackend used for generation
+        tech: Technology to generate questions for
+        per_difficulty: Questions wanted per difficulty level
+
+    Returns:
+        List[Dict[str, str]]: Validated questions (empty if generation failed)
+    """
+    prompt = QUESTION_BANK_PROMPT.format(technology=tech, count=per_difficulty)
+    response = _generate(backend, prompt)
+    try:
+        return parse_question_json(response, QUESTION_DIFFICULTIES)
+    except ValueError as e:
+        repaired = _generate(backend, QUESTION_REPAIR_PROMPT.format(error=e, response=response[:4000]))
+        try:
+            return parse_question_json(repaired, QUESTION_DIFFICULTIES)
+        except ValueError as e:
+            print(f"Skipping {tech}: {e}")
+            return []
+
+
+def build(bank: QuestionBank, techs: List[str], backend: Any, per_difficulty: int = 5,
+          workers: int = 4, skip_covered: bool = True) -> Dict[str, int]:
+    """
+    Generate questions for several technologies and add them to the bank.
+
+    Args:
+        bank: Bank to extend (saved after every technology)
+        techs: Technologies to generate questions for
+        backend: LLMBackend used for generation
+        per_difficulty: Questions wanted per difficulty level
+        workers: Concurrent LLM requests
+        skip_covered: Leave technologies that already have questions alone
+
+    Returns:
+        Dict[str, int]: Questions added per technology
+    """
+    todo = []
+    for tech in techs:
+        canonical = canonicalize_tech(tech, TECH_ALIASES)
+        if canonical not in todo and not (skip_covered and bank.covers(canonical)):
+            todo.append(canonical)
+
+    def build_one(tech: str) -> Tuple[str, int]:
+        try:
+            questions = generate_for_technology(backend, tech, per_difficulty)
+        except Exception as e:
+            print(f"Skipping {tech}: {e}")
+            return tech, 0
+        added = bank.add(tech, questions)
+        bank.save()
+        print(f"{tech}: {added} questions added")
+        return tech, added
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return dict(pool.map(build_one, todo))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect the pre-generated question bank.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Generate questions with the LLM")
+    build_parser.add_argument("--tech", action="append", default=[], help="Technology to cover (repeatable)")
+    build_parser.add_argument("--all", action="store_true", help="Cover every technology in VALID_TECHNOLOGIES")
+    build_parser.add_argument("--per-difficulty", type=int, default=5)
+    build_parser.add_argument("--workers", type=int, default=4)
+    build_parser.add_argument("--backend", choices=["gemini", "replay", "record"], help="LLM backend (defaults to LLM_BACKEND)")
+    build_parser.add_argument("--refresh", action="store_true", help="Also add questions for technologies already covered")
+    build_parser.add_argument("--path", default=QUESTION_BANK_PATH)
+
+    stats_parser = subparsers.add_parser("stats", help="Show question counts per technology")
+    stats_parser.add_argument("--path", default=QUESTION_BANK_PATH)
+    args = parser.parse_args()
+
+    bank = QuestionBank(args.path)
+    if args.command == "stats":
+        for tech, levels in bank.stats().items():
+            counts = ", ".join(f"{difficulty} {levels.get(difficulty, 0)}" for difficulty in QUESTION_DIFFICULTIES)
+            print(f"{tech:<24} {counts}")
+        print(f"{len(bank)} questions for {len(bank.technologies())} technologies")
+        return
+
+    from llm_backends import create_llm_backend, get_llm_backend
+
+    techs = list(VALID_TECHNOLOGIES) if args.all else args.tech
+    if not techs:
+        build_parser.error("pass --tech or --all")
+    backend = create_llm_backend(args.backend) if args.backend else get_llm_backend()
+    if backend.cache_scope is not None and args.path == QUESTION_BANK_PATH:
+        build_parser.error(f"the {backend.name} backend would fill the live question bank; pass --path")
+    added = build(bank, techs, backend, args.per_difficulty, args.workers, skip_covered=not args.refresh)
+    print(f"Added {sum(added.values())} questions; the bank now holds {len(bank)}")
+
+
+if __name__ == "__main__":
+    main()
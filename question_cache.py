@@ -0,0 +1,286 @@
+"""
+Technical question cache for the TalentScout Hiring Assistant.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from config import (
+    QUESTION_CACHE_PATH,
+    QUESTION_CACHE_MAX_ENTRIES,
+    QUESTION_CACHE_TTL_SECONDS,
+    QUESTION_CACHE_ROTATE_AFTER
+)
+from utils import normalize_tech_stack
+
+
+def make_cache_key(tech_stack: List[str], namespace: str = "questions") -> str:
+    """
+    Build an order-independent cache key for a tech stack.
+
+    Args:
+        tech_stack: List of technologies declared by the candidate
+        namespace: Prefix separating different kinds of cached payloads
+
+    Returns:
+        str: Cache key such as "questions:aws,django,python"
+    """
+    return f"{namespace}:{','.join(normalize_tech_stack(tech_stack))}"
+
+
+class QuestionCache:
+    """
+    LRU cache with TTL and hit-based rotation, optionally backed by a JSON file.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 256,
+        ttl_seconds: float = 0,
+        rotate_after: int = 0
+    ):
+        """
+        Initialize the cache and load any persisted entries.
+
+        Args:
+            path: JSON file used to persist entries across restarts (None keeps it in memory)
+            max_entries: Maximum number of entries before least recently used ones are evicted
+            ttl_seconds: Age after which an entry expires (0 disables expiry)
+            rotate_after: Number of hits after which an entry is dropped (0 disables rotation)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.rotate_after = rotate_after
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters exposed through stats()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.rotations = 0
+        self.saved_seconds = 0.0
+
+        self._load()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key built with make_cache_key
+
+        Returns:
+            Optional[Any]: Cached value, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if self.ttl_seconds and time.time() - entry["created"] > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                self._save()
+                return None
+
+            self._entries.move_to_end(key)
+            entry["hits"] += 1
+            self.hits += 1
+            self.saved_seconds += entry.get("latency", 0.0)
+            value = entry["value"]
+
+            # Rotate popular entries so that candidates don't all see identical questions
+            if self.rotate_after and entry["hits"] >= self.rotate_after:
+                del self._entries[key]
+                self.rotations += 1
+                self._save()
+
+            return value
+
+    def put(self, key: str, value: Any, latency: float = 0.0) -> None:
+        """
+        Store a value in the cache.
+
+        Args:
+            key: Cache key built with make_cache_key
+            value: JSON-serializable value to store
+            latency: Seconds it took to produce the value, used to report time saved
+        """
+        with self._lock:
+            self._entries[key] = {
+                "value": value,
+                "created": time.time(),
+                "hits": 0,
+                "latency": latency
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._save()
+
+    def put_many(self, values: Dict[str, Any], latency: float = 0.0) -> None:
+        """
+        Store several values, writing the cache file once.
+
+        Args:
+            values: {cache key: JSON-serializable value}
+            latency: Seconds it took to produce each value, used to report time saved
+        """
+        if not values:
+            return
+        with self._lock:
+            created = time.time()
+            for key, value in values.items():
+                self._entries[key] = {"value": value, "created": created, "hits": 0, "latency": latency}
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._save()
+
+    def merge_file(self, path: str) -> int:
+        """
+        Add the entries persisted by another cache, keeping the newer entry for keys in both.
+
+        Args:
+            path: JSON file written by another QuestionCache
+
+        Returns:
+            int: Number of entries added or replaced
+        """
+        merged = 0
+        with self._lock:
+            for key, entry in self._read_entries(path):
+                current = self._entries.get(key)
+                if current is not None and current["created"] >= entry["created"]:
+                    continue
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                merged += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            if merged:
+                self._save()
+        return merged
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._save()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict: Hit/miss counters, current size and estimated LLM seconds saved
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "rotations": self.rotations,
+                "saved_seconds": round(self.saved_seconds, 3)
+            }
+
+    @staticmethod
+    def _read_entries(path: str) -> List[Any]:
+        """Read the [key, entry] pairs of a cache file, ignoring a missing or corrupt file."""
+        if not os.path.exists(path):
+            return []
+        try:
+            with open(path, 'r') as f:
+                return json.load(f).get("entries", [])
+        except (OSError, ValueError) as e:
+            print(f"Question cache could not be loaded from {path}: {e}")
+            return []
+
+    def _load(self) -> None:
+        """Load persisted entries from disk, ignoring a missing or corrupt file."""
+        if not self.path:
+            return
+        for key, entry in self._read_entries(self.path):
+            self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self) -> None:
+        """Atomically write the entries to disk. Must be called with the lock held."""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"entries": list(self._entries.items())}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Question cache could not be saved to {self.path}: {e}")
+
+
+_shared_cache: Optional[QuestionCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_question_cache() -> QuestionCache:
+    """
+    Get the process-wide question cache configured from config.py.
+
+    Returns:
+        QuestionCache: Shared cache instance
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = create_question_cache()
+        return _shared_cache
+
+
+def create_question_cache(path: Optional[str] = QUESTION_CACHE_PATH) -> QuestionCache:
+    """
+    Create a question cache with the limits configured in config.py.
+
+    Args:
+        path: JSON file backing the cache (None keeps it in memory)
+
+    Returns:
+        QuestionCache: New cache instance
+    """
+    return QuestionCache(
+        path=path,
+        max_entries=QUESTION_CACHE_MAX_ENTRIES,
+        ttl_seconds=QUESTION_CACHE_TTL_SECONDS,
+        rotate_after=QUESTION_CACHE_ROTATE_AFTER
+    )
+
+
+def set_question_cache(cache: Optional[QuestionCache]) -> None:
+    """
+    Replace the process-wide question cache, e.g. with a scratch cache for batch runs.
+
+    Args:
+        cache: Cache to use from now on (None recreates the configured one on next use)
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        _shared_cache = cache
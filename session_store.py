@@ -0,0 +1,310 @@
+"""
+Interview snapshot storage for the TalentScout Hiring Assistant.
+
+A snapshot holds everything needed to continue an interview: the
+ConversationManager state and the app's session keys. Snapshots are stored
+under a random session token, so a restarted worker or another node behind
+the load balancer can pick the interview up where it stopped.
+"""
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from config import SESSION_STORE_BACKEND, SESSION_DB_PATH, SESSION_REDIS_URL, SESSION_TTL_SECONDS
+from metrics import get_metrics_registry
+
+# Bumped whenever the snapshot layout changes; older snapshots are ignored
+SNAPSHOT_VERSION = 2
+
+# Key prefix for snapshots in Redis-compatible stores
+REDIS_KEY_PREFIX = "talentscout:session:"
+
+_snapshots_ignored = get_metrics_registry().counter(
+    "talentscout_session_snapshots_ignored_total", "Stored snapshots that could not be restored", ["reason"]
+)
+
+
+def new_session_token() -> str:
+    """Create a random, URL-safe session token."""
+    return secrets.token_urlsafe(16)
+
+
+def encode_snapshot(snapshot: Dict[str, Any]) -> bytes:
+    """
+    Serialize a snapshot as compressed, versioned JSON.
+
+    Args:
+        snapshot: JSON-serializable session state
+
+    Returns:
+        bytes: Encoded snapshot
+    """
+    payload = json.dumps({"v": SNAPSHOT_VERSION, "data": snapshot}, separators=(",", ":"))
+    return zlib.compress(payload.encode("utf-8"))
+
+
+def decode_snapshot(blob: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Deserialize a snapshot written by encode_snapshot.
+
+    Args:
+        blob: Encoded snapshot
+
+    Returns:
+        Optional[Dict]: Session state, or None if the blob is corrupt or from another version
+    """
+    try:
+        payload = json.loads(zlib.decompress(blob).decode("utf-8"))
+    except (zlib.error, UnicodeDecodeError, ValueError):
+        _snapshots_ignored.inc(reason="corrupt")
+        return None
+    if not isinstance(payload, dict) or payload.get("v") != SNAPSHOT_VERSION:
+        _snapshots_ignored.inc(reason="version")
+        return None
+    return payload.get("data")
+
+
+class SessionStore:
+    """
+    Base class for session snapshot stores.
+
+    Stores hold opaque encoded snapshots; save() and load() handle encoding.
+    """
+
+    def get(self, token: str) -> Optional[bytes]:
+        """
+        Read the encoded snapshot stored under a token.
+
+        Args:
+            token: Session token
+
+        Returns:
+            Optional[bytes]: The snapshot, or None if missing or expired
+        """
+        raise NotImplementedError
+
+    def put(self, token: str, blob: bytes) -> None:
+        """
+        Store an encoded snapshot under a token, restarting its TTL.
+
+        Args:
+            token: Session token
+            blob: Encoded snapshot
+        """
+        raise NotImplementedError
+
+    def delete(self, token: str) -> None:
+        """
+        Remove the snapshot stored under a token.
+
+        Args:
+            token: Session token
+        """
+        raise NotImplementedError
+
+    def save(self, token: str, snapshot: Dict[str, Any]) -> int:
+        """
+        Encode and store a snapshot.
+
+        Args:
+            token: Session token
+            snapshot: JSON-serializable session state
+
+        Returns:
+            int: Size of the stored snapshot in bytes
+        """
+        blob = encode_snapshot(snapshot)
+        self.put(token, blob)
+        return len(blob)
+
+    def load(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Read and decode a snapshot.
+
+        Args:
+            token: Session token
+
+        Returns:
+            Optional[Dict]: Session state, or None if there is no usable snapshot
+        """
+        blob = self.get(token)
+        return decode_snapshot(blob) if blob is not None else None
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Stores snapshots in a local SQLite database in WAL mode.
+    Suitable for a single node, where it survives worker restarts.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sessions (
+        token TEXT PRIMARY KEY,
+        data BLOB NOT NULL,
+        updated_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions(updated_at);
+    """
+
+    # Expired snapshots are purged once every this many writes
+    PURGE_EVERY = 100
+
+    def __init__(self, db_path: str = SESSION_DB_PATH, ttl_seconds: float = SESSION_TTL_SECONDS):
+        """
+        Open (and if needed create) the database.
+
+        Args:
+            db_path: Path of the SQLite database file
+            ttl_seconds: Age after which an untouched snapshot expires
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Streamlit serves sessions from several threads; a lock serializes access
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def get(self, token: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM sessions WHERE token = ? AND updated_at >= ?",
+                (token, time.time() - self.ttl_seconds)
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def put(self, token: str, blob: bytes) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sessions (token, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(token) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (token, sqlite3.Binary(blob), now)
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (now - self.ttl_seconds,))
+
+    def delete(self, token: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class MemoryKV:
+    """
+    In-process stand-in for the subset of the Redis client API used by
+    RedisSessionStore (get, set with ex, delete). Handy for development and
+    single-process deployments that don't run Redis.
+    """
+
+    def __init__(self):
+        """Initialize an empty key-value store."""
+        self._items: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.time():
+                del self._items[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ex: Optional[float] = None) -> bool:
+        with self._lock:
+            self._items[key] = (value, time.time() + ex if ex else None)
+        return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self._items.pop(key, None) is not None for key in keys)
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Stores snapshots in Redis (or any client with the same get/set/delete API),
+    so every node behind the load balancer sees the same sessions.
+    """
+
+    def __init__(self, client: Any, ttl_seconds: float = SESSION_TTL_SECONDS):
+        """
+        Initialize the store.
+
+        Args:
+            client: redis.Redis instance, or a MemoryKV
+            ttl_seconds: Age after which an untouched snapshot expires
+        """
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, token: str) -> Optional[bytes]:
+        return self.client.get(REDIS_KEY_PREFIX + token)
+
+    def put(self, token: str, blob: bytes) -> None:
+        self.client.set(REDIS_KEY_PREFIX + token, blob, ex=int(self.ttl_seconds))
+
+    def delete(self, token: str) -> None:
+        self.client.delete(REDIS_KEY_PREFIX + token)
+
+
+def create_session_store(backend: Optional[str] = SESSION_STORE_BACKEND) -> Optional[SessionStore]:
+    """
+    Create a session store by name.
+
+    Args:
+        backend: "sqlite", "redis", "memory", or None to disable resuming
+
+    Returns:
+        Optional[SessionStore]: The store instance, or None when disabled
+    """
+    if backend is None:
+        return None
+    elif backend == "sqlite":
+        return SQLiteSessionStore(SESSION_DB_PATH)
+    elif backend == "memory":
+        return RedisSessionStore(MemoryKV())
+    elif backend == "redis":
+        import redis
+        return RedisSessionStore(redis.Redis.from_url(SESSION_REDIS_URL))
+    raise ValueError(f"Unknown session store backend: {backend}")
+
+
+_shared_store: Optional[SessionStore] = None
+_shared_store_created = False
+_shared_store_lock = threading.Lock()
+
+
+def get_session_store() -> Optional[SessionStore]:
+    """
+    Get the process-wide session store selected by SESSION_STORE_BACKEND.
+
+    Returns:
+        Optional[SessionStore]: Shared store, or None when resuming is disabled
+    """
+    global _shared_store, _shared_store_created
+    with _shared_store_lock:
+        if not _shared_store_created:
+            _shared_store = create_session_store()
+            _shared_store_created = True
+        return _shared_store
@@ -0,0 +1,602 @@
+"""
+Candidate storage backends for the TalentScout Hiring Assistant.
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import STORAGE_BACKEND, USER_DATA_DIR, SQLITE_DB_PATH
+
+# Candidate fields stored in their own columns by SQLiteStore; anything else goes to `extra`
+CANDIDATE_COLUMNS = [
+    "name", "email", "phone", "experience", "position", "location",
+    "submission_time", "interview_status"
+]
+
+# (record, transcript) pair accepted by save_many
+CandidateItem = Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]]]
+
+
+class CandidateStore:
+    """
+    Base class for candidate storage backends.
+
+    Records use the same shape as the JSON files written by the app: flat
+    candidate fields, a `tech_stack` list and a `technical_responses` dict of
+    {"question_N": {"question": ..., "answer": ...}}.
+    """
+
+    def save_candidate(self, record: Dict[str, Any], transcript: Optional[List[Dict[str, Any]]] = None) -> str:
+        """
+        Save one candidate record.
+
+        Args:
+            record: Candidate data
+            transcript: Optional chat messages with role, content and timestamp
+
+        Returns:
+            str: Identifier of the saved record
+        """
+        return self.save_many([(record, transcript)])[0]
+
+    def save_many(self, items: Iterable[CandidateItem]) -> List[str]:
+        """
+        Save several candidate records in one batch.
+
+        Args:
+            items: (record, transcript) pairs
+
+        Returns:
+            List[str]: Identifiers of the saved records, in order
+        """
+        raise NotImplementedError
+
+    def get_candidate(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a single candidate record.
+
+        Args:
+            record_id: Identifier returned by save_candidate
+
+        Returns:
+            Optional[Dict]: The record, or None if it doesn't exist
+        """
+        raise NotImplementedError
+
+    def get_transcript(self, record_id: str) -> List[Dict[str, Any]]:
+        """
+        Load the chat transcript saved with a record.
+
+        Args:
+            record_id: Identifier returned by save_candidate
+
+        Returns:
+            List[Dict]: Messages with role, content and timestamp (empty if none was saved)
+        """
+        raise NotImplementedError
+
+    def save_scores(self, record_id: str, scores: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Add answer scores to the technical responses of a saved record.
+
+        Args:
+            record_id: Identifier returned by save_candidate
+            scores: {"question_N": {"score": ..., "rationale": ...}}
+        """
+        raise NotImplementedError
+
+    def list_ids(self) -> List[str]:
+        """
+        List the identifiers of all saved records without loading them.
+
+        Returns:
+            List[str]: Record identifiers
+        """
+        raise NotImplementedError
+
+    def list_versions(self) -> Dict[str, Any]:
+        """
+        Map every record id to a version that changes whenever the record is rewritten.
+
+        Returns:
+            Dict: {record id: version}; the default treats records as never changing
+        """
+        return {record_id: None for record_id in self.list_ids()}
+
+    def iter_candidates(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Lazily iterate over all saved records.
+
+        Yields:
+            Tuple: (record identifier, record)
+        """
+        for record_id in self.list_ids():
+            record = self.get_candidate(record_id)
+            if record is not None:
+                yield record_id, record
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class JSONFileStore(CandidateStore):
+    """
+    Stores one indented JSON file per save in a flat directory.
+    File names follow EMAIL_YYYYMMDD_HHMMSS.json, falling back to the name or "candidate".
+    Transcripts go to a file of the same name under transcripts/, so candidate
+    files keep the shape the app has always written.
+    """
+
+    # Subdirectory of data_dir holding the transcripts
+    TRANSCRIPT_DIR = "transcripts"
+
+    def __init__(self, data_dir: str = "user_data"):
+        """
+        Initialize the store.
+
+        Args:
+            data_dir: Directory holding the JSON files
+        """
+        self.data_dir = data_dir
+
+    def save_many(self, items: Iterable[CandidateItem]) -> List[str]:
+        # Create directory if it doesn't exist
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        paths = []
+        for record, transcript in items:
+            file_name = self._make_filename(record)
+            # The transcript is written first, so a visible candidate file always has its transcript
+            if transcript:
+                _write_json_atomic(os.path.join(self.data_dir, self.TRANSCRIPT_DIR, file_name), transcript)
+            file_path = os.path.join(self.data_dir, file_name)
+            _write_json_atomic(file_path, record)
+            paths.append(file_path)
+        return paths
+
+    def get_candidate(self, record_id: str) -> Optional[Dict[str, Any]]:
+        file_path = record_id if os.path.dirname(record_id) else os.path.join(self.data_dir, record_id)
+        try:
+            with open(file_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get_transcript(self, record_id: str) -> List[Dict[str, Any]]:
+        file_path = os.path.join(self.data_dir, self.TRANSCRIPT_DIR, os.path.basename(record_id))
+        try:
+            with open(file_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # Files written before transcripts moved out carry them inline
+            record = self.get_candidate(record_id)
+            return (record or {}).get("transcript") or []
+
+    def save_scores(self, record_id: str, scores: Dict[str, Dict[str, Any]]) -> None:
+        file_path = record_id if os.path.dirname(record_id) else os.path.join(self.data_dir, record_id)
+        record = self.get_candidate(file_path)
+        if record is None:
+            raise KeyError(record_id)
+        _merge_scores(record.get("technical_responses") or {}, scores)
+        _write_json_atomic(file_path, record)
+
+    def list_ids(self) -> List[str]:
+        if not os.path.isdir(self.data_dir):
+            return []
+        return sorted(
+            os.path.join(self.data_dir, name)
+            for name in os.listdir(self.data_dir)
+            if name.endswith(".json")
+        )
+
+    def list_versions(self) -> Dict[str, Any]:
+        # A resave under the same name or a score update replaces the file, changing its mtime
+        if not os.path.isdir(self.data_dir):
+            return {}
+        with os.scandir(self.data_dir) as entries:
+            return {
+                entry.path: entry.stat().st_mtime_ns
+                for entry in entries
+                if entry.name.endswith(".json") and entry.is_file()
+            }
+
+    def iter_candidates(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        # Scan the directory lazily so memory doesn't grow with the number of files
+        if not os.path.isdir(self.data_dir):
+            return
+        with os.scandir(self.data_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    record = self.get_candidate(entry.path)
+                    if record is not None:
+                        yield entry.path, record
+
+    @staticmethod
+    def _make_filename(record: Dict[str, Any]) -> str:
+        """
+        Build the file name for a record from its email, name or a timestamp.
+
+        Args:
+            record: Candidate data
+
+        Returns:
+            str: File name such as pavan@gmail.com_20250412_072201.json
+        """
+        submitted = record.get("submission_time")
+        try:
+            timestamp = datetime.strptime(submitted, "%Y-%m-%d %H:%M:%S") if submitted else datetime.now()
+        except ValueError:
+            timestamp = datetime.now()
+        # Format timestamp for filename: YYYYMMDD_HHMMSS
+        suffix = timestamp.strftime("%Y%m%d_%H%M%S")
+
+        if record.get("email"):
+            return f"{record['email'].lower()}_{suffix}.json"
+        elif record.get("name"):
+            # Fallback to name-based filename if email is not available
+            return f"{record['name'].lower().replace(' ', '_')}_{suffix}.json"
+        # Last resort fallback
+        return f"candidate_{suffix}.json"
+
+
+class SQLiteStore(CandidateStore):
+    """
+    Stores candidates, technical responses and transcripts in indexed SQLite tables.
+    The database runs in WAL mode so readers don't block the writer.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS candidates (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        email TEXT,
+        phone TEXT,
+        experience TEXT,
+        position TEXT,
+        location TEXT,
+        submission_time TEXT,
+        interview_status TEXT,
+        tech_stack TEXT NOT NULL DEFAULT '[]',
+        extra TEXT NOT NULL DEFAULT '{}',
+        source TEXT UNIQUE,
+        updated_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_candidates_email ON candidates(email);
+    CREATE INDEX IF NOT EXISTS idx_candidates_submission_time ON candidates(submission_time);
+    CREATE INDEX IF NOT EXISTS idx_candidates_status ON candidates(interview_status);
+
+    CREATE TABLE IF NOT EXISTS candidate_techs (
+        candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+        tech TEXT NOT NULL,
+        PRIMARY KEY (candidate_id, tech)
+    );
+    CREATE INDEX IF NOT EXISTS idx_candidate_techs_tech ON candidate_techs(tech);
+
+    CREATE TABLE IF NOT EXISTS technical_responses (
+        candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+        question_index INTEGER NOT NULL,
+        question TEXT,
+        answer TEXT,
+        score INTEGER,
+        rationale TEXT,
+        PRIMARY KEY (candidate_id, question_index)
+    );
+
+    CREATE TABLE IF NOT EXISTS transcripts (
+        candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        role TEXT NOT NULL,
+        content TEXT NOT NULL,
+        timestamp TEXT,
+        PRIMARY KEY (candidate_id, position)
+    );
+    """
+
+    def __init__(self, db_path: str = "user_data/candidates.db"):
+        """
+        Open (and if needed create) the database.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Streamlit serves sessions from several threads; a lock serializes access
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(self.SCHEMA)
+        # Databases created before answer scoring lack the score columns, and before
+        # change tracking the updated_at column
+        for table, column, kind in (("technical_responses", "score", "INTEGER"),
+                                    ("technical_responses", "rationale", "TEXT"),
+                                    ("candidates", "updated_at", "REAL")):
+            columns = {row["name"] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+
+    def save_many(self, items: Iterable[CandidateItem], sources: Optional[List[str]] = None) -> List[str]:
+        """
+        Save several candidate records in a single transaction.
+
+        Args:
+            items: (record, transcript) pairs
+            sources: Optional origin of each record (e.g. the JSON file it was migrated from);
+                records whose source is already stored are skipped
+
+        Returns:
+            List[str]: Identifiers of the saved (or already present) records, in order
+        """
+        items = list(items)
+        sources = sources or [None] * len(items)
+        record_ids = []
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for (record, transcript), source in zip(items, sources):
+                    if source is not None:
+                        existing = self._conn.execute(
+                            "SELECT id FROM candidates WHERE source = ?", (source,)
+                        ).fetchone()
+                        if existing:
+                            record_ids.append(str(existing["id"]))
+                            continue
+                    record_ids.append(str(self._insert(record, transcript, source)))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return record_ids
+
+    def _insert(self, record: Dict[str, Any], transcript: Optional[List[Dict[str, Any]]], source: Optional[str]) -> int:
+        """
+        Insert one record and its child rows. Must be called inside a transaction.
+
+        Returns:
+            int: The new candidate id
+        """
+        # Older records store the position under desired_position
+        values = dict(record)
+        if not values.get("position") and values.get("desired_position"):
+            values["position"] = values.pop("desired_position")
+
+        tech_stack = values.pop("tech_stack", None) or []
+        if isinstance(tech_stack, str):
+            tech_stack = [tech_stack]
+        responses = values.pop("technical_responses", None) or {}
+        values.pop("transcript", None)
+        extra = {key: value for key, value in values.items() if key not in CANDIDATE_COLUMNS}
+
+        cursor = self._conn.execute(
+            f"INSERT INTO candidates ({', '.join(CANDIDATE_COLUMNS)}, tech_stack, extra, source, updated_at) "
+            f"VALUES ({', '.join('?' * (len(CANDIDATE_COLUMNS) + 4))})",
+            [_to_text(values.get(column)) for column in CANDIDATE_COLUMNS]
+            + [json.dumps(tech_stack), json.dumps(extra), source, time.time()]
+        )
+        candidate_id = cursor.lastrowid
+
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO candidate_techs (candidate_id, tech) VALUES (?, ?)",
+            [(candidate_id, str(tech).strip().lower()) for tech in tech_stack if str(tech).strip()]
+        )
+        self._conn.executemany(
+            "INSERT INTO technical_responses (candidate_id, question_index, question, answer, score, rationale) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (candidate_id, index, response.get("question"), response.get("answer"),
+                 response.get("score"), response.get("rationale"))
+                for index, response in _iter_responses(responses)
+            ]
+        )
+        if transcript:
+            self._conn.executemany(
+                "INSERT INTO transcripts (candidate_id, position, role, content, timestamp) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (candidate_id, position, msg.get("role", ""), msg.get("content", ""), msg.get("timestamp"))
+                    for position, msg in enumerate(transcript)
+                ]
+            )
+        return candidate_id
+
+    def get_candidate(self, record_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM candidates WHERE id = ?", (int(record_id),)).fetchone()
+            if row is None:
+                return None
+            return self._row_to_record(row)
+
+    def save_scores(self, record_id: str, scores: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "UPDATE technical_responses SET score = ?, rationale = ? "
+                    "WHERE candidate_id = ? AND question_index = ?",
+                    [
+                        (score.get("score"), score.get("rationale"), int(record_id), index)
+                        for index, score in _iter_responses(scores)
+                    ]
+                )
+                self._conn.execute("UPDATE candidates SET updated_at = ? WHERE id = ?", (time.time(), int(record_id)))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_transcript(self, record_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT role, content, timestamp FROM transcripts WHERE candidate_id = ? ORDER BY position",
+                (int(record_id),)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def list_ids(self) -> List[str]:
+        with self._lock:
+            return [str(row[0]) for row in self._conn.execute("SELECT id FROM candidates ORDER BY id")]
+
+    def list_versions(self) -> Dict[str, Any]:
+        with self._lock:
+            return {str(row[0]): row[1] for row in self._conn.execute("SELECT id, updated_at FROM candidates")}
+
+    def list_sources(self) -> set:
+        """
+        Get the origins of records that were imported from elsewhere.
+
+        Returns:
+            set: Source names passed to save_many
+        """
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT source FROM candidates WHERE source IS NOT NULL")}
+
+    def iter_candidates(self, batch_size: int = 500) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        last_id = 0
+        while True:
+            # Page by primary key so the lock isn't held while the caller processes rows
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT * FROM candidates WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+                ).fetchall()
+                records = [(str(row["id"]), self._row_to_record(row)) for row in rows]
+            if not records:
+                return
+            yield from records
+            last_id = int(records[-1][0])
+
+    def _row_to_record(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """
+        Rebuild a JSON-shaped record from a candidates row. Must be called with the lock held.
+        """
+        record = {column: row[column] for column in CANDIDATE_COLUMNS if row[column] is not None}
+        record["tech_stack"] = json.loads(row["tech_stack"])
+        record.update(json.loads(row["extra"]))
+
+        responses = self._conn.execute(
+            "SELECT question_index, question, answer, score, rationale FROM technical_responses "
+            "WHERE candidate_id = ? ORDER BY question_index",
+            (row["id"],)
+        ).fetchall()
+        if responses:
+            record["technical_responses"] = {}
+            for response in responses:
+                entry = {"question": response["question"], "answer": response["answer"]}
+                if response["score"] is not None:
+                    entry["score"] = response["score"]
+                    entry["rationale"] = response["rationale"]
+                record["technical_responses"][f"question_{response['question_index']}"] = entry
+        return record
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _write_json_atomic(path: str, data: Any) -> None:
+    """
+    Write indented JSON through a temporary file and os.replace, so a reader or a
+    crash never leaves a half-written file behind.
+
+    Args:
+        path: Destination file
+        data: JSON-serializable data
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=4)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _to_text(value: Any) -> Optional[str]:
+    """Store scalars as text and anything else as JSON."""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return str(value)
+    return json.dumps(value)
+
+
+def _iter_responses(responses: Dict[str, Any]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Iterate over technical responses as (question number, response) pairs.
+
+    Args:
+        responses: {"question_N": {"question": ..., "answer": ...}} mapping
+    """
+    for position, (key, response) in enumerate(responses.items(), start=1):
+        try:
+            index = int(str(key).rsplit("_", 1)[-1])
+        except ValueError:
+            index = position
+        if isinstance(response, dict):
+            yield index, response
+        else:
+            yield index, {"question": None, "answer": response}
+
+
+def _merge_scores(responses: Dict[str, Any], scores: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Copy scores into technical responses, in place.
+
+    Args:
+        responses: {"question_N": {"question": ..., "answer": ...}} mapping
+        scores: {"question_N": {"score": ..., "rationale": ...}} mapping
+    """
+    for key, score in scores.items():
+        response = responses.get(key)
+        if isinstance(response, dict):
+            response["score"] = score.get("score")
+            response["rationale"] = score.get("rationale")
+
+
+_shared_store: Optional[CandidateStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def create_candidate_store(backend: str = STORAGE_BACKEND) -> CandidateStore:
+    """
+    Create a storage backend by name.
+
+    Args:
+        backend: "json" or "sqlite"
+
+    Returns:
+        CandidateStore: The backend instance
+    """
+    if backend == "json":
+        return JSONFileStore(USER_DATA_DIR)
+    elif backend == "sqlite":
+        return SQLiteStore(SQLITE_DB_PATH)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def get_candidate_store() -> CandidateStore:
+    """
+    Get the process-wide storage backend selected by STORAGE_BACKEND.
+
+    Returns:
+        CandidateStore: Shared backend instance
+    """
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = create_candidate_store()
+        return _shared_store
@@ -0,0 +1,118 @@
+"""
+Multi-pattern technology keyword matcher for the TalentScout Hiring Assistant.
+"""
+from typing import Dict, Iterable, List
+
+# Key marking the end of a term in a trie node
+_TERM = "\0"
+
+
+def _is_word_char(char: str) -> bool:
+    """
+    Check whether a character is part of a word, matching the regex \\w class.
+
+    Args:
+        char: Single character
+
+    Returns:
+        bool: True for letters, digits and underscores
+    """
+    return char.isalnum() or char == "_"
+
+
+class TechMatcher:
+    """
+    Finds every known technology in a text in a single left-to-right pass.
+
+    The vocabulary is compiled once into a character trie. Matching only starts
+    at word boundaries and a term only matches when it is not immediately followed
+    by a word character, so "java" does not match inside "javascript" while
+    "c++" and "c#" still match.
+    """
+
+    def __init__(self, vocabulary: Iterable[str]):
+        """
+        Compile the vocabulary into a trie.
+
+        Args:
+            vocabulary: Technology names to recognize (case-insensitive)
+        """
+        self._root: Dict[str, dict] = {}
+        self.terms: List[str] = []
+
+        for term in vocabulary:
+            term = term.lower().strip()
+            if not term:
+                continue
+            node = self._root
+            for char in term:
+                node = node.setdefault(char, {})
+            if _TERM not in node:
+                node[_TERM] = term
+                self.terms.append(term)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def find_all(self, text: str) -> List[str]:
+        """
+        Find all known technologies mentioned in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List[str]: Matched terms in order of first occurrence, without duplicates
+        """
+        text = text.lower()
+        length = len(text)
+        found: List[str] = []
+        seen = set()
+
+        for start in range(length):
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+
+            node = self._root
+            position = start
+            while position < length:
+                node = node.get(text[position])
+                if node is None:
+                    break
+                position += 1
+                term = node.get(_TERM)
+                if term is not None and term not in seen:
+                    if position == length or not _is_word_char(text[position]):
+                        seen.add(term)
+                        found.append(term)
+
+        return found
+
+    def contains_any(self, text: str) -> bool:
+        """
+        Check whether a text mentions at least one known technology.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            bool: True if any term matches
+        """
+        text = text.lower()
+        length = len(text)
+
+        for start in range(length):
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+
+            node = self._root
+            position = start
+            while position < length:
+                node = node.get(text[position])
+                if node is None:
+                    break
+                position += 1
+                if _TERM in node and (position == length or not _is_word_char(text[position])):
+                    return True
+
+        return False
@@ -0,0 +1,73 @@
+"""
+Shared pytest setup for the TalentScout Hiring Assistant.
+
+The modules live at the top level of the repository, like the benchmarks
+import them. Every test runs in its own working directory so relative paths
+from config.py (cache/, user_data/, fixtures/) never touch real files.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+class ScriptedBackend:
+    """
+    LLM backend answering one-off prompts from a list of scripted responses.
+
+    Strings are returned in order; exceptions in the list are raised instead.
+    Session requests are answered the same way.
+    """
+
+    name = "scripted"
+    rate_limited = False
+    cache_scope = "scripted"
+
+    def __init__(self, responses=None):
+        self.responses = list(responses or [])
+        self.prompts = []
+
+    def _next(self, prompt):
+        self.prompts.append(prompt)
+        response = self.responses.pop(0) if self.responses else "OK"
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+    def generate(self, prompt):
+        return self._next(prompt)
+
+    def stream(self, prompt):
+        yield self._next(prompt)
+
+    def start_session(self):
+        return ScriptedSession(self)
+
+
+class ScriptedSession:
+    """Chat session of a ScriptedBackend; like every LLMSession, it leaves history to the caller."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.history = []
+        self.sent_histories = []
+
+    def send(self, prompt):
+        self.sent_histories.append([entry["parts"][0]["text"] for entry in self.history])
+        return self.backend._next(prompt)
+
+    def stream(self, prompt):
+        yield self.send(prompt)
+
+
+@pytest.fixture
+def scripted_backend():
+    """Factory for ScriptedBackend instances."""
+    return ScriptedBackend
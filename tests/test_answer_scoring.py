@@ -0,0 +1,182 @@
+import json
+
+import pytest
+
+import answer_scoring
+from answer_scoring import (
+    EMPTY_ANSWER_RATIONALE,
+    AnswerScorer,
+    ScoreCache,
+    parse_score_json,
+    score_candidates,
+    score_key,
+    score_record,
+    score_saved_record
+)
+from storage import SQLiteStore
+
+
+def _scores(*scores):
+    return json.dumps([{"id": number, "score": score, "rationale": f"r{number}"}
+                       for number, score in enumerate(scores, start=1)])
+
+
+def _record():
+    return {
+        "name": "Jane Doe",
+        "submission_time": "2025-04-12 07:30:53",
+        "interview_status": "complete",
+        "technical_responses": {
+            "question_1": {"question": "What is a decorator?", "answer": "A wrapper."},
+            "question_2": {"question": "What is an ORM?", "answer": ""},
+            "question_3": {"question": "What is a GIL?", "answer": "A lock.", "score": 4, "rationale": "ok"}
+        }
+    }
+
+
+@pytest.fixture
+def scorer(scripted_backend):
+    return AnswerScorer(scripted_backend(), cache=ScoreCache(":memory:"), batch_size=2)
+
+
+def test_parse_score_json_reads_fenced_arrays():
+    text = "```json\n" + _scores(3, 5.0) + "\n```"
+    assert parse_score_json(text, [1, 2]) == {
+        1: {"score": 3, "rationale": "r1"},
+        2: {"score": 5, "rationale": "r2"}
+    }
+
+
+@pytest.mark.parametrize("text, message", [
+    ("Great answers!", "does not contain a JSON array"),
+    ("[{'id': 1}]", "invalid JSON"),
+    ('[{"id": 3, "score": 1}]', "unknown id 3"),
+    ('[{"id": 1, "score": 9}]', "integer \"score\" from 0 to 5"),
+    ('[{"id": 1, "score": true}]', "integer \"score\""),
+    ('[{"id": 1, "score": 2}]', "no score for ids 2"),
+])
+def test_parse_score_json_explains_the_problem(text, message):
+    with pytest.raises(ValueError, match=message):
+        parse_score_json(text, [1, 2])
+
+
+def test_score_key_ignores_whitespace_differences():
+    assert score_key("What is X?", "It is  Y.") == score_key(" What is X? ", "It is\nY.")
+    assert score_key("What is X?", "Y") != score_key("What is X?", "Z")
+
+
+def test_score_pairs_batches_and_grades_identical_pairs_once(scorer):
+    scorer.backend.responses = [_scores(1, 2), _scores(3)]
+    pairs = [("Q1", "A1"), ("Q2", "A2"), ("Q1", " A1 "), ("Q3", "A3"), ("Q4", "  ")]
+
+    results = scorer.score_pairs(pairs)
+
+    assert [result["score"] for result in results] == [1, 2, 1, 3, 0]
+    assert results[4]["rationale"] == EMPTY_ANSWER_RATIONALE
+    assert len(scorer.backend.prompts) == 2
+
+
+def test_score_pairs_answers_from_the_cache(scorer):
+    scorer.backend.responses = [_scores(4)]
+    assert scorer.score_pairs([("Q1", "A1")])[0]["score"] == 4
+    assert scorer.score_pairs([("Q1", "A1")])[0]["score"] == 4
+    assert len(scorer.backend.prompts) == 1
+    assert scorer.cache.stats()["hits"] == 1
+
+
+def test_score_cache_persists_scores_and_evicts_the_least_recently_used(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(answer_scoring.time, "time", lambda: now[0])
+    path = str(tmp_path / "cache" / "scores.db")
+    cache = ScoreCache(path, max_entries=2)
+    cache.put_many({"a": {"score": 1, "rationale": "r1"}, "b": {"score": 2, "rationale": "r2"}}, latency=1.5)
+    now[0] += 1
+    assert cache.get("a") == {"score": 1, "rationale": "r1"}
+    now[0] += 1
+    cache.put_many({"c": {"score": 3, "rationale": "r3"}})
+
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1, 1)
+    assert stats["saved_seconds"] == 1.5
+    cache.close()
+
+    reloaded = ScoreCache(path)
+    assert reloaded.get("a") == {"score": 1, "rationale": "r1"}
+    assert reloaded.get("c") == {"score": 3, "rationale": "r3"}
+    reloaded.close()
+
+
+def test_score_pairs_repairs_an_unusable_response_once(scorer):
+    scorer.backend.responses = ['[{"id": 1, "score": 11}]', _scores(2)]
+    assert scorer.score_pairs([("Q1", "A1")])[0]["score"] == 2
+    assert "from 0 to 5" in scorer.backend.prompts[1]
+
+
+def test_failed_batches_are_left_unscored_and_uncached(scorer):
+    scorer.backend.responses = ["nope", "still nope"]
+    assert scorer.score_pairs([("Q1", "A1")]) == [None]
+    assert scorer.cache.stats()["entries"] == 0
+
+
+def test_score_record_skips_scored_answers(scorer):
+    record = _record()
+    scorer.backend.responses = [_scores(3)]
+
+    scores = score_record(record, scorer)
+
+    assert sorted(scores) == ["question_1", "question_2"]
+    assert record["technical_responses"]["question_1"]["score"] == 3
+    assert record["technical_responses"]["question_2"]["score"] == 0
+    assert record["technical_responses"]["question_3"]["score"] == 4
+
+
+def test_score_candidates_writes_scores_to_the_store(scorer, tmp_path):
+    store = SQLiteStore(str(tmp_path / "candidates.db"))
+    try:
+        first = store.save_candidate(_record())
+        second = store.save_candidate(_record())
+        scorer.backend.responses = [_scores(3)]
+
+        stats = score_candidates(store, scorer, status="complete")
+
+        # Both candidates gave the same answer, so it is graded once
+        assert len(scorer.backend.prompts) == 1
+        assert stats["candidates"] == 2 and stats["scored"] == 4 and stats["failed"] == 0
+        for record_id in (first, second):
+            responses = store.get_candidate(record_id)["technical_responses"]
+            assert [responses[key]["score"] for key in sorted(responses)] == [3, 0, 4]
+    finally:
+        store.close()
+
+
+def test_score_saved_record_scores_in_the_background(scorer, tmp_path, monkeypatch):
+    monkeypatch.setattr(answer_scoring, "_shared_scorer", scorer)
+    store = SQLiteStore(str(tmp_path / "candidates.db"))
+    try:
+        record = _record()
+        record_id = store.save_candidate(record)
+        scorer.backend.responses = [_scores(5)]
+
+        scores = score_saved_record(store, record_id, record).result(5)
+
+        assert scores["question_1"]["score"] == 5
+        assert store.get_candidate(record_id)["technical_responses"]["question_1"]["score"] == 5
+        # The caller's record is left as it was saved
+        assert "score" not in record["technical_responses"]["question_1"]
+    finally:
+        store.close()
+
+
+def test_background_scoring_failures_are_counted(scorer, monkeypatch):
+    monkeypatch.setattr(answer_scoring, "_shared_scorer", scorer)
+
+    class BrokenStore:
+        def save_scores(self, record_id, scores):
+            raise OSError("disk full")
+
+    failures = answer_scoring._background_failures.value()
+    scorer.backend.responses = [_scores(5)]
+
+    assert score_saved_record(BrokenStore(), "1", _record()).result(5) == {}
+    assert answer_scoring._background_failures.value() == failures + 1
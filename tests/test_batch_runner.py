@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+import batch_runner
+import llm_backends
+import question_cache
+from batch_runner import build_report, run_batch, run_transcript
+from llm_backends import ReplayBackend
+
+TRANSCRIPT = {
+    "id": "jane",
+    "inputs": ["Hello", "Jane Doe", "jane@example.com", "5551234567", "4 years", "Data Scientist", "Berlin",
+               "Python, Django", "yes", "My answers"]
+}
+
+
+@pytest.fixture(autouse=True)
+def _restore_process_state(monkeypatch):
+    monkeypatch.setattr(batch_runner, "_backends", {"replay": ReplayBackend("missing.json", latency_ms=0)})
+    yield
+    question_cache.set_question_cache(None)
+    llm_backends.set_rate_scheduler(None)
+
+
+def test_run_transcript_counts_llm_calls_in_the_turn_that_made_them():
+    batch_runner._use_scratch_cache(None)
+    result = run_transcript(TRANSCRIPT, backend="replay")
+
+    assert result["error"] is None
+    assert result["completed"] and result["final_state"] == "closing"
+    assert [turn["state"] for turn in result["turns"]][-2:] == ["confirming_info", "asking_tech_questions"]
+    assert {turn["state"]: turn["llm_calls"] for turn in result["turns"]}["confirming_info"] == 1
+    assert result["llm_calls"] == 1
+    assert result["summary"]["candidate_info"]["name"] == "Jane Doe"
+
+    # The scratch cache serves the same tech stack to the next transcript
+    assert run_transcript(dict(TRANSCRIPT, id="again"), backend="replay")["llm_calls"] == 0
+
+
+def test_run_transcript_reports_errors_instead_of_raising():
+    result = run_transcript({"id": "broken"}, backend="replay")
+
+    assert result["error"] == "KeyError: 'inputs'"
+    assert result["turns"] == [] and result["llm_calls"] == 0
+
+
+def test_build_report_aggregates_turns_per_state():
+    results = [
+        {"id": "a", "error": None, "completed": True, "llm_calls": 1, "turns": [
+            {"state": "greeting", "seconds": 0.1, "llm_calls": 0},
+            {"state": "confirming_info", "seconds": 2.0, "llm_calls": 1}
+        ]},
+        {"id": "b", "error": "ValueError: boom", "llm_calls": 0, "turns": [
+            {"state": "greeting", "seconds": 0.3, "llm_calls": 0}
+        ]}
+    ]
+
+    report = build_report(results, wall_seconds=4.0, workers=2)
+
+    assert (report["transcripts"], report["completed"], report["errors"]) == (2, 1, 1)
+    assert report["transcripts_per_second"] == 0.5
+    assert report["llm_calls"] == 1
+    greeting = report["per_state"]["greeting"]
+    assert (greeting["turns"], greeting["llm_calls"], greeting["max_seconds"]) == (2, 0, 0.3)
+    assert greeting["mean_seconds"] == pytest.approx(0.2)
+    assert report["per_state"]["confirming_info"]["llm_calls"] == 1
+    assert report["results"] is results
+    assert build_report([], 0.0, 1)["transcripts_per_second"] == 0.0
+
+
+def test_workers_merge_their_question_caches_into_the_batch_cache(tmp_path):
+    cache_path = str(tmp_path / "cache" / "batch.json")
+    question_cache.create_question_cache(cache_path).put("seeded", ["Q"])
+    transcripts = [
+        dict(TRANSCRIPT, id=stack, inputs=TRANSCRIPT["inputs"][:7] + [stack, "yes", "answers"])
+        for stack in ("Python", "Go", "Rust", "Java")
+    ]
+
+    report = run_batch(transcripts, workers=2, backend="replay", cache_path=cache_path)
+
+    assert report["completed"] == 4 and report["errors"] == 0
+    with open(cache_path) as f:
+        keys = [key for key, _ in json.load(f)["entries"]]
+    assert "seeded" in keys and len(keys) == 5
+    assert sorted(path.name for path in (tmp_path / "cache").iterdir()) == ["batch.json"]
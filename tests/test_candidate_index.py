@@ -0,0 +1,129 @@
+import os
+
+import pytest
+
+from candidate_index import CandidateIndex
+from storage import JSONFileStore, SQLiteStore
+
+
+def _record(email, techs, experience, submitted, status="complete"):
+    return {
+        "name": email.split("@")[0],
+        "email": email,
+        "experience": experience,
+        "tech_stack": techs,
+        "submission_time": submitted,
+        "interview_status": status
+    }
+
+
+RECORDS = [
+    ("a", _record("a@example.com", ["Python", "Django"], "2 years", "2025-01-01 09:00:00")),
+    ("b", _record("b@example.com", ["python", "k8s"], "7 years", "2025-02-01 09:00:00")),
+    ("c", _record("c@example.com", ["Java"], "five years", "2025-03-01 09:00:00", "in_progress")),
+    ("d", _record("D@Example.com", ["Kubernetes", "Go"], "not sure", "2025-04-01 09:00:00"))
+]
+
+
+@pytest.fixture
+def index():
+    index = CandidateIndex()
+    index.add_many(RECORDS)
+    return index
+
+
+def test_tech_queries_use_canonical_names(index):
+    assert index.query(techs=["Python"]) == ["b", "a"]
+    assert index.query(techs=["kubernetes"]) == ["d", "b"]
+    assert index.query(techs=["python", "kubernetes"]) == ["b"]
+    assert index.query(any_techs=["Java", "Go"]) == ["d", "c"]
+
+
+def test_experience_ranges(index):
+    assert index.query(min_experience=5) == ["c", "b"]
+    assert index.query(max_experience=5) == ["c", "a"]
+    # Unparseable experience never matches a range
+    assert "d" not in index.query(min_experience=0)
+    assert index.query(techs=["python"], min_experience=3) == ["b"]
+
+
+def test_email_status_time_and_limit(index):
+    assert index.query(email="d@example.COM") == ["d"]
+    assert index.query(status="in_progress") == ["c"]
+    assert index.query(submitted_after="2025-02-01", submitted_before="2025-04-01") == ["c", "b"]
+    assert index.query(limit=2) == ["d", "c"]
+
+
+def test_add_replaces_and_remove_forgets(index):
+    index.add("a", _record("a@example.com", ["Rust"], "1 year", "2025-01-01 09:00:00"))
+    assert index.query(techs=["python"]) == ["b"]
+    assert index.query(techs=["rust"]) == ["a"]
+
+    index.remove("b")
+    assert index.query(techs=["python"]) == []
+    assert index.query(min_experience=6) == []
+    assert len(index) == 3
+
+
+def test_save_and_load(index, tmp_path):
+    index.path = str(tmp_path / "index.json")
+    index.save()
+
+    loaded = CandidateIndex(index.path)
+    assert len(loaded) == 4
+    assert loaded.query(techs=["python"]) == ["b", "a"]
+    assert loaded.get_summary("b")["experience"] == 7
+
+
+def test_refresh_picks_up_new_and_removed_json_files(tmp_path):
+    store = JSONFileStore(str(tmp_path))
+    first = store.save_candidate(_record("a@example.com", ["Python"], "2 years", "2025-01-01 09:00:00"))
+    index = CandidateIndex()
+    assert index.refresh(store) == {"added": 1, "updated": 0, "removed": 0}
+    assert index.refresh(store) == {"added": 0, "updated": 0, "removed": 0}
+
+    second = store.save_candidate(_record("b@example.com", ["Go"], "3 years", "2025-01-02 09:00:00"))
+    os.remove(first)
+    assert index.refresh(store) == {"added": 1, "updated": 0, "removed": 1}
+    assert index.query() == [second]
+
+
+def test_refresh_reindexes_json_file_rewritten_under_the_same_id(tmp_path):
+    store = JSONFileStore(str(tmp_path))
+    record = _record("a@example.com", ["Python"], "2 years", "2025-01-01 09:00:00", "in_progress")
+    record_id = store.save_candidate(record)
+    index = CandidateIndex()
+    index.refresh(store)
+
+    # A manual re-save within the same second lands on the same file name
+    store.save_candidate(dict(record, tech_stack=["Go"], experience="6 years", interview_status="complete"))
+    os.utime(record_id, ns=(0, os.stat(record_id).st_mtime_ns + 1))
+
+    assert index.refresh(store) == {"added": 0, "updated": 1, "removed": 0}
+    assert index.query(techs=["go"], min_experience=5, status="complete") == [record_id]
+    assert index.query(techs=["python"]) == []
+
+
+def test_refresh_reindexes_sqlite_records_after_score_updates(tmp_path):
+    store = SQLiteStore(str(tmp_path / "candidates.db"))
+    record = _record("a@example.com", ["Python"], "2 years", "2025-01-01 09:00:00")
+    record["technical_responses"] = {"question_1": {"question": "Q", "answer": "A"}}
+    record_id = store.save_candidate(record)
+    index = CandidateIndex()
+    index.refresh(store)
+
+    store.save_scores(record_id, {"question_1": {"score": 3, "rationale": "Fine."}})
+
+    assert index.refresh(store) == {"added": 0, "updated": 1, "removed": 0}
+    assert index.refresh(store) == {"added": 0, "updated": 0, "removed": 0}
+    store.close()
+
+
+def test_refresh_after_load_skips_unchanged_records(tmp_path):
+    store = JSONFileStore(str(tmp_path / "user_data"))
+    store.save_candidate(_record("a@example.com", ["Python"], "2 years", "2025-01-01 09:00:00"))
+    index = CandidateIndex(str(tmp_path / "index.json"))
+    index.refresh(store)
+    index.save()
+
+    assert CandidateIndex(index.path).refresh(store) == {"added": 0, "updated": 0, "removed": 0}
@@ -0,0 +1,340 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+import chatbot
+import question_cache
+from chatbot import ConversationManager, LLM_ERROR_RESPONSE
+from question_cache import QuestionCache
+
+QUESTIONS = [
+    {"question": "What does a Django middleware do?", "technology": "Django", "difficulty": "basic"},
+    {"question": "How do Python generators save memory?", "technology": "Python", "difficulty": "intermediate"},
+    {"question": "How would you shard a Django app's database?", "technology": "Django", "difficulty": "advanced"}
+]
+
+
+@pytest.fixture
+def manager(monkeypatch, scripted_backend):
+    monkeypatch.setattr(chatbot, "QUESTION_CACHE_ENABLED", False)
+    monkeypatch.setattr(chatbot, "QUESTION_BANK_ENABLED", False)
+    monkeypatch.setattr(chatbot, "LLM_COALESCE_REQUESTS", False)
+    manager = ConversationManager()
+    manager.prefetch_questions = False
+    manager.backend = scripted_backend()
+    return manager
+
+
+def test_sync_retries_use_jittered_backoff(manager, monkeypatch):
+    sleeps = []
+    delays = iter([0.25, 0.75])
+    monkeypatch.setattr(chatbot.time, "sleep", sleeps.append)
+    monkeypatch.setattr(chatbot, "backoff_delay", lambda attempt, base, cap: next(delays))
+    manager.backend.responses = [RuntimeError("503"), RuntimeError("503"), "Recovered"]
+
+    assert manager._get_llm_response("Hi", use_session=False) == "Recovered"
+    assert sleeps == [0.25, 0.75]
+    assert manager.llm_calls == 1
+
+
+def test_async_retries_use_jittered_backoff(manager, monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    async def agenerate(prompt):
+        return manager.backend.generate(prompt)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(chatbot, "backoff_delay", lambda attempt, base, cap: 0.5)
+    manager.backend.agenerate = agenerate
+    manager.backend.responses = [RuntimeError("503"), "Recovered"]
+
+    assert asyncio.run(manager._aget_llm_response("Hi", use_session=False)) == "Recovered"
+    assert sleeps == [0.5]
+
+
+def test_sync_returns_error_response_after_last_retry(manager, monkeypatch):
+    monkeypatch.setattr(chatbot.time, "sleep", lambda seconds: None)
+    manager.backend.responses = [RuntimeError("down")] * chatbot.LLM_MAX_RETRIES
+
+    assert manager._get_llm_response("Hi", use_session=False) == LLM_ERROR_RESPONSE
+    assert len(manager.backend.prompts) == chatbot.LLM_MAX_RETRIES
+
+
+def _add_turns(manager, count, words=40):
+    for number in range(count):
+        manager.transcript.append("user", f"answer {number} " + "word " * words)
+        manager.transcript.append("assistant", f"reply {number} " + "word " * words)
+
+
+def test_one_session_is_reused_and_extended_incrementally(manager):
+    started = []
+    start_session = manager.backend.start_session
+    manager.backend.start_session = lambda: started.append(True) or start_session()
+    _add_turns(manager, 2, words=1)
+    manager._get_llm_response("First?")
+    session = manager._session
+    converted = list(session.history)
+
+    _add_turns(manager, 1, words=1)
+    manager._get_llm_response("Second?")
+    manager._get_llm_response("One-off", use_session=False)
+
+    assert len(started) == 1 and manager._session is session
+    assert session.sent_histories == [
+        ["answer 0 word ", "reply 0 word ", "answer 1 word ", "reply 1 word "],
+        ["answer 0 word ", "reply 0 word ", "answer 1 word ", "reply 1 word ", "answer 0 word ", "reply 0 word "]
+    ]
+    # Messages converted for the first call are kept, not rebuilt, and one-offs leave the session alone
+    assert all(entry is kept for entry, kept in zip(session.history, converted))
+    assert len(session.history) == 6
+
+
+def test_history_within_budget_is_not_compacted(manager, monkeypatch):
+    _add_turns(manager, 3)
+    history, _ = manager._build_llm_request("Next?")
+    # The budget leaves no room for a second copy of the system prompt
+    budget = manager._history_tokens + chatbot.estimate_tokens("Next?")
+    assert budget < chatbot.estimate_tokens(chatbot.SYSTEM_PROMPT) + manager._history_tokens
+    monkeypatch.setattr(chatbot, "PROMPT_TOKEN_BUDGET", budget)
+
+    history, _ = manager._build_llm_request("Next?")
+    assert len(history) == 6
+    assert manager._compacted_messages == 0
+
+
+def test_compaction_keeps_recent_turns_and_one_system_prompt(manager, monkeypatch):
+    monkeypatch.setattr(chatbot, "PROMPT_TOKEN_BUDGET", 300)
+    manager.candidate_info = {"name": "Jane Doe", "tech_stack": ["Python"]}
+    _add_turns(manager, 10)
+
+    history, prompt = manager._build_llm_request("Next?")
+
+    summary = history[0]["parts"][0]["text"]
+    assert history[0]["role"] == "user" and history[1]["role"] == "model"
+    assert summary.count(chatbot.SYSTEM_PROMPT.strip()) == 1
+    assert "Jane Doe" in summary
+    recent = history[2:]
+    assert len(recent) == chatbot.HISTORY_RECENT_MESSAGES
+    assert recent[0]["role"] == "user"
+    assert recent[-1]["parts"][0]["text"].startswith("reply 9 ")
+    assert manager._compacted_messages == 20 - chatbot.HISTORY_RECENT_MESSAGES
+    assert manager._history_tokens == sum(chatbot.estimate_tokens(entry["parts"][0]["text"]) for entry in history)
+    # The system prompt already travels in the summary
+    assert prompt == "Next?"
+
+
+def test_compaction_is_incremental(manager, monkeypatch):
+    monkeypatch.setattr(chatbot, "PROMPT_TOKEN_BUDGET", 300)
+    compactions = chatbot._history_compactions.value()
+    compacted = chatbot._history_compacted_messages.value()
+    _add_turns(manager, 10)
+    manager._build_llm_request("Next?")
+    _add_turns(manager, 10)
+
+    history, _ = manager._build_llm_request("Next?")
+
+    assert manager._compacted_messages == 40 - chatbot.HISTORY_RECENT_MESSAGES
+    assert chatbot._history_compactions.value() - compactions == 2
+    assert chatbot._history_compacted_messages.value() - compacted == manager._compacted_messages
+    assert history[0]["parts"][0]["text"].count(chatbot.SYSTEM_PROMPT.strip()) == 1
+    assert len(history) == 2 + chatbot.HISTORY_RECENT_MESSAGES
+
+
+def test_backend_swap_resets_compaction_state(manager, monkeypatch, scripted_backend):
+    monkeypatch.setattr(chatbot, "PROMPT_TOKEN_BUDGET", 300)
+    _add_turns(manager, 10)
+    manager._build_llm_request("Next?")
+    assert manager._compacted_messages
+
+    manager.backend = scripted_backend()
+    assert manager._compacted_messages == 0
+    assert not manager._history_excerpts
+
+    history, _ = manager._build_llm_request("Next?")
+    assert manager._compacted_messages == 20 - chatbot.HISTORY_RECENT_MESSAGES
+    assert "Summary of the 12 earlier messages" in history[0]["parts"][0]["text"]
+
+
+INTERVIEW = ["Hello", "Jane Doe", "jane@example.com", "5551234567", "4 years", "Data Scientist", "Berlin"]
+
+
+def test_snapshot_round_trip_resumes_the_interview(manager, scripted_backend):
+    for user_input in INTERVIEW:
+        manager.process_input(user_input)
+    snapshot = json.loads(json.dumps(manager.to_snapshot()))
+
+    restored = ConversationManager.from_snapshot(snapshot, backend=scripted_backend())
+    restored.prefetch_questions = False
+
+    assert restored.state == manager.state == "collecting_info"
+    assert restored.candidate_info == manager.candidate_info
+    assert restored.transcript.to_rows(start=1) == manager.transcript.to_rows(start=1)
+    # The system prompt is restored from config rather than stored in every snapshot
+    assert all(chatbot.SYSTEM_PROMPT not in str(row) for row in snapshot["transcript"])
+    assert restored.process_input("Python, Django") == manager.process_input("Python, Django")
+    assert restored.state == manager.state == "confirming_info"
+
+
+def test_snapshot_restarts_prefetch_while_confirming(manager, scripted_backend, monkeypatch):
+    for user_input in INTERVIEW + ["Python, Django"]:
+        manager.process_input(user_input)
+    assert manager.state == "confirming_info"
+    started = []
+    monkeypatch.setattr(ConversationManager, "_start_question_prefetch", lambda self: started.append(self))
+
+    restored = ConversationManager.from_snapshot(manager.to_snapshot(), backend=scripted_backend())
+
+    assert started == [restored]
+
+
+@pytest.fixture
+def question_cache_enabled(monkeypatch):
+    monkeypatch.setattr(chatbot, "QUESTION_CACHE_ENABLED", True)
+    cache = QuestionCache()
+    monkeypatch.setattr(question_cache, "_shared_cache", cache)
+    return cache
+
+
+def test_questions_are_cached_by_normalized_stack(manager, question_cache_enabled, scripted_backend):
+    manager.backend.responses = [json.dumps(QUESTIONS)]
+    assert manager._build_technical_questions(["Python", "Django"]) == QUESTIONS
+
+    other = ConversationManager()
+    other.backend = scripted_backend()
+    assert other._build_technical_questions(["django", " PYTHON "]) == QUESTIONS
+    assert other.backend.prompts == []
+    assert question_cache_enabled.stats()["hits"] == 1
+
+
+def test_invalid_question_json_is_repaired_once(manager, question_cache_enabled):
+    repaired = chatbot._question_json_outcomes.value(outcome="repaired")
+    manager.backend.responses = ['[{"question": "Q", "technology": "Go", "difficulty": "expert"}]', json.dumps(QUESTIONS)]
+
+    assert manager._build_technical_questions(["Python", "Django"]) == QUESTIONS
+    repair_prompt = manager.backend.prompts[1]
+    assert 'item 1 has difficulty "expert"' in repair_prompt
+    assert '"difficulty": "expert"' in repair_prompt
+    assert question_cache_enabled.get(manager._question_cache_key(["Python", "Django"])) == QUESTIONS
+    assert chatbot._question_json_outcomes.value(outcome="repaired") - repaired == 1
+
+
+def test_unrepairable_question_json_salvages_numbered_questions_uncached(manager, question_cache_enabled):
+    failed = chatbot._question_json_outcomes.value(outcome="failed")
+    manager.backend.responses = ["1. What is a goroutine?\n2. What is a channel?", "Still not JSON"]
+
+    questions = manager._build_technical_questions(["Go"])
+
+    assert [question["question"] for question in questions] == ["What is a goroutine?", "What is a channel?"]
+    assert question_cache_enabled.stats()["entries"] == 0
+    assert chatbot._question_json_outcomes.value(outcome="failed") - failed == 1
+
+
+def test_unusable_question_json_yields_no_questions(manager):
+    manager.backend.responses = ["No idea.", "Still no idea."]
+    assert manager._build_technical_questions(["Go"]) is None
+
+
+class _RecordingHistogram:
+    def __init__(self):
+        self.values = []
+
+    def observe(self, value, **labels):
+        self.values.append(value)
+
+
+def test_one_off_prompt_size_excludes_session_history(manager, monkeypatch):
+    prompt_tokens = _RecordingHistogram()
+    monkeypatch.setattr(chatbot, "_llm_prompt_tokens", prompt_tokens)
+    _add_turns(manager, 5)
+    manager._get_llm_response("Warm up")
+    assert manager._history_tokens > 0
+
+    manager._get_llm_response("Generate questions", use_session=False)
+
+    assert prompt_tokens.values[-1] == chatbot.estimate_tokens(manager.backend.prompts[-1])
+
+
+def test_session_prompt_size_includes_history(manager, monkeypatch):
+    prompt_tokens = _RecordingHistogram()
+    monkeypatch.setattr(chatbot, "_llm_prompt_tokens", prompt_tokens)
+    _add_turns(manager, 2)
+
+    manager._get_llm_response("Next?")
+
+    assert manager._history_tokens > 0
+    assert prompt_tokens.values == [manager._history_tokens + chatbot.estimate_tokens(manager.backend.prompts[-1])]
+
+
+def test_failed_attempts_are_counted_by_error_type(manager, monkeypatch):
+    monkeypatch.setattr(chatbot.time, "sleep", lambda seconds: None)
+    before = chatbot._llm_errors.value(mode="sync", error="TimeoutError")
+    manager.backend.responses = [TimeoutError("slow"), "Recovered"]
+
+    assert manager._get_llm_response("Hi", use_session=False) == "Recovered"
+    assert chatbot._llm_errors.value(mode="sync", error="TimeoutError") - before == 1
+
+
+@pytest.fixture
+def prefetching_manager(manager, monkeypatch):
+    monkeypatch.setattr(chatbot, "QUESTION_PREFETCH_ENABLED", True)
+    manager.prefetch_questions = True
+    return manager
+
+
+def test_confirmation_hands_over_the_prefetched_questions(prefetching_manager):
+    manager = prefetching_manager
+    manager.backend.responses = [json.dumps(QUESTIONS)]
+    ready = chatbot._question_prefetches.value(outcome="ready")
+    for user_input in INTERVIEW + ["Python, Django"]:
+        manager.process_input(user_input)
+    manager._prefetch[1].result(5)
+
+    manager.process_input("yes")
+
+    assert manager.state == "asking_tech_questions"
+    assert manager.question_details == QUESTIONS
+    assert chatbot._question_prefetches.value(outcome="ready") - ready == 1
+    # The prefetch was the only question generation, and its call is counted
+    assert sum("Python, Django" in prompt for prompt in manager.backend.prompts) == 1
+    assert manager.llm_calls == len(manager.backend.prompts)
+
+
+def test_correction_discards_a_running_prefetch(prefetching_manager, scripted_backend):
+    class BlockingBackend(scripted_backend):
+        def __init__(self, responses):
+            super().__init__(responses)
+            self.started = threading.Event()
+            self.release = threading.Event()
+
+        def generate(self, prompt):
+            self.started.set()
+            self.release.wait(5)
+            return super().generate(prompt)
+
+    manager = prefetching_manager
+    manager.backend = BlockingBackend([json.dumps(QUESTIONS), json.dumps(QUESTIONS[:1])])
+    discarded = chatbot._question_prefetches.value(outcome="discarded")
+    for user_input in INTERVIEW + ["Python, Django"]:
+        manager.process_input(user_input)
+    stale = manager._prefetch[1]
+    assert manager.backend.started.wait(5)
+
+    manager.process_input("no")
+
+    assert manager._prefetch is None
+    assert chatbot._question_prefetches.value(outcome="discarded") - discarded == 1
+    manager.backend.release.set()
+    stale.result(5)
+
+    for user_input in INTERVIEW[1:] + ["Go"]:
+        manager.process_input(user_input)
+    manager.process_input("yes")
+
+    # The candidate gets questions for the corrected stack, not the discarded ones
+    assert manager.question_details == QUESTIONS[:1]
+    assert "Go" in manager.backend.prompts[-1]
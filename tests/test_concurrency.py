@@ -0,0 +1,291 @@
+import asyncio
+import random
+import threading
+import time
+
+import pytest
+
+from concurrency import (
+    PRIORITY_BATCH,
+    PRIORITY_LIVE,
+    AsyncConcurrencyLimiter,
+    RateLimitTimeout,
+    RateScheduler,
+    SingleFlight,
+    backoff_delay
+)
+
+
+def test_backoff_delay_stays_within_exponential_ceiling():
+    random.seed(1)
+    for attempt in range(6):
+        ceiling = min(8.0, 0.5 * 2 ** attempt)
+        delays = [backoff_delay(attempt, base=0.5, cap=8.0) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+
+
+def test_backoff_delay_is_jittered():
+    random.seed(2)
+    delays = {backoff_delay(3, base=1.0, cap=16.0) for _ in range(20)}
+    assert len(delays) > 1
+
+
+def test_backoff_delay_respects_cap_for_large_attempts():
+    assert backoff_delay(50, base=1.0, cap=2.0) <= 2.0
+
+
+def test_limiter_rejects_empty_limit():
+    with pytest.raises(ValueError):
+        AsyncConcurrencyLimiter(0)
+
+
+def test_limiter_caps_concurrent_holders():
+    limiter = AsyncConcurrencyLimiter(2)
+    peak = 0
+
+    async def work():
+        nonlocal peak
+        async with limiter:
+            peak = max(peak, limiter.active)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(work() for _ in range(10)))
+
+    asyncio.run(main())
+    assert peak == 2
+    assert limiter.active == 0 and limiter.waiting == 0
+
+
+def test_limiter_is_shared_across_event_loops():
+    limiter = AsyncConcurrencyLimiter(1)
+    holders = []
+    peak = 0
+    lock = threading.Lock()
+
+    async def work():
+        nonlocal peak
+        async with limiter:
+            with lock:
+                holders.append(1)
+                peak = max(peak, len(holders))
+            await asyncio.sleep(0.01)
+            with lock:
+                holders.pop()
+
+    threads = [threading.Thread(target=lambda: asyncio.run(work())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert peak == 1
+    assert limiter.active == 0
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    limiter = AsyncConcurrencyLimiter(1)
+
+    async def main():
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+        await asyncio.wait_for(limiter.acquire(), 1)
+        limiter.release()
+
+    asyncio.run(main())
+    assert limiter.active == 0 and limiter.waiting == 0
+
+
+def _run_concurrently(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_single_flight_shares_one_call_between_threads():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def slow_call(value):
+        calls.append(value)
+        started.set()
+        release.wait(5)
+        return value * 2
+
+    threads = _run_concurrently(5, lambda: results.append(flight.do("key", slow_call, 21)))
+    started.wait(5)
+    # Give the followers time to join the leader's call
+    threading.Event().wait(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [21]
+    assert sorted(results) == [(42, False)] + [(42, True)] * 4
+    assert flight.in_flight == 0
+
+
+def test_single_flight_shares_exceptions_and_retires_the_key():
+    flight = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def failing_call():
+        release.wait(5)
+        raise ValueError("quota")
+
+    def caller():
+        try:
+            flight.do("key", failing_call)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = _run_concurrently(3, caller)
+    threading.Event().wait(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(errors) == 3
+    assert flight.in_flight == 0
+    # Nothing is cached; the next call runs again
+    assert flight.do("key", lambda: "fresh") == ("fresh", False)
+
+
+def test_single_flight_keys_do_not_interfere():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == (1, False)
+    assert flight.do("b", lambda: 2) == (2, False)
+
+
+def test_single_flight_async_shares_one_call_across_coroutines():
+    flight = SingleFlight()
+    calls = []
+
+    async def slow_call(value):
+        calls.append(value)
+        await asyncio.sleep(0.02)
+        return value + 1
+
+    async def main():
+        return await asyncio.gather(*(flight.ado("key", slow_call, 1) for _ in range(4)))
+
+    results = asyncio.run(main())
+    assert calls == [1]
+    assert sorted(results) == [(2, False)] + [(2, True)] * 3
+    assert flight.in_flight == 0
+
+
+def test_single_flight_cancelled_leader_fails_its_waiters():
+    flight = SingleFlight()
+
+    async def main():
+        leader = asyncio.ensure_future(flight.ado("key", asyncio.sleep, 10))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.ado("key", asyncio.sleep, 10))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(RuntimeError, match="cancelled"):
+            await follower
+
+    asyncio.run(main())
+    assert flight.in_flight == 0
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_rate_scheduler_without_budgets_never_waits():
+    scheduler = RateScheduler()
+    assert not scheduler.enabled
+    assert all(scheduler.try_acquire(10_000) for _ in range(100))
+    assert scheduler.acquire(10_000, timeout=0) == 0.0
+
+
+def test_rate_scheduler_try_acquire_spends_the_burst_then_refuses():
+    # 10 requests per second, at most one banked
+    scheduler = RateScheduler(requests_per_minute=600, burst_seconds=0.1)
+    assert scheduler.try_acquire()
+    assert not scheduler.try_acquire()
+
+
+def test_rate_scheduler_charges_estimated_tokens():
+    scheduler = RateScheduler(tokens_per_minute=6000, burst_seconds=1)
+    assert scheduler.try_acquire(80)
+    assert not scheduler.try_acquire(80)
+    assert scheduler.try_acquire(20)
+
+
+def test_rate_scheduler_acquire_waits_for_capacity():
+    scheduler = RateScheduler(requests_per_minute=600, burst_seconds=0.1)
+    assert scheduler.acquire() < 0.05
+    waited = scheduler.acquire(timeout=5)
+    assert 0.05 < waited < 1
+
+
+def test_rate_scheduler_acquire_times_out_and_leaves_the_queue():
+    scheduler = RateScheduler(requests_per_minute=6, burst_seconds=10)
+    assert scheduler.try_acquire()
+    with pytest.raises(RateLimitTimeout):
+        scheduler.acquire(timeout=0.05)
+    assert scheduler.waiting == 0
+
+
+def test_rate_scheduler_serves_live_requests_before_queued_batch_ones():
+    scheduler = RateScheduler(requests_per_minute=600, burst_seconds=0.1)
+    assert scheduler.try_acquire()
+    granted = []
+
+    def request(name, priority):
+        scheduler.acquire(priority=priority, timeout=5)
+        granted.append(name)
+
+    batch = threading.Thread(target=request, args=("batch", PRIORITY_BATCH))
+    batch.start()
+    _wait_until(lambda: scheduler.waiting == 1)
+    live = threading.Thread(target=request, args=("live", PRIORITY_LIVE))
+    live.start()
+    _wait_until(lambda: scheduler.waiting == 2 or granted)
+    for thread in (batch, live):
+        thread.join(5)
+
+    assert granted == ["live", "batch"]
+    assert scheduler.waiting == 0
+
+
+def test_rate_scheduler_try_acquire_does_not_overtake_the_queue():
+    # 100 tokens per second, at most 100 banked
+    scheduler = RateScheduler(tokens_per_minute=6000, burst_seconds=1)
+    assert scheduler.try_acquire(100)
+    waiter = threading.Thread(target=scheduler.acquire, args=(100,), kwargs={"timeout": 5})
+    waiter.start()
+    _wait_until(lambda: scheduler.waiting == 1)
+    time.sleep(0.2)
+    # Enough has refilled for a small request, but the queued one is served first
+    assert not scheduler.try_acquire(5)
+    waiter.join(5)
+    assert scheduler.waiting == 0
+
+
+def test_rate_scheduler_async_acquire_times_out():
+    scheduler = RateScheduler(requests_per_minute=6, burst_seconds=10)
+
+    async def main():
+        assert await scheduler.aacquire() < 0.05
+        with pytest.raises(RateLimitTimeout):
+            await scheduler.aacquire(timeout=0.05)
+
+    asyncio.run(main())
+    assert scheduler.waiting == 0
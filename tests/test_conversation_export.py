@@ -0,0 +1,71 @@
+import gzip
+import json
+from datetime import datetime
+
+from transcript import FOR_ALL, FOR_CHAT, FOR_LLM, Transcript
+from utils import build_conversation_export, encode_json_export, export_is_current
+
+SUMMARY = {
+    "candidate_info": {"name": "Jane Doe"},
+    "technical_questions": ["What is a decorator?"],
+    "technical_responses": {"question_1": {"question": "What is a decorator?", "answer": "A wrapper."}}
+}
+NOW = datetime(2025, 4, 12, 7, 30, 53)
+
+
+def _messages():
+    transcript = Transcript()
+    transcript.append("system", "prompt", FOR_LLM, timestamp=0.0)
+    transcript.append("assistant", "Hello!", FOR_ALL, timestamp=0.0)
+    transcript.append("user", "Jane Doe", FOR_ALL, timestamp=0.0)
+    return transcript
+
+
+def test_encode_json_export_gzip_matches_the_plain_json():
+    data = {"full_conversation": [{"role": "user", "content": f"message {number} ü"} for number in range(500)]}
+    plain = encode_json_export(data)
+
+    # Small chunks force many writes to the compressor
+    compressed = encode_json_export(data, compress=True, chunk_bytes=256)
+
+    assert plain == json.dumps(data, indent=2).encode("utf-8")
+    assert gzip.decompress(compressed) == plain
+    assert len(compressed) < len(plain)
+    # A fixed gzip mtime keeps identical data byte-identical
+    assert encode_json_export(data, compress=True) == compressed
+
+
+def test_conversation_export_holds_the_chat_and_summary():
+    transcript = _messages()
+    export = build_conversation_export(SUMMARY, transcript.view(FOR_CHAT), now=NOW)
+
+    data = json.loads(export["data"])
+    assert data["timestamp"] == "2025-04-12 07:30:53"
+    assert data["candidate_info"] == {"name": "Jane Doe"}
+    assert [message["content"] for message in data["full_conversation"]] == ["Hello!", "Jane Doe"]
+    assert (export["file_name"], export["mime"]) == ("talentscout_interview_20250412_073053.json", "application/json")
+
+
+def test_compressed_conversation_export_is_a_gzip_file():
+    transcript = _messages()
+    export = build_conversation_export(SUMMARY, transcript.view(FOR_CHAT), compress=True, now=NOW)
+
+    assert export["file_name"].endswith(".json.gz") and export["mime"] == "application/gzip"
+    assert json.loads(gzip.decompress(export["data"]))["full_conversation"][1]["content"] == "Jane Doe"
+
+
+def test_export_is_reused_until_the_transcript_changes():
+    transcript = _messages()
+    messages = transcript.view(FOR_CHAT)
+    assert not export_is_current(None, messages)
+    export = build_conversation_export(SUMMARY, messages, now=NOW)
+    assert export_is_current(export, messages)
+
+    transcript.append("assistant", "Thanks!")
+    assert not export_is_current(export, messages)
+    export = build_conversation_export(SUMMARY, messages, now=NOW)
+    assert export_is_current(export, messages)
+
+    # Hiding a message changes the chat as much as adding one
+    transcript.set_visibility(1, FOR_LLM)
+    assert not export_is_current(export, messages)
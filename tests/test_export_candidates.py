@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+
+import pytest
+
+from config import EXPORT_CSV_MAX_QUESTIONS
+from export_candidates import export_candidates, flatten_record, iter_export_rows, write_rows
+from storage import SQLiteStore
+
+
+def _record(name, submitted, tech_stack=("Python",), experience="4 years", status="complete", questions=2):
+    return {
+        "name": name,
+        "email": f"{name.lower()}@example.com",
+        "experience": experience,
+        "position": "Data Scientist",
+        "tech_stack": list(tech_stack),
+        "submission_time": submitted,
+        "interview_status": status,
+        "technical_responses": {
+            f"question_{number}": {"question": f"Q{number}", "answer": f"A{number}"}
+            for number in range(1, questions + 1)
+        }
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteStore(str(tmp_path / "candidates.db"))
+    yield store
+    store.close()
+
+
+def _export(store, state_path, **kwargs):
+    out = io.StringIO()
+    stats = export_candidates(out, store=store, incremental=True, state_path=str(state_path), **kwargs)
+    return [json.loads(line)["name"] for line in out.getvalue().splitlines()], stats
+
+
+def test_flatten_record_orders_questions_numerically():
+    record = _record("Ana", "2025-04-12 07:30:53", questions=10)
+    row = flatten_record("c1", record)
+    assert row["id"] == "c1"
+    assert row["experience_years"] == 4
+    assert row["tech_stack"] == "Python"
+    assert [row[f"question_{number}"] for number in (1, 9, 10)] == ["Q1", "Q9", "Q10"]
+
+
+def test_filters_select_matching_records(store):
+    store.save_candidate(_record("Ana", "2025-04-12 07:00:00", tech_stack=["python", "Django"]))
+    store.save_candidate(_record("Ben", "2025-04-12 08:00:00", tech_stack=["Python"], experience="1 year"))
+    store.save_candidate(_record("Cy", "2025-04-12 09:00:00", tech_stack=["Go"], status="incomplete"))
+
+    def names(**filters):
+        return sorted(row["name"] for row in iter_export_rows(store, **filters))
+
+    assert names(techs=["Python"]) == ["Ana", "Ben"]
+    assert names(techs=["Python", "django"]) == ["Ana"]
+    assert names(min_experience=2) == ["Ana", "Cy"]
+    assert names(status="incomplete") == ["Cy"]
+    assert names(since="2025-04-12 08:00:00") == ["Ben", "Cy"]
+
+
+def test_incremental_export_only_returns_new_records(store, tmp_path):
+    state_path = tmp_path / "export_state.json"
+    store.save_candidate(_record("Ana", "2025-04-12 07:00:00"))
+    store.save_candidate(_record("Ben", "2025-04-12 08:00:00"))
+
+    names, _ = _export(store, state_path)
+    assert sorted(names) == ["Ana", "Ben"]
+    assert json.loads(state_path.read_text())["since"] == "2025-04-12 08:00:00"
+
+    names, stats = _export(store, state_path)
+    assert names == []
+    assert stats["since"] == "2025-04-12 08:00:00"
+
+    store.save_candidate(_record("Cy", "2025-04-12 09:00:00"))
+    names, _ = _export(store, state_path)
+    assert names == ["Cy"]
+
+
+def test_incremental_export_keeps_records_sharing_the_watermark(store, tmp_path):
+    state_path = tmp_path / "export_state.json"
+    store.save_candidate(_record("Ana", "2025-04-12 08:00:00"))
+    assert _export(store, state_path)[0] == ["Ana"]
+
+    # A second record saved within the same second as the watermark is still exported once
+    store.save_candidate(_record("Ben", "2025-04-12 08:00:00"))
+    assert _export(store, state_path)[0] == ["Ben"]
+    assert len(json.loads(state_path.read_text())["ids"]) == 2
+    assert _export(store, state_path)[0] == []
+
+
+def test_explicit_since_later_than_the_watermark_wins(store, tmp_path):
+    state_path = tmp_path / "export_state.json"
+    store.save_candidate(_record("Ana", "2025-04-12 07:00:00"))
+    assert _export(store, state_path)[0] == ["Ana"]
+
+    store.save_candidate(_record("Ben", "2025-04-12 08:00:00"))
+    store.save_candidate(_record("Cy", "2025-04-12 09:00:00"))
+    assert _export(store, state_path, since="2025-04-12 09:00:00")[0] == ["Cy"]
+
+
+def test_csv_counts_rows_with_more_questions_than_columns():
+    rows = [flatten_record("c1", _record("Ana", "2025-04-12 07:00:00", questions=EXPORT_CSV_MAX_QUESTIONS + 1))]
+    out = io.StringIO()
+    stats = write_rows(rows, out, "csv")
+    assert stats["exported"] == 1
+    assert stats["truncated"] == 1
+    row = next(csv.DictReader(io.StringIO(out.getvalue())))
+    assert row["name"] == "Ana"
+    assert f"question_{EXPORT_CSV_MAX_QUESTIONS + 1}" not in row
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError, match="Unknown export format"):
+        write_rows([], io.StringIO(), "xml")
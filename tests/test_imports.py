@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+import config
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from check_import_time import MODULES, measure_import  # noqa: E402
+
+# Looser than check_import_time.py's default budget, so a busy machine doesn't fail the suite
+IMPORT_BUDGET_MS = 500
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_is_fast_and_defers_the_sdk_secrets_and_subprocesses(module):
+    elapsed_ms, loaded = measure_import(module, runs=1)
+
+    assert loaded == []
+    assert 0 < elapsed_ms < IMPORT_BUDGET_MS
+
+
+@pytest.fixture
+def unresolved_api_key(monkeypatch):
+    monkeypatch.setattr(config, "_gemini_api_key", None)
+    monkeypatch.setitem(sys.modules, "dotenv", None)
+    monkeypatch.setitem(sys.modules, "streamlit", None)
+
+
+def test_api_key_is_resolved_on_first_use_and_kept(unresolved_api_key, monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "key-1")
+    assert config.GEMINI_API_KEY == "key-1"
+
+    monkeypatch.setenv("GEMINI_API_KEY", "key-2")
+    assert config.get_gemini_api_key() == "key-1"
+
+
+def test_missing_api_key_raises_on_use(unresolved_api_key, monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+
+    with pytest.raises(RuntimeError, match="GEMINI_API_KEY is not configured"):
+        config.get_gemini_api_key()
+    with pytest.raises(AttributeError):
+        config.NOT_A_SETTING
@@ -0,0 +1,303 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import llm_backends
+from answer_scoring import AnswerScorer, ScoreCache
+from concurrency import RateScheduler
+from config import SYSTEM_PROMPT, TECH_QUESTION_JSON_PROMPT
+from llm_backends import (
+    REPLAY_FALLBACK_JSON_RESPONSE,
+    REPLAY_FALLBACK_RESPONSE,
+    GeminiSession,
+    HedgedBackend,
+    LatencyTracker,
+    LLMBackend,
+    RecordingBackend,
+    ReplayBackend,
+    fixture_key,
+    load_fixtures,
+    template_pattern
+)
+
+
+class TimedBackend(LLMBackend):
+    """Answers after a delay, streaming its response word by word."""
+
+    rate_limited = False
+
+    def __init__(self, name, delay=0.0, response=None, error=None):
+        self.name = name
+        self.delay = delay
+        self.response = response or f"{name} answer"
+        self.error = error
+        self.prompts = []
+
+    def generate(self, prompt):
+        self.prompts.append(prompt)
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.response
+
+    def stream(self, prompt):
+        self.prompts.append(prompt)
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        for word in self.response.split():
+            yield word + " "
+            time.sleep(0.01)
+
+
+@pytest.fixture
+def hedge_config(monkeypatch):
+    monkeypatch.setattr(llm_backends, "LLM_HEDGE_INITIAL_SECONDS", 0.05)
+    monkeypatch.setattr(llm_backends, "LLM_HEDGE_MIN_SAMPLES", 3)
+    monkeypatch.setattr(llm_backends, "LLM_HEDGE_MIN_SECONDS", 0.01)
+    monkeypatch.setattr(llm_backends, "LLM_HEDGE_MAX_SECONDS", 1.0)
+
+
+def _hedges(outcome):
+    return llm_backends._hedges.value(outcome=outcome)
+
+
+def test_latency_tracker_keeps_a_window():
+    tracker = LatencyTracker(window=3)
+    for seconds in (10.0, 1.0, 2.0, 3.0):
+        tracker.observe(seconds)
+    assert len(tracker) == 3
+    assert tracker.percentile(100) == 3.0
+
+
+def test_threshold_uses_the_initial_value_until_enough_samples(hedge_config):
+    backend = HedgedBackend(TimedBackend("primary"), TimedBackend("fallback"))
+    backend._observe(backend.primary, "response", 0.2)
+    backend._observe(backend.primary, "response", 0.2)
+    assert backend.threshold() == 0.05
+
+    backend._observe(backend.primary, "response", 0.2)
+    assert backend.threshold() == pytest.approx(0.2)
+    # Streams are hedged on their own first-chunk latencies
+    assert backend.threshold("first_chunk") == 0.05
+
+
+def test_threshold_is_bounded(hedge_config):
+    backend = HedgedBackend(TimedBackend("primary"), TimedBackend("fallback"))
+    for _ in range(3):
+        backend._observe(backend.primary, "response", 30.0)
+    assert backend.threshold() == 1.0
+
+
+def test_fast_primary_is_not_hedged(hedge_config):
+    backend = HedgedBackend(TimedBackend("primary"), TimedBackend("fallback"))
+    assert backend.generate("Q") == "primary answer"
+    assert backend.fallback.prompts == []
+
+
+def test_fallback_wins_when_the_primary_is_slow(hedge_config):
+    backend = HedgedBackend(TimedBackend("primary", delay=0.5), TimedBackend("fallback"))
+    before = _hedges("fallback")
+
+    assert backend.generate("Q") == "fallback answer"
+    assert _hedges("fallback") - before == 1
+
+
+def test_primary_still_wins_when_it_answers_first(hedge_config):
+    backend = HedgedBackend(TimedBackend("primary", delay=0.1), TimedBackend("fallback", delay=0.6))
+    before = _hedges("primary")
+
+    assert backend.generate("Q") == "primary answer"
+    assert backend.fallback.prompts == ["Q"]
+    assert _hedges("primary") - before == 1
+
+
+def test_error_is_raised_when_both_models_fail(hedge_config):
+    backend = HedgedBackend(
+        TimedBackend("primary", delay=0.1, error=RuntimeError("primary down")),
+        TimedBackend("fallback", error=RuntimeError("fallback down"))
+    )
+    before = _hedges("failed")
+
+    with pytest.raises(RuntimeError, match="down"):
+        backend.generate("Q")
+    assert _hedges("failed") - before == 1
+
+
+def test_a_failed_fallback_leaves_the_primary_answer(hedge_config):
+    backend = HedgedBackend(TimedBackend("primary", delay=0.1), TimedBackend("fallback", error=RuntimeError("down")))
+    assert backend.generate("Q") == "primary answer"
+
+
+def test_no_hedge_without_spare_quota(hedge_config, monkeypatch):
+    scheduler = RateScheduler(requests_per_minute=6, burst_seconds=10)
+    assert scheduler.try_acquire()
+    monkeypatch.setattr(llm_backends, "get_rate_scheduler", lambda: scheduler)
+    fallback = TimedBackend("fallback")
+    fallback.rate_limited = True
+    backend = HedgedBackend(TimedBackend("primary", delay=0.15), fallback)
+    before = _hedges("skipped")
+
+    assert backend.generate("Q") == "primary answer"
+    assert fallback.prompts == []
+    assert _hedges("skipped") - before == 1
+
+
+def test_stream_discards_the_losers_chunks(hedge_config):
+    backend = HedgedBackend(
+        TimedBackend("primary", delay=0.3, response="slow primary words"),
+        TimedBackend("fallback", response="quick fallback words")
+    )
+    assert "".join(backend.stream("Q")) == "quick fallback words "
+
+
+def test_stream_keeps_the_primary_when_it_starts_first(hedge_config):
+    backend = HedgedBackend(
+        TimedBackend("primary", delay=0.08, response="primary words here"),
+        TimedBackend("fallback", delay=0.4, response="fallback words")
+    )
+    assert "".join(backend.stream("Q")) == "primary words here "
+
+
+def test_stream_raises_when_both_models_fail(hedge_config):
+    backend = HedgedBackend(
+        TimedBackend("primary", delay=0.1, error=RuntimeError("primary down")),
+        TimedBackend("fallback", error=RuntimeError("fallback down"))
+    )
+    with pytest.raises(RuntimeError, match="down"):
+        list(backend.stream("Q"))
+
+
+def test_requests_reuse_pooled_workers(hedge_config, monkeypatch):
+    backend = HedgedBackend(TimedBackend("primary"), TimedBackend("fallback"))
+    backend.generate("Q")
+    starts = []
+    start = threading.Thread.start
+
+    def counting_start(thread):
+        starts.append(thread.name)
+        start(thread)
+
+    monkeypatch.setattr(threading.Thread, "start", counting_start)
+    for _ in range(30):
+        backend.generate("Q")
+    assert starts == []
+
+
+def test_busy_pool_runs_the_request_inline(hedge_config, monkeypatch):
+    monkeypatch.setattr(llm_backends, "_hedge_slots", threading.BoundedSemaphore(1))
+    assert llm_backends._hedge_slots.acquire(blocking=False)
+    backend = HedgedBackend(TimedBackend("primary", delay=0.1), TimedBackend("fallback"))
+
+    assert backend.generate("Q") == "primary answer"
+    assert "".join(backend.stream("Q")) == "primary answer "
+    assert backend.fallback.prompts == []
+
+
+def test_fixture_key_is_a_stable_prompt_hash():
+    assert fixture_key("Q") == fixture_key("Q")
+    assert fixture_key("Q") != fixture_key("Q ")
+    assert len(fixture_key("Q")) == 64
+
+
+def test_recorded_fixtures_replay_exactly(tmp_path, scripted_backend):
+    path = str(tmp_path / "fixtures.json")
+    recorder = RecordingBackend(scripted_backend(["one-off answer", "streamed answer", "session answer"]), path)
+    assert recorder.generate("one-off") == "one-off answer"
+    assert "".join(recorder.stream("streamed")) == "streamed answer"
+    assert recorder.start_session().send("in session") == "session answer"
+
+    replay = ReplayBackend(path, latency_ms=0, on_miss="error")
+
+    assert replay.generate("one-off") == "one-off answer"
+    assert "".join(replay.stream("streamed")) == "streamed answer"
+    assert asyncio.run(replay.agenerate("in session")) == "session answer"
+    assert replay.hits == 3 and replay.misses == 0
+    assert load_fixtures(path)[fixture_key("one-off")]["prompt"] == "one-off"
+
+
+def test_failed_requests_are_not_recorded(tmp_path, scripted_backend):
+    path = str(tmp_path / "fixtures.json")
+    recorder = RecordingBackend(scripted_backend([RuntimeError("down")]), path)
+    with pytest.raises(RuntimeError):
+        recorder.generate("Q")
+    assert load_fixtures(path) == {}
+
+
+def test_replay_miss_policy_error_raises(tmp_path):
+    replay = ReplayBackend(str(tmp_path / "missing.json"), latency_ms=0, on_miss="error")
+    with pytest.raises(KeyError):
+        replay.generate("Unrecorded")
+    assert replay.misses == 1
+
+
+def test_replay_fallback_follows_the_prompt_template(tmp_path):
+    replay = ReplayBackend(str(tmp_path / "missing.json"), latency_ms=0)
+    question_prompt = f"{SYSTEM_PROMPT}\n\n" + TECH_QUESTION_JSON_PROMPT.format(tech_stack="Python")
+
+    assert replay.generate(question_prompt) == REPLAY_FALLBACK_JSON_RESPONSE
+    assert replay.generate(f"{SYSTEM_PROMPT}\n\nWhat's next?") == REPLAY_FALLBACK_RESPONSE
+
+
+def test_replayed_scoring_misses_fail_without_a_repair(tmp_path):
+    replay = ReplayBackend(str(tmp_path / "missing.json"), latency_ms=0)
+    scorer = AnswerScorer(replay, cache=ScoreCache(":memory:"))
+
+    assert scorer.score_pairs([("What is a decorator?", "A wrapper.")]) == [None]
+    # The scoring prompt gets no canned question list, so no repair request follows
+    assert replay.misses == 1
+
+
+def test_template_pattern_matches_only_formatted_prompts():
+    pattern = template_pattern("Rate {answer} from {low} to {{high}}")
+    assert pattern.search("prefix Rate it from 1 to {high}")
+    assert not pattern.search("Rate it from 1 to high")
+
+
+class FakeChat:
+    """Stand-in for a Gemini ChatSession: send_message adds a turn and rewind() removes it."""
+
+    def __init__(self):
+        self.history = [{"role": "user", "parts": [{"text": "Jane Doe"}]}]
+
+    def _add_turn(self, prompt):
+        self.history += [{"role": "user", "parts": [{"text": prompt}]},
+                         {"role": "model", "parts": [{"text": "reply"}]}]
+
+    def send_message(self, prompt, stream=False):
+        self._add_turn(prompt)
+        if stream:
+            return iter([SimpleNamespace(text="re"), SimpleNamespace(text=""), SimpleNamespace(text="ply")])
+        return SimpleNamespace(text="reply")
+
+    async def send_message_async(self, prompt):
+        self._add_turn(prompt)
+        return SimpleNamespace(text="reply")
+
+    def rewind(self):
+        del self.history[-2:]
+
+
+def test_gemini_session_rewinds_each_prompt_out_of_the_history():
+    chat = FakeChat()
+    session = GeminiSession(chat)
+    assert session.history is chat.history
+
+    assert session.send("What next?") == "reply"
+    assert list(session.stream("What next?")) == ["re", "ply"]
+    assert asyncio.run(session.asend("What next?")) == "reply"
+
+    assert chat.history == [{"role": "user", "parts": [{"text": "Jane Doe"}]}]
+
+
+def test_gemini_session_rewinds_an_abandoned_stream():
+    chat = FakeChat()
+    chunks = GeminiSession(chat).stream("What next?")
+
+    assert next(chunks) == "re"
+    chunks.close()
+
+    assert len(chat.history) == 1
@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+import pytest
+
+import chatbot
+import question_cache
+from load_test import TECH_STACKS, SimulatedBackend, run_session
+from question_cache import QuestionCache
+
+
+def test_simulated_agenerate_leaves_the_event_loop_free():
+    backend = SimulatedBackend(latency_ms=100)
+
+    async def both():
+        return await asyncio.gather(backend.agenerate("a"), backend.start_session().asend("b"))
+
+    started = time.perf_counter()
+    responses = asyncio.run(both())
+
+    assert time.perf_counter() - started < 0.18
+    assert responses == ["Thank you, let's continue with the screening."] * 2
+    assert backend.requests == 2
+
+
+def test_simulated_agenerate_fails_at_the_error_rate():
+    backend = SimulatedBackend(latency_ms=0, error_rate=1.0)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(backend.agenerate("a"))
+    assert backend.errors == 1
+
+
+@pytest.mark.parametrize("use_question_cache, requests", [(False, 2), (True, 1)])
+def test_sessions_use_the_question_cache_only_when_asked(monkeypatch, use_question_cache, requests):
+    monkeypatch.setattr(chatbot, "QUESTION_PREFETCH_ENABLED", False)
+    monkeypatch.setattr(question_cache, "_shared_cache", QuestionCache())
+    backend = SimulatedBackend(latency_ms=0)
+
+    # Candidates 0 and len(TECH_STACKS) declare the same tech stack
+    for number in (0, len(TECH_STACKS)):
+        assert run_session(backend, number, use_question_cache=use_question_cache)["completed"]
+
+    assert backend.requests == requests
@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+import chatbot
+import question_bank
+from question_bank import QuestionBank
+
+
+def _questions(tech, difficulty, count):
+    return [{"question": f"{tech} {difficulty} question {number}?", "technology": tech, "difficulty": difficulty}
+            for number in range(1, count + 1)]
+
+
+@pytest.fixture
+def bank():
+    bank = QuestionBank()
+    for difficulty in ("basic", "intermediate", "advanced"):
+        bank.add("Python", _questions("python", difficulty, 3))
+        bank.add("Go", _questions("go", difficulty, 3))
+    return bank
+
+
+@pytest.mark.parametrize("count, total, slots", [
+    (1, 3, [3]),
+    (2, 3, [2, 1]),
+    (3, 5, [3, 1, 1]),
+    (5, 5, [1, 1, 1, 1, 1]),
+    (6, 5, [1, 1, 1, 1, 1, 0]),
+])
+def test_allocate_gives_every_tech_a_slot_then_weights_by_rank(count, total, slots):
+    assert QuestionBank._allocate(count, total) == slots
+
+
+def test_assemble_follows_the_candidates_ranking(bank):
+    questions, uncovered = bank.assemble(["golang", "Python"], random.Random(1))
+
+    assert uncovered == []
+    assert [question["technology"] for question in questions] == ["go", "go", "python"]
+    assert len({question["question"] for question in questions}) == 3
+
+
+def test_assemble_spreads_difficulties_easiest_first(bank):
+    questions, _ = bank.assemble(["Python"], random.Random(2))
+    assert [question["difficulty"] for question in questions] == ["basic", "intermediate", "advanced"]
+
+
+def test_assemble_falls_back_to_the_nearest_difficulty():
+    bank = QuestionBank()
+    bank.add("Rust", _questions("rust", "basic", 1) + _questions("rust", "advanced", 3))
+
+    questions, _ = bank.assemble(["Rust"], random.Random(3))
+
+    # Intermediate is missing: the first slot takes the nearer basic question, the rest advanced ones
+    assert [question["difficulty"] for question in questions] == ["basic", "advanced", "advanced"]
+
+
+def test_assemble_stops_when_a_technology_runs_out():
+    bank = QuestionBank()
+    bank.add("Rust", _questions("rust", "advanced", 1))
+    questions, uncovered = bank.assemble(["Rust"])
+    assert len(questions) == 1 and uncovered == []
+
+
+def test_assemble_leaves_uncovered_technologies_in_the_candidates_spelling(bank):
+    questions, uncovered = bank.assemble(["Python", "Node.js", "python ", "Elixir"], random.Random(4))
+
+    assert uncovered == ["Node.js", "Elixir"]
+    assert {question["technology"] for question in questions} == {"python"}
+
+
+def test_add_skips_duplicates_and_save_load_round_trips(tmp_path):
+    bank = QuestionBank(str(tmp_path / "bank.json"))
+    assert bank.add("Python", _questions("python", "basic", 2)) == 2
+    assert bank.add("python", [{"question": "PYTHON  basic question 1?", "technology": "python", "difficulty": "basic"}]) == 0
+    bank.save()
+
+    loaded = QuestionBank(str(tmp_path / "bank.json"))
+    assert loaded.stats() == {"python": {"basic": 2}}
+    assert loaded.covers("Python") and not loaded.covers("Go")
+
+
+def test_covered_stack_needs_no_llm_call(bank, monkeypatch, scripted_backend):
+    monkeypatch.setattr(chatbot, "QUESTION_BANK_ENABLED", True)
+    monkeypatch.setattr(chatbot, "QUESTION_CACHE_ENABLED", False)
+    monkeypatch.setattr(question_bank, "_shared_bank", bank)
+    assemblies = chatbot._question_bank_assemblies.value(coverage="full")
+    manager = chatbot.ConversationManager()
+    manager.prefetch_questions = False
+    manager.backend = scripted_backend()
+
+    questions = manager._build_technical_questions(["Python", "Go"])
+
+    assert len(questions) == 3
+    assert manager.backend.prompts == []
+    assert chatbot._question_bank_assemblies.value(coverage="full") - assemblies == 1
+
+
+def test_uncovered_technologies_are_generated_by_the_llm(bank, monkeypatch, scripted_backend):
+    monkeypatch.setattr(chatbot, "QUESTION_BANK_ENABLED", True)
+    monkeypatch.setattr(chatbot, "QUESTION_CACHE_ENABLED", False)
+    monkeypatch.setattr(question_bank, "_shared_bank", bank)
+    manager = chatbot.ConversationManager()
+    manager.prefetch_questions = False
+    manager.backend = scripted_backend(
+        ['[{"question": "What is a lifetime?", "technology": "Rust", "difficulty": "basic"}]']
+    )
+
+    questions = manager._build_technical_questions(["Python", "Rust"])
+
+    assert [question["technology"] for question in questions][-1] == "Rust"
+    # Only the uncovered technology is sent to the LLM
+    assert manager._build_question_prompt(["Rust"]) in manager.backend.prompts[0]
@@ -0,0 +1,99 @@
+import json
+
+from question_cache import QuestionCache, make_cache_key
+
+
+def test_cache_key_ignores_order_case_whitespace_and_duplicates():
+    assert make_cache_key(["Python", " django ", "AWS"]) == "questions:aws,django,python"
+    assert make_cache_key(["aws", "Django", "python", "PYTHON"]) == "questions:aws,django,python"
+    assert make_cache_key(["Node  JS"], namespace="questions_json") == "questions_json:node js"
+
+
+def test_get_put_and_stats():
+    cache = QuestionCache()
+    assert cache.get("k") is None
+    cache.put("k", ["Q1"], latency=2.5)
+
+    assert cache.get("k") == ["Q1"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+    assert stats["saved_seconds"] == 2.5
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = QuestionCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    import question_cache
+    now = [1000.0]
+    monkeypatch.setattr(question_cache.time, "time", lambda: now[0])
+    cache = QuestionCache(ttl_seconds=60)
+    cache.put("k", "questions")
+
+    now[0] += 59
+    assert cache.get("k") == "questions"
+    now[0] += 2
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_popular_entries_rotate_out():
+    cache = QuestionCache(rotate_after=2)
+    cache.put("k", "questions")
+
+    assert cache.get("k") == "questions"
+    assert cache.get("k") == "questions"
+    assert cache.get("k") is None
+    assert cache.stats()["rotations"] == 1
+
+
+def test_put_many_and_persistence(tmp_path):
+    path = str(tmp_path / "cache" / "questions.json")
+    cache = QuestionCache(path=path)
+    cache.put_many({"a": [1], "b": [2]}, latency=1.0)
+
+    with open(path) as f:
+        assert [key for key, _ in json.load(f)["entries"]] == ["a", "b"]
+    reloaded = QuestionCache(path=path, max_entries=1)
+    assert reloaded.get("a") is None
+    assert reloaded.get("b") == [2]
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "questions.json"
+    path.write_text("{not json")
+
+    cache = QuestionCache(path=str(path))
+    assert cache.stats()["entries"] == 0
+    cache.put("k", "v")
+    assert QuestionCache(path=str(path)).get("k") == "v"
+
+
+def test_merge_file_keeps_the_newer_entry(tmp_path, monkeypatch):
+    import question_cache
+    now = [1000.0]
+    monkeypatch.setattr(question_cache.time, "time", lambda: now[0])
+    path = str(tmp_path / "cache.json")
+    worker_path = str(tmp_path / "worker.json")
+    cache = QuestionCache(path=path)
+    cache.put_many({"shared": "old", "mine": "kept"})
+    now[0] += 1
+    QuestionCache(path=worker_path).put_many({"shared": "new", "theirs": "added"})
+
+    assert cache.merge_file(worker_path) == 2
+    assert cache.merge_file(worker_path) == 0
+    reloaded = QuestionCache(path=path)
+    assert {key: reloaded.get(key) for key in ("shared", "mine", "theirs")} == {
+        "shared": "new", "mine": "kept", "theirs": "added"
+    }
+    assert cache.merge_file(str(tmp_path / "missing.json")) == 0
@@ -0,0 +1,89 @@
+import json
+import random
+
+import pytest
+
+from utils import QuestionJSONStreamParser, parse_question_json, validate_question_item
+
+JSON_QUESTIONS = [
+    {"question": "1. What is a decorator?", "technology": "Python", "difficulty": "Basic"},
+    {"question": "What does {\"a\": [1]} print?", "technology": "Python", "difficulty": "intermediate"},
+    {"question": "How do you shard Postgres?", "technology": "PostgreSQL", "difficulty": "advanced"}
+]
+
+
+def _chunks(text, rng):
+    position = 0
+    while position < len(text):
+        size = rng.randint(1, 12)
+        yield text[position:position + size]
+        position += size
+
+
+def _stream_json(text, rng, difficulties=("basic", "intermediate", "advanced")):
+    parser = QuestionJSONStreamParser(difficulties)
+    questions = []
+    for chunk in _chunks(text, rng):
+        questions.extend(parser.feed(chunk))
+    parser.finish()
+    return questions
+
+
+def test_json_parser_decodes_items_incrementally_for_any_chunking():
+    text = "```json\n" + json.dumps(JSON_QUESTIONS, indent=2) + "\n```"
+    for seed in range(50):
+        questions = _stream_json(text, random.Random(seed))
+        assert [question["technology"] for question in questions] == ["Python", "Python", "PostgreSQL"]
+        assert questions[0] == {"question": "What is a decorator?", "technology": "Python", "difficulty": "basic"}
+        assert questions[1]["question"] == 'What does {"a": [1]} print?'
+
+
+def test_json_parser_returns_each_item_once_complete():
+    parser = QuestionJSONStreamParser()
+    text = json.dumps(JSON_QUESTIONS)
+    first_end = text.index("}") + 1
+    assert parser.feed(text[:first_end - 1]) == []
+    assert len(parser.feed(text[first_end - 1:first_end + 2])) == 1
+    assert len(parser.feed(text[first_end + 2:])) == 2
+    parser.finish()
+
+
+@pytest.mark.parametrize("text, message", [
+    ("No questions today.", "does not contain a JSON array"),
+    ("[]", "array is empty"),
+    ('[{"question": "Q", "technology": "Go", "difficulty": "basic"}', "invalid JSON after item 1"),
+    ('[{"question": "Q", "technology": "Go", "difficulty": "basic"}, {"question": ', "invalid JSON after item 1"),
+])
+def test_json_parser_finish_reports_incomplete_output(text, message):
+    parser = QuestionJSONStreamParser()
+    parser.feed(text)
+    with pytest.raises(ValueError, match=message):
+        parser.finish()
+
+
+def test_json_parser_rejects_invalid_items_as_they_arrive():
+    parser = QuestionJSONStreamParser(["basic"])
+    with pytest.raises(ValueError, match="item 1 has difficulty"):
+        parser.feed('[{"question": "Q", "technology": "Go", "difficulty": "expert"}')
+
+
+def test_parse_question_json_accepts_fenced_output():
+    text = "Sure!\n```json\n" + json.dumps(JSON_QUESTIONS) + "\n```"
+    assert len(parse_question_json(text, ["basic", "intermediate", "advanced"])) == 3
+
+
+@pytest.mark.parametrize("item, message", [
+    ("What is Go?", "item 2 is not an object"),
+    ({"question": "Q", "technology": " ", "difficulty": "basic"}, 'item 2 is missing a non-empty string "technology"'),
+    ({"question": "Q", "technology": "Go"}, 'item 2 is missing a non-empty string "difficulty"'),
+])
+def test_validate_question_item_explains_the_problem(item, message):
+    with pytest.raises(ValueError, match=message):
+        validate_question_item(item, 2)
+
+
+def test_validate_question_item_normalizes_fields():
+    item = {"question": " 3. What is a goroutine? ", "technology": "Go ", "difficulty": "ADVANCED", "extra": 1}
+    assert validate_question_item(item, 1) == {
+        "question": "What is a goroutine?", "technology": "Go", "difficulty": "advanced"
+    }
@@ -0,0 +1,107 @@
+import json
+import zlib
+
+import pytest
+
+import session_store
+from session_store import (
+    MemoryKV,
+    RedisSessionStore,
+    SQLiteSessionStore,
+    SNAPSHOT_VERSION,
+    decode_snapshot,
+    encode_snapshot,
+    new_session_token
+)
+
+SNAPSHOT = {"manager": {"state": "collecting_info", "transcript": [[1, "Jane Doe", 1.5, 3]]}, "app": {"n": 1}}
+
+
+def test_encode_decode_round_trip():
+    blob = encode_snapshot(SNAPSHOT)
+    assert isinstance(blob, bytes)
+    assert decode_snapshot(blob) == SNAPSHOT
+
+
+def test_snapshots_of_other_versions_are_ignored():
+    ignored = session_store._snapshots_ignored.value(reason="version")
+    blob = zlib.compress(json.dumps({"v": SNAPSHOT_VERSION - 1, "data": SNAPSHOT}).encode("utf-8"))
+    assert decode_snapshot(blob) is None
+    assert session_store._snapshots_ignored.value(reason="version") == ignored + 1
+
+
+@pytest.mark.parametrize("blob, reason", [
+    (b"not zlib", "corrupt"),
+    (zlib.compress(b"\xff\xfe"), "corrupt"),
+    (zlib.compress(b"[1, 2]"), "version")
+])
+def test_corrupt_snapshots_are_ignored(blob, reason):
+    ignored = session_store._snapshots_ignored.value(reason=reason)
+    assert decode_snapshot(blob) is None
+    assert session_store._snapshots_ignored.value(reason=reason) == ignored + 1
+
+
+def test_tokens_are_unique_and_url_safe():
+    tokens = {new_session_token() for _ in range(100)}
+    assert len(tokens) == 100
+    assert all(token.replace("-", "").replace("_", "").isalnum() for token in tokens)
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        store = SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl_seconds=60)
+    else:
+        store = RedisSessionStore(MemoryKV(), ttl_seconds=60)
+    yield store
+    store.close()
+
+
+def test_store_save_load_delete(store):
+    assert store.load("missing") is None
+    size = store.save("token", SNAPSHOT)
+
+    assert size == len(encode_snapshot(SNAPSHOT))
+    assert store.load("token") == SNAPSHOT
+
+    store.save("token", {"replaced": True})
+    assert store.load("token") == {"replaced": True}
+
+    store.delete("token")
+    assert store.load("token") is None
+
+
+def test_store_expires_untouched_snapshots(store, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_store.time, "time", lambda: now[0])
+    store.save("token", SNAPSHOT)
+
+    now[0] += 59
+    assert store.load("token") == SNAPSHOT
+    now[0] += 2
+    assert store.load("token") is None
+
+
+def test_sqlite_store_purges_expired_rows(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_store.time, "time", lambda: now[0])
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl_seconds=10)
+    store.PURGE_EVERY = 2
+    store.save("old", SNAPSHOT)
+    now[0] += 20
+    store.save("new", SNAPSHOT)
+
+    rows = store._conn.execute("SELECT token FROM sessions").fetchall()
+    assert rows == [("new",)]
+    store.close()
+
+
+def test_create_session_store_backends(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_store, "SESSION_DB_PATH", str(tmp_path / "sessions.db"))
+    assert session_store.create_session_store(None) is None
+    assert isinstance(session_store.create_session_store("memory"), RedisSessionStore)
+    sqlite_store = session_store.create_session_store("sqlite")
+    assert isinstance(sqlite_store, SQLiteSessionStore)
+    sqlite_store.close()
+    with pytest.raises(ValueError):
+        session_store.create_session_store("carrier-pigeon")
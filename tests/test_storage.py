@@ -0,0 +1,139 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+import storage
+from storage import JSONFileStore, SQLiteStore
+
+
+def _record(email="jane@example.com", submitted="2025-04-12 07:30:53"):
+    return {
+        "name": "Jane Doe",
+        "email": email,
+        "phone": "5551234567",
+        "experience": "4 years",
+        "position": "Backend Engineer",
+        "location": "Berlin",
+        "tech_stack": ["Python", "Django"],
+        "submission_time": submitted,
+        "interview_status": "complete",
+        "technical_responses": {
+            "question_1": {"question": "What is a decorator?", "answer": "A wrapper."},
+            "question_2": {"question": "What is an ORM?", "answer": "A mapper."}
+        }
+    }
+
+
+TRANSCRIPT = [
+    {"role": "assistant", "content": "Hello!", "timestamp": "07:20:00"},
+    {"role": "user", "content": "Hi", "timestamp": "07:20:05"}
+]
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        store = JSONFileStore(str(tmp_path / "user_data"))
+    else:
+        store = SQLiteStore(str(tmp_path / "candidates.db"))
+    yield store
+    store.close()
+
+
+def test_save_and_load_round_trip(store):
+    record_id = store.save_candidate(_record(), transcript=TRANSCRIPT)
+
+    loaded = store.get_candidate(record_id)
+    assert loaded == _record()
+    assert store.get_transcript(record_id) == TRANSCRIPT
+    assert store.list_ids() == [record_id]
+    assert list(store.iter_candidates()) == [(record_id, loaded)]
+
+
+def test_save_many_keeps_order(store):
+    ids = store.save_many([
+        (_record("a@example.com"), None),
+        (_record("b@example.com"), TRANSCRIPT)
+    ])
+
+    assert [store.get_candidate(record_id)["email"] for record_id in ids] == ["a@example.com", "b@example.com"]
+    assert store.get_transcript(ids[0]) == []
+    assert sorted(store.list_ids()) == sorted(ids)
+
+
+def test_missing_record(store):
+    missing = "nobody.json" if isinstance(store, JSONFileStore) else "999"
+    assert store.get_candidate(missing) is None
+
+
+def test_save_scores_merges_into_responses(store):
+    record_id = store.save_candidate(_record())
+
+    store.save_scores(record_id, {"question_2": {"score": 4, "rationale": "Correct."}})
+
+    responses = store.get_candidate(record_id)["technical_responses"]
+    assert responses["question_1"] == {"question": "What is a decorator?", "answer": "A wrapper."}
+    assert responses["question_2"] == {
+        "question": "What is an ORM?", "answer": "A mapper.", "score": 4, "rationale": "Correct."
+    }
+
+
+def test_json_files_keep_the_record_shape(tmp_path):
+    store = JSONFileStore(str(tmp_path))
+    path = store.save_candidate(_record(), transcript=TRANSCRIPT)
+
+    assert os.path.basename(path) == "jane@example.com_20250412_073053.json"
+    with open(path) as f:
+        assert "transcript" not in json.load(f)
+    assert store.list_ids() == [path]
+
+
+def test_json_reads_inline_transcripts_of_older_files(tmp_path):
+    path = tmp_path / "old@example.com_20250101_000000.json"
+    path.write_text(json.dumps(dict(_record("old@example.com"), transcript=TRANSCRIPT)))
+
+    assert JSONFileStore(str(tmp_path)).get_transcript(str(path)) == TRANSCRIPT
+
+
+def test_json_failed_write_leaves_previous_file_intact(tmp_path, monkeypatch):
+    store = JSONFileStore(str(tmp_path))
+    path = store.save_candidate(_record())
+
+    def broken_dump(data, f, **kwargs):
+        f.write('{"name": "Ja')
+        raise OSError("disk full")
+
+    monkeypatch.setattr(storage.json, "dump", broken_dump)
+    with pytest.raises(OSError):
+        store.save_scores(path, {"question_1": {"score": 1, "rationale": "Vague."}})
+    monkeypatch.undo()
+
+    assert store.get_candidate(path) == _record()
+    assert sorted(os.listdir(tmp_path)) == [os.path.basename(path)]
+
+
+def test_sqlite_adds_score_columns_to_older_databases(tmp_path):
+    db_path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SQLiteStore.SCHEMA.replace("score INTEGER,", "").replace("rationale TEXT,", ""))
+    conn.close()
+
+    store = SQLiteStore(db_path)
+    record_id = store.save_candidate(_record())
+    store.save_scores(record_id, {"question_1": {"score": 5, "rationale": "Precise."}})
+
+    assert store.get_candidate(record_id)["technical_responses"]["question_1"]["score"] == 5
+    store.close()
+
+
+def test_sqlite_skips_sources_already_imported(tmp_path):
+    store = SQLiteStore(str(tmp_path / "candidates.db"))
+    first = store.save_many([(_record(), None)], sources=["jane.json"])
+    again = store.save_many([(_record(), None)], sources=["jane.json"])
+
+    assert first == again
+    assert store.list_ids() == first
+    assert store.list_sources() == {"jane.json"}
+    store.close()
@@ -0,0 +1,56 @@
+import random
+
+from utils import QuestionStreamParser, parse_technical_questions
+
+TEXT_RESPONSE = (
+    "Here are your questions:\n\n"
+    "**Python:**\n"
+    "1. **What is a Python decorator?** (Tests fundamentals)\n"
+    "2. **How does the GIL affect threads?**\n"
+    "**Django:**\n"
+    "3. Explain Django's ORM\n   and its lazy querysets.\n"
+    "4. **How do you secure a Django API?**"
+)
+
+
+def _chunks(text, rng):
+    position = 0
+    while position < len(text):
+        size = rng.randint(1, 12)
+        yield text[position:position + size]
+        position += size
+
+
+def _stream_text(text, rng):
+    parser = QuestionStreamParser()
+    questions = []
+    for chunk in _chunks(text, rng):
+        questions.extend(parser.feed(chunk))
+    return questions + parser.finish()
+
+
+def test_text_parser_matches_batch_parsing_for_any_chunking():
+    expected = parse_technical_questions(TEXT_RESPONSE)
+    assert expected[0] == "What is a Python decorator?"
+    for seed in range(50):
+        assert _stream_text(TEXT_RESPONSE, random.Random(seed)) == expected
+
+
+def test_text_parser_emits_questions_once_the_next_numbered_line_arrives():
+    parser = QuestionStreamParser()
+    assert parser.feed("1. First question\n2. Sec") == []
+    assert parser.feed("ond question\n") == ["First question"]
+    assert parser.finish() == ["Second question"]
+
+
+def test_text_parser_handles_numbers_split_across_chunks():
+    parser = QuestionStreamParser()
+    assert parser.feed("1. Alpha\n1") == []
+    assert parser.feed("0. Beta\n") == ["Alpha"]
+    assert parser.finish() == ["Beta"]
+
+
+def test_text_parser_without_numbered_lines_yields_nothing():
+    parser = QuestionStreamParser()
+    parser.feed("Sorry, I can't help with that.")
+    assert parser.finish() == []
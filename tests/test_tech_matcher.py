@@ -0,0 +1,56 @@
+import random
+import re
+
+import pytest
+
+from config import TECH_KEYWORDS, VALID_TECHNOLOGIES
+from tech_matcher import TechMatcher
+
+
+def _regex_matches(vocabulary, text):
+    """Reference behaviour: each term as a standalone word, case-insensitive."""
+    return {
+        term.lower() for term in vocabulary
+        if re.search(r"(?<!\w)" + re.escape(term.lower()) + r"(?!\w)", text.lower())
+    }
+
+
+@pytest.fixture
+def matcher():
+    return TechMatcher(["Java", "JavaScript", "C++", "C#", "Node.js", "node", "React Native", "react", "Go"])
+
+
+def test_terms_match_only_as_whole_words(matcher):
+    assert matcher.find_all("I write JavaScript and Go") == ["javascript", "go"]
+    assert matcher.find_all("Javanese golang django") == []
+    assert matcher.find_all("java, Java, JAVA") == ["java"]
+
+
+def test_symbols_and_multi_word_terms(matcher):
+    assert matcher.find_all("C++ and c# daily") == ["c++", "c#"]
+    assert matcher.find_all("React Native apps with Node.js") == ["react", "react native", "node", "node.js"]
+    assert matcher.find_all("node.jsx") == ["node"]
+
+
+def test_contains_any(matcher):
+    assert matcher.contains_any("mostly go")
+    assert not matcher.contains_any("mostly golang")
+    assert not matcher.contains_any("")
+
+
+def test_vocabulary_is_deduplicated_and_blank_terms_skipped():
+    matcher = TechMatcher(["Python", "python ", " ", ""])
+    assert matcher.terms == ["python"]
+    assert len(matcher) == 1
+
+
+@pytest.mark.parametrize("vocabulary", [TECH_KEYWORDS, VALID_TECHNOLOGIES])
+def test_agrees_with_word_boundary_regex(vocabulary):
+    matcher = TechMatcher(vocabulary)
+    rng = random.Random(7)
+    words = list(vocabulary) + ["and", "with", "years", "of", "xjava", "pythonic", "c", "++", ",", "."]
+    for _ in range(300):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 12)))
+        expected = _regex_matches(vocabulary, text)
+        assert set(matcher.find_all(text)) == expected, text
+        assert matcher.contains_any(text) == bool(expected), text
@@ -0,0 +1,113 @@
+import pytest
+
+from transcript import FOR_ALL, FOR_CHAT, FOR_LLM, Transcript
+
+
+class ScanningTranscript(Transcript):
+    """Transcript recording which messages views look at."""
+
+    def __init__(self):
+        super().__init__()
+        self.scanned = []
+
+    def visible(self, index, flag):
+        self.scanned.append(index)
+        return super().visible(index, flag)
+
+
+def _transcript():
+    transcript = ScanningTranscript()
+    transcript.append("system", "prompt", FOR_LLM, timestamp=1.0)
+    transcript.append("assistant", "Hello!", FOR_ALL, timestamp=2.0)
+    transcript.append("user", "Jane Doe", FOR_ALL, timestamp=3.0)
+    transcript.append("assistant", "Shown reworded", FOR_CHAT, timestamp=4.0)
+    return transcript
+
+
+def test_views_keep_llm_and_chat_messages_apart():
+    transcript = _transcript()
+
+    assert [message.content for message in transcript.view(FOR_LLM)] == ["prompt", "Hello!", "Jane Doe"]
+    assert [message.content for message in transcript.view(FOR_CHAT)] == ["Hello!", "Jane Doe", "Shown reworded"]
+    assert transcript.view(FOR_CHAT)[-1].as_dict()["role"] == "assistant"
+
+
+def test_views_pick_up_new_messages_incrementally():
+    transcript = _transcript()
+    view = transcript.view(FOR_CHAT)
+    assert view.positions() == [1, 2, 3]
+    assert len(view) == 3
+
+    transcript.scanned.clear()
+    transcript.append("user", "jane@example.com")
+
+    # Only the message added since the last read is looked at
+    assert view.positions() == [1, 2, 3, 4]
+    assert transcript.scanned == [4]
+
+
+def test_each_flag_has_one_view_that_later_reads_extend():
+    transcript = _transcript()
+    assert transcript.view(FOR_CHAT) is transcript.view(FOR_CHAT)
+    assert transcript.view(FOR_LLM) is not transcript.view(FOR_CHAT)
+    assert len(transcript.view(FOR_CHAT)) == 3
+
+    transcript.scanned.clear()
+    transcript.append("assistant", "What is your email?")
+    transcript.append("user", "jane@example.com")
+
+    # A fresh call, as on every Streamlit rerun, scans only the two new messages
+    assert len(transcript.view(FOR_CHAT)) == 5
+    assert transcript.scanned == [4, 5]
+    assert len(transcript.view(FOR_CHAT)) == 5
+    assert transcript.scanned == [4, 5]
+
+
+def test_set_visibility_resets_views():
+    transcript = _transcript()
+    chat = transcript.view(FOR_CHAT)
+    llm = transcript.view(FOR_LLM)
+    assert len(chat) == 3 and len(llm) == 3
+
+    transcript.set_visibility(1, FOR_LLM)
+
+    transcript.scanned.clear()
+    assert [message.content for message in chat] == ["Jane Doe", "Shown reworded"]
+    # The change may be anywhere, so the view scans the whole transcript again
+    assert transcript.scanned == [0, 1, 2, 3]
+    assert [message.content for message in llm] == ["prompt", "Hello!", "Jane Doe"]
+    assert transcript.visibility_changes == 1
+
+
+def test_rows_round_trip():
+    transcript = _transcript()
+    rows = transcript.to_rows(start=1)
+
+    restored = Transcript()
+    restored.append("system", "prompt", FOR_LLM, timestamp=1.0)
+    restored.extend_rows(rows)
+
+    assert restored.to_rows() == transcript.to_rows()
+    assert [message.as_dict() for message in restored.view(FOR_CHAT)] == transcript.view(FOR_CHAT).as_dicts()
+    assert restored.version > 1
+
+
+@pytest.mark.parametrize("row", [
+    [1, "text", 1.0],
+    "not a row",
+    [3, "text", 1.0, FOR_ALL],
+    [-1, "text", 1.0, FOR_ALL],
+    ["user", "text", 1.0, FOR_ALL],
+    [1, None, 1.0, FOR_ALL],
+    [1, "text", "noon", FOR_ALL],
+    [1, "text", 1.0, 4],
+    [1, "text", 1.0, True]
+])
+def test_extend_rows_rejects_malformed_rows_without_appending(row):
+    transcript = _transcript()
+    before = transcript.to_rows()
+
+    with pytest.raises(ValueError):
+        transcript.extend_rows([[2, "fine", 5.0, FOR_ALL], row])
+
+    assert transcript.to_rows() == before
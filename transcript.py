@@ -0,0 +1,259 @@
+"""
+Compact chat transcript for the TalentScout Hiring Assistant.
+
+One Transcript per interview is shared by ConversationManager (the messages
+sent to the LLM) and the Streamlit UI (the messages shown to the candidate).
+Each message is stored once, column-wise: a role code, the content string, a
+numeric timestamp and visibility flags saying who reads it.
+"""
+import time
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+# Roles are stored as one-byte codes indexing this tuple
+ROLES = ("system", "user", "assistant")
+_ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+
+# Visibility flags
+FOR_LLM = 1    # Part of the conversation history sent to the LLM
+FOR_CHAT = 2   # Shown to the candidate in the chat window
+FOR_ALL = FOR_LLM | FOR_CHAT
+
+# Format of the display timestamps in as_dict()
+TIMESTAMP_FORMAT = "%H:%M:%S"
+
+
+class Message:
+    """
+    Read-only view of one transcript message.
+
+    Supports msg["role"], msg["content"] and msg["timestamp"] so code written
+    against the old message dicts keeps working.
+    """
+
+    __slots__ = ("role", "content", "time", "visibility")
+
+    def __init__(self, role: str, content: str, time: float, visibility: int):
+        self.role = role
+        self.content = content
+        self.time = time
+        self.visibility = visibility
+
+    @property
+    def timestamp(self) -> str:
+        """Display timestamp (HH:MM:SS, local time)."""
+        return datetime.fromtimestamp(self.time).strftime(TIMESTAMP_FORMAT)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in ("role", "content", "timestamp"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def as_dict(self) -> Dict[str, str]:
+        """The message as a {"role", "content", "timestamp"} dict, as saved with candidates."""
+        return {"role": self.role, "content": self.content, "timestamp": self.timestamp}
+
+
+class Transcript:
+    """
+    Append-only list of chat messages stored in parallel arrays.
+
+    `version` increases on every change, so readers can cache anything derived
+    from the transcript (rendered HTML, exports) until it moves on.
+    """
+
+    __slots__ = ("_roles", "_contents", "_times", "_visibility", "version", "visibility_changes", "_views")
+
+    def __init__(self):
+        """Initialize an empty transcript."""
+        self._roles = array("B")
+        self._contents: List[str] = []
+        self._times = array("d")
+        self._visibility = array("B")
+        self.version = 0
+        # Number of set_visibility calls; until it moves, views only need to look at new messages
+        self.visibility_changes = 0
+        # One view per flag, kept so each read only scans the messages added since the last
+        self._views: Dict[int, TranscriptView] = {}
+
+    def __len__(self) -> int:
+        return len(self._contents)
+
+    def append(self, role: str, content: str, visibility: int = FOR_ALL,
+               timestamp: Optional[float] = None) -> int:
+        """
+        Add a message.
+
+        Args:
+            role: "system", "user" or "assistant"
+            content: Message text
+            visibility: FOR_LLM, FOR_CHAT or both
+            timestamp: Seconds since the epoch (defaults to now)
+
+        Returns:
+            int: Index of the new message
+        """
+        self._roles.append(_ROLE_CODES[role])
+        self._contents.append(content)
+        self._times.append(time.time() if timestamp is None else timestamp)
+        self._visibility.append(visibility)
+        self.version += 1
+        return len(self._contents) - 1
+
+    def set_visibility(self, index: int, visibility: int) -> None:
+        """
+        Change who reads a message, e.g. to hide a raw LLM response the UI shows reworded.
+
+        Args:
+            index: Message index returned by append
+            visibility: New visibility flags
+        """
+        self._visibility[index] = visibility
+        self.version += 1
+        self.visibility_changes += 1
+
+    def role(self, index: int) -> str:
+        """Role of the message at an index."""
+        return ROLES[self._roles[index]]
+
+    def content(self, index: int) -> str:
+        """Text of the message at an index."""
+        return self._contents[index]
+
+    def visible(self, index: int, flag: int) -> bool:
+        """Whether the message at an index has a visibility flag."""
+        return bool(self._visibility[index] & flag)
+
+    def message(self, index: int) -> Message:
+        """
+        Get a message.
+
+        Args:
+            index: Message index
+
+        Returns:
+            Message: View of the message
+        """
+        return Message(ROLES[self._roles[index]], self._contents[index],
+                       self._times[index], self._visibility[index])
+
+    def view(self, flag: int) -> "TranscriptView":
+        """
+        Get the messages with a visibility flag.
+
+        Args:
+            flag: FOR_LLM or FOR_CHAT
+
+        Returns:
+            TranscriptView: Live, read-only sequence of those messages, the same one on every call
+        """
+        view = self._views.get(flag)
+        if view is None:
+            view = self._views[flag] = TranscriptView(self, flag)
+        return view
+
+    def to_rows(self, start: int = 0) -> List[List[Any]]:
+        """
+        Messages as compact [role code, content, timestamp, visibility] rows for snapshots.
+
+        Args:
+            start: Index of the first message to include
+
+        Returns:
+            List[List]: One row per message
+        """
+        return [list(row) for row in zip(self._roles[start:], self._contents[start:],
+                                         self._times[start:], self._visibility[start:])]
+
+    def extend_rows(self, rows: List[List[Any]]) -> None:
+        """
+        Append messages from to_rows() output.
+
+        All rows are checked before any is appended, so a bad snapshot leaves
+        the transcript unchanged.
+
+        Args:
+            rows: [role code, content, timestamp, visibility] rows
+
+        Raises:
+            ValueError: If a row has the wrong shape, role code or visibility
+        """
+        for position, row in enumerate(rows):
+            if not isinstance(row, (list, tuple)) or len(row) != 4:
+                raise ValueError(f"Transcript row {position} is not [role, content, timestamp, visibility]")
+            role, content, timestamp, visibility = row
+            if type(role) is not int or not 0 <= role < len(ROLES):
+                raise ValueError(f"Transcript row {position} has unknown role code {role!r}")
+            if not isinstance(content, str):
+                raise ValueError(f"Transcript row {position} content is not a string")
+            if isinstance(timestamp, bool) or not isinstance(timestamp, (int, float)):
+                raise ValueError(f"Transcript row {position} timestamp is not a number")
+            if type(visibility) is not int or not 0 <= visibility <= FOR_ALL:
+                raise ValueError(f"Transcript row {position} has invalid visibility {visibility!r}")
+
+        for role, content, timestamp, visibility in rows:
+            self._roles.append(role)
+            self._contents.append(content)
+            self._times.append(timestamp)
+            self._visibility.append(visibility)
+        self.version += 1
+
+
+class TranscriptView:
+    """Read-only sequence of the transcript messages carrying one visibility flag."""
+
+    __slots__ = ("_transcript", "_flag", "_indices", "_version", "_scanned", "_changes")
+
+    def __init__(self, transcript: Transcript, flag: int):
+        self._transcript = transcript
+        self._flag = flag
+        self._indices: List[int] = []
+        self._version = -1
+        self._scanned = 0
+        self._changes = transcript.visibility_changes
+
+    @property
+    def transcript(self) -> Transcript:
+        """The underlying transcript."""
+        return self._transcript
+
+    @property
+    def version(self) -> int:
+        """Version of the underlying transcript; the view changes only when it does."""
+        return self._transcript.version
+
+    def positions(self) -> List[int]:
+        """Transcript indices of the visible messages, updated after changes."""
+        transcript = self._transcript
+        if self._version != transcript.version:
+            if self._changes != transcript.visibility_changes:
+                # A message may have been hidden anywhere; start over
+                self._indices = []
+                self._scanned = 0
+                self._changes = transcript.visibility_changes
+            self._indices.extend(index for index in range(self._scanned, len(transcript))
+                                 if transcript.visible(index, self._flag))
+            self._scanned = len(transcript)
+            self._version = transcript.version
+        return self._indices
+
+    def __len__(self) -> int:
+        return len(self.positions())
+
+    def __iter__(self) -> Iterator[Message]:
+        for index in self.positions():
+            yield self._transcript.message(index)
+
+    def __reversed__(self) -> Iterator[Message]:
+        for index in reversed(self.positions()):
+            yield self._transcript.message(index)
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[Message, List[Message]]:
+        if isinstance(item, slice):
+            return [self._transcript.message(index) for index in self.positions()[item]]
+        return self._transcript.message(self.positions()[item])
+
+    def as_dicts(self) -> List[Dict[str, str]]:
+        """The messages as {"role", "content", "timestamp"} dicts."""
+        return [message.as_dict() for message in self]
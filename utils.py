@@ -2,8 +2,10 @@
 Utility functions for the TalentScout Hiring Assistant.
 """
 
+import json
 import re
-from typing import Dict, List, Any
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Sequence
 
 
 def validate_email(email: str) -> bool:
@@ -116,3 +118,455 @@ def parse_tech_stack(tech_stack_text: str) -> List[str]:
             cleaned_technologies.append(tech)
 
     return cleaned_technologies
+
+
+def normalize_tech_stack(tech_stack: List[str]) -> List[str]:
+    """
+    Canonicalize a tech stack into a sorted, de-duplicated list.
+
+    Args:
+        tech_stack: List of technology names as entered by the candidate
+
+    Returns:
+        List[str]: Lowercased, whitespace-collapsed technologies in sorted order
+    """
+    normalized = set()
+    for tech in tech_stack:
+        tech = " ".join(str(tech).lower().split())
+        if tech:
+            normalized.add(tech)
+    return sorted(normalized)
+
+
+# Trailing markdown section headers such as "**AWS:**" that precede the next question
+_SECTION_HEADER_PATTERN = re.compile(r"(?:\n\s*\*\*[^*\n]+:?\*\*:?\s*)+$")
+# Numbered item at the start of a line, e.g. "1."
+_NUMBERED_LINE_PATTERN = re.compile(r"^[ \t]*\d+\.", re.MULTILINE)
+
+
+def clean_technical_question(question: str) -> str:
+    """
+    Strip numbering, trailing section headers and assessment notes from a question.
+
+    Args:
+        question: Raw numbered question text from the LLM
+
+    Returns:
+        str: Question text suitable for display
+    """
+    question = _SECTION_HEADER_PATTERN.sub("", question.strip())
+
+    # Extract just the question part from "1. **Question text** (Assessment note)"
+    match = re.match(r"\d+\.\s*\*\*(.*?)\*\*\s*(?:\(.*?\))?", question)
+    if match:
+        return match.group(1)
+    # If no match, just use the whole question with minimal cleaning
+    return re.sub(r"^\d+\.\s*", "", question)
+
+
+def parse_technical_questions(questions_text: str) -> List[str]:
+    """
+    Split an LLM response into individual numbered technical questions.
+
+    Args:
+        questions_text: Text containing numbered questions
+
+    Returns:
+        List[str]: Cleaned question texts
+    """
+    questions = []
+    # Split by numbered items
+    question_blocks = re.split(r"(\d+\.)", questions_text.strip())
+    if len(question_blocks) > 1:  # Skip the first empty item if present
+        i = 1
+        while i < len(question_blocks):
+            if re.match(r"\d+\.", question_blocks[i]) and i + 1 < len(question_blocks):
+                # Combine number with text
+                full_question = question_blocks[i] + question_blocks[i + 1].strip()
+                questions.append(full_question)
+                i += 2
+            else:
+                i += 1
+
+    # If the regex method failed, try a simpler approach
+    if not questions:
+        question_lines = [line.strip() for line in questions_text.split("\n") if line.strip()]
+        current_question = ""
+        for line in question_lines:
+            if re.match(r"^\d+\.", line):
+                if current_question:
+                    questions.append(current_question)
+                current_question = line
+            elif current_question:
+                current_question += " " + line
+        if current_question:
+            questions.append(current_question)
+
+    return [clean_technical_question(q) for q in questions]
+
+
+class QuestionStreamParser:
+    """
+    Incrementally splits streamed LLM text into numbered technical questions.
+
+    A question is complete once the next numbered line starts; the last one is
+    returned by finish() when the stream ends.
+    """
+
+    def __init__(self):
+        """Initialize an empty parser."""
+        # Text of the current (not yet complete) question, or pending text before the first one
+        self._buffer = ""
+        self._in_question = False
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Add streamed text.
+
+        Args:
+            chunk: Next piece of the LLM response
+
+        Returns:
+            List[str]: Questions completed by this chunk
+        """
+        # Re-scan from the start of the last partial line in case a number was split across chunks
+        scan_from = self._buffer.rfind("\n") + 1
+        self._buffer += chunk
+
+        # Only lines that have fully arrived can be trusted to start a question
+        scan_to = self._buffer.rfind("\n") + 1
+        completed = []
+        question_start = 0 if self._in_question else None
+        for match in _NUMBERED_LINE_PATTERN.finditer(self._buffer, scan_from, scan_to):
+            if question_start is not None and match.start() > question_start:
+                completed.append(clean_technical_question(self._buffer[question_start:match.start()]))
+            question_start = match.start()
+
+        if question_start is not None:
+            # Drop text that belongs to completed questions
+            self._buffer = self._buffer[question_start:]
+            self._in_question = True
+
+        return completed
+
+    def finish(self) -> List[str]:
+        """
+        Flush the final question once the stream has ended.
+
+        Returns:
+            List[str]: Questions completed by the end of the stream
+        """
+        # A numbered line may still be sitting in the unterminated last line
+        completed = self.feed("\n")
+        if self._in_question and self._buffer.strip():
+            completed.append(clean_technical_question(self._buffer))
+        self._buffer = ""
+        self._in_question = False
+        return completed
+
+
+def validate_question_item(item: Any, position: int, difficulties: Optional[Sequence[str]] = None) -> Dict[str, str]:
+    """
+    Validate one structured technical question.
+
+    Args:
+        item: Decoded JSON value
+        position: 1-based position of the item, used in error messages
+        difficulties: Allowed difficulty levels (None accepts any)
+
+    Returns:
+        Dict[str, str]: The question with "question", "technology" and "difficulty"
+
+    Raises:
+        ValueError: If the item is not a valid question object
+    """
+    if not isinstance(item, dict):
+        raise ValueError(f"item {position} is not an object")
+    question = {}
+    for field in ("question", "technology", "difficulty"):
+        value = item.get(field)
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"item {position} is missing a non-empty string \"{field}\"")
+        question[field] = value.strip()
+    question["question"] = re.sub(r"^\d+\.\s*", "", question["question"])
+    question["difficulty"] = question["difficulty"].lower()
+    if difficulties and question["difficulty"] not in difficulties:
+        raise ValueError(
+            f"item {position} has difficulty \"{question['difficulty']}\", expected one of {', '.join(difficulties)}"
+        )
+    return question
+
+
+class QuestionJSONStreamParser:
+    """
+    Incrementally decodes a JSON array of question objects as it streams in.
+
+    Text before the opening bracket (such as a ```json fence) is ignored. Each
+    object is decoded and validated once, as soon as it is complete.
+    """
+
+    def __init__(self, difficulties: Optional[Sequence[str]] = None):
+        """
+        Initialize an empty parser.
+
+        Args:
+            difficulties: Allowed difficulty levels (None accepts any)
+        """
+        self.difficulties = difficulties
+        self.count = 0
+        self._buffer = ""
+        # Position of the next unparsed character inside the array, None until "[" arrives
+        self._position: Optional[int] = None
+        self._closed = False
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, chunk: str) -> List[Dict[str, str]]:
+        """
+        Add streamed text.
+
+        Args:
+            chunk: Next piece of the LLM response
+
+        Returns:
+            List[Dict[str, str]]: Questions completed by this chunk
+
+        Raises:
+            ValueError: If a completed item is not a valid question
+        """
+        self._buffer += chunk
+        if self._position is None:
+            start = self._buffer.find("[")
+            if start < 0:
+                return []
+            self._position = start + 1
+
+        completed = []
+        while not self._closed:
+            position = self._position
+            while position < len(self._buffer) and self._buffer[position] in " \t\r\n,":
+                position += 1
+            if position >= len(self._buffer):
+                break
+            if self._buffer[position] == "]":
+                self._closed = True
+                self._position = position + 1
+                break
+            try:
+                item, end = self._decoder.raw_decode(self._buffer, position)
+            except json.JSONDecodeError:
+                # Most likely the item hasn't fully arrived yet; finish() reports real errors
+                break
+            self.count += 1
+            completed.append(validate_question_item(item, self.count, self.difficulties))
+            self._position = end
+        return completed
+
+    def finish(self) -> None:
+        """
+        Check that the stream contained a complete, non-empty array.
+
+        Raises:
+            ValueError: Describing where the JSON is incomplete or malformed
+        """
+        if self._position is None:
+            raise ValueError("the response does not contain a JSON array")
+        if not self._closed:
+            try:
+                self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"invalid JSON after item {self.count}: {e.msg} at character {e.pos}")
+            raise ValueError(f"the JSON array is not closed after item {self.count}")
+        if not self.count:
+            raise ValueError("the JSON array is empty")
+
+
+def parse_question_json(text: str, difficulties: Optional[Sequence[str]] = None) -> List[Dict[str, str]]:
+    """
+    Parse and validate an LLM response holding a JSON array of question objects.
+
+    Args:
+        text: LLM response
+        difficulties: Allowed difficulty levels (None accepts any)
+
+    Returns:
+        List[Dict[str, str]]: Questions with "question", "technology" and "difficulty"
+
+    Raises:
+        ValueError: Describing the first problem found, suitable for a repair prompt
+    """
+    parser = QuestionJSONStreamParser(difficulties)
+    questions = parser.feed(text)
+    parser.finish()
+    return questions
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a text without calling the API.
+    Uses the common approximation of four characters per token for English text.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        int: Estimated token count
+    """
+    return (len(text) + 3) // 4
+
+
+# Number words accepted by parse_experience_years
+_NUMBER_WORDS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "fifteen": 15, "twenty": 20
+}
+
+
+def parse_experience_years(experience: Any) -> Optional[float]:
+    """
+    Parse free-text experience such as "3 years", "5+ yrs", "18 months" or "two" into years.
+
+    Args:
+        experience: Experience value as entered by the candidate
+
+    Returns:
+        Optional[float]: Years of experience, or None if no number was found
+    """
+    if isinstance(experience, (int, float)):
+        return float(experience)
+    if not experience:
+        return None
+
+    text = str(experience).lower()
+    match = re.search(r"\d+(?:\.\d+)?", text)
+    if match:
+        value = float(match.group())
+    else:
+        words = [_NUMBER_WORDS[word] for word in re.findall(r"[a-z]+", text) if word in _NUMBER_WORDS]
+        if not words:
+            return None
+        value = float(words[0])
+
+    if re.search(r"\bmonths?\b|\bmos?\b", text) and not re.search(r"\by(?:ea)?rs?\b", text):
+        value /= 12
+    return value
+
+
+def canonicalize_tech(tech: str, aliases: Optional[Dict[str, str]] = None) -> str:
+    """
+    Map a technology name to its canonical form.
+
+    Args:
+        tech: Technology name as entered by the candidate
+        aliases: Mapping of alternate spellings to canonical names
+
+    Returns:
+        str: Lowercased canonical name
+    """
+    tech = " ".join(str(tech).lower().split())
+    if aliases:
+        return aliases.get(tech, tech)
+    return tech
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Compute a percentile using linear interpolation between closest ranks.
+
+    Args:
+        values: Sample values (need not be sorted)
+        pct: Percentile between 0 and 100
+
+    Returns:
+        float: The percentile value, or 0.0 for an empty sample
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def encode_json_export(data: Any, compress: bool = False, chunk_bytes: int = 64 * 1024) -> bytes:
+    """
+    Encode data as indented JSON for a download, optionally gzip-compressed.
+
+    The JSON is produced incrementally and compressed in chunks, so a long
+    transcript is never held as one large string.
+
+    Args:
+        data: JSON-serializable data
+        compress: Whether to gzip the output
+        chunk_bytes: Size of the pieces handed to the compressor
+
+    Returns:
+        bytes: UTF-8 JSON, or its gzip compression
+    """
+    chunks = json.JSONEncoder(indent=2).iterencode(data)
+    if not compress:
+        return "".join(chunks).encode("utf-8")
+
+    import gzip
+    import io
+
+    buffer = io.BytesIO()
+    # A fixed mtime keeps the output identical for identical data
+    with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as out:
+        pending = []
+        size = 0
+        for chunk in chunks:
+            pending.append(chunk)
+            size += len(chunk)
+            if size >= chunk_bytes:
+                out.write("".join(pending).encode("utf-8"))
+                pending = []
+                size = 0
+        out.write("".join(pending).encode("utf-8"))
+    return buffer.getvalue()
+
+
+def build_conversation_export(summary: Dict[str, Any], messages: Any, compress: bool = False,
+                              now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Build the download of a finished conversation.
+
+    Args:
+        summary: ConversationManager.get_conversation_summary() output
+        messages: TranscriptView of the chat messages
+        compress: Whether to gzip the file
+        now: Time the export is stamped with (defaults to now)
+
+    Returns:
+        Dict: Transcript version it was built from, data, file name and MIME type
+    """
+    now = now or datetime.now()
+    export_data = {
+        "timestamp": now.strftime("%Y-%m-%d %H:%M:%S"),
+        "candidate_info": summary["candidate_info"],
+        "technical_questions": summary["technical_questions"],
+        "technical_responses": summary["technical_responses"],
+        "full_conversation": messages.as_dicts()
+    }
+    file_name = f"talentscout_interview_{now.strftime('%Y%m%d_%H%M%S')}.json"
+    return {
+        "version": messages.version,
+        "data": encode_json_export(export_data, compress=compress),
+        "file_name": file_name + ".gz" if compress else file_name,
+        "mime": "application/gzip" if compress else "application/json"
+    }
+
+
+def export_is_current(export: Optional[Dict[str, Any]], messages: Any) -> bool:
+    """
+    Check whether a cached download still matches the conversation.
+
+    Args:
+        export: Output of build_conversation_export, or None
+        messages: TranscriptView of the chat messages
+
+    Returns:
+        bool: True if the export was built from the transcript as it is now
+    """
+    return export is not None and export["version"] == messages.version